@@ -1,6 +1,8 @@
 from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import Dict, Any
+from typing import Dict, Any, ClassVar, Iterator, Self, List, Tuple, get_args, get_origin
 
 from pydantic import UUID4, BaseModel, model_serializer, GetCoreSchemaHandler, ValidationError, ConfigDict
 from pydantic_core import core_schema
@@ -9,6 +11,91 @@ type ObjectReference = UUID4
 """ObjectReference is an alias for UUID4, representing a unique object identifier."""
 
 
+class ReferenceFieldsSchema:
+    """Layout of the fields of a model class, split between object references and plain fields.
+
+    The schema is computed once per model class from its annotations and cached, so that code walking
+    reference fields does not have to inspect ``model_fields`` annotations on every call.
+
+    Example:
+        >>> class Node(BaseModel):
+        ...     name: str = ""
+        ...     parent: ObjectReference | None = None
+        ...     children: List[ObjectReference] = []
+        ...
+        >>> schema = ReferenceFieldsSchema.of(Node)
+        >>> schema.single_references, schema.list_references, schema.plain_fields
+        (('parent',), ('children',), ('name',))
+        >>> schema is ReferenceFieldsSchema.of(Node)
+        True
+    """
+
+    __slots__ = ("references", "single_references", "list_references", "plain_fields", "annotation_args")
+
+    _cache: ClassVar[Dict[type, "ReferenceFieldsSchema"]] = {}
+
+    references: Tuple[Tuple[str, bool], ...]
+    """Reference fields in declaration order, as (field name, is a list of references) pairs."""
+
+    single_references: Tuple[str, ...]
+    """Names of the fields annotated with ObjectReference."""
+
+    list_references: Tuple[str, ...]
+    """Names of the fields annotated with List[ObjectReference]."""
+
+    plain_fields: Tuple[str, ...]
+    """Names of the fields holding no object reference."""
+
+    annotation_args: Dict[str, Tuple[Any, ...]]
+    """Arguments of the annotation of each field, as returned by get_args."""
+
+    def __init__(self, model_class: type[BaseModel]):
+        references = []
+        plain_fields = []
+        self.annotation_args = {}
+        for field_name, field_info in model_class.model_fields.items():
+            annotation_args = get_args(field_info.annotation)
+            self.annotation_args[field_name] = annotation_args
+            if get_origin(field_info.annotation) is list and ObjectReference in annotation_args:
+                references.append((field_name, True))
+            elif ObjectReference in annotation_args:
+                references.append((field_name, False))
+            elif List[ObjectReference] in annotation_args:
+                references.append((field_name, True))
+            else:
+                plain_fields.append(field_name)
+        self.references = tuple(references)
+        self.single_references = tuple(name for name, is_list in references if not is_list)
+        self.list_references = tuple(name for name, is_list in references if is_list)
+        self.plain_fields = tuple(plain_fields)
+
+    @classmethod
+    def of(cls, model_class: type[BaseModel]) -> "ReferenceFieldsSchema":
+        """Returns the schema of the given model class, computing it on first access.
+
+        Args:
+            model_class: The model class to get the schema of.
+
+        Returns:
+            The reference fields schema of the model class.
+        """
+        schema = cls._cache.get(model_class)
+        if schema is None:
+            schema = cls._cache[model_class] = cls(model_class)
+        return schema
+
+    def is_reference(self, field_name: str) -> bool:
+        """Checks whether a field is annotated with ObjectReference or List[ObjectReference].
+
+        Args:
+            field_name: The name of the field to check.
+
+        Returns:
+            True if the field holds object references, False otherwise.
+        """
+        return field_name in self.single_references or field_name in self.list_references
+
+
 class BasePydanticEnum(Enum):
     """Base class for creating Pydantic-compatible enums with flexible member resolution.
 
@@ -47,6 +134,21 @@ class BasePydanticEnum(Enum):
             serialization=core_schema.plain_serializer_function_ser_schema(lambda member: member.value.code),
         )
 
+    @classmethod
+    def _get_member_indexes(cls) -> Tuple[Dict[str, Any], Dict[int, Any]]:
+        """Returns the indexes of the members of the enum, building them on first access.
+
+        Returns:
+            A tuple (code to member, value identity to member) of dictionaries.
+        """
+        indexes = _MEMBER_INDEXES.get(cls)
+        if indexes is None:
+            indexes = _MEMBER_INDEXES[cls] = (
+                {member.value.code: member for member in cls},
+                {id(member.value): member for member in cls},
+            )
+        return indexes
+
     @classmethod
     def _get_member(cls, input_value: Any):
         """Resolve an enum member from various input formats.
@@ -71,39 +173,45 @@ class BasePydanticEnum(Enum):
             ValueError: If the input_value cannot be resolved to any enum member
 
         Note:
-            Dictionary validation is performed for each member during iteration,
-            which may impact performance for large enums. Consider implementing
-            a _get_value_type class method in subclasses for optimization.
+            Members are looked up in dictionaries built once per enum class, so the resolution
+            does not depend on the number of members. A dictionary is validated once, against
+            the member having the same code.
+
+        Example:
+            >>> TlpPapLevel._get_member("AMBER")
+            AMBER
+            >>> TlpPapLevel._get_member({"code": "RED", "name": "RED", "ordering_value": 40})
+            RED
         """
-        for member in cls:
-            # If the input is already a member or is a member value, let's use it.
-            if input_value == member or input_value == member.value:
-                return member
+        if isinstance(input_value, cls):
+            return input_value
+        codes, values = cls._get_member_indexes()
 
-            # If not, search for the member with input_value as code.
-            if member.value.code == input_value:
+        # The input is a code or a member value.
+        if isinstance(input_value, str):
+            if (member := codes.get(input_value)) is not None:
                 return member
+        elif (member := values.get(id(input_value))) is not None:
+            return member
 
-            # Try to validate the input as a model, in case the user supplied a dict
-            # representing a member. Validating during each loop is suboptimal,
-            # improve this if you care about this feature.
-            # Not easy since you can't know easily the type of you member values by
-            # default. Forcing the child to implement a _get_value_type class method
-            # would solve this.
+        # The input is a copy of a member value, or a dict representing a member value.
+        elif isinstance(input_value, dict) and (member := codes.get(input_value.get("code"))) is not None:
             try:
-                model = type(member.value).model_validate(input_value)
-            except ValidationError:
-                continue
-            else:
-                # Validated successfully and matches the current member.
-                if member.value == model:
+                if member.value == type(member.value).model_validate(input_value):
                     return member
+            except ValidationError:
+                pass
+        elif (member := codes.get(getattr(input_value, "code", None))) is not None and member.value == input_value:
+            return member
 
         # Raise a ValueError if our search fails for Pydantic to create its proper
         # ValidationError.
         raise ValueError(f"Failed to convert {input_value} to a member of {cls}")
 
 
+_MEMBER_INDEXES: Dict[type, Tuple[Dict[str, Any], Dict[int, Any]]] = {}
+
+
 class Level(BaseModel):
     """A Pydantic model representing a hierarchical level with ordering capabilities.
 
@@ -279,6 +387,94 @@ class LRUDict(OrderedDict):
         super().move_to_end(key)
         return val
 
+    def get(self, key, default=None):
+        """
+        Retrieve an item if present and move it to the end as most recently used.
+
+        Args:
+            key: The key to retrieve.
+            default: The value returned if the key is not in the dictionary.
+
+        Returns:
+            The value associated with the key, or default.
+        """
+        if key in self:
+            return self[key]
+        return default
+
+
+class ContextBound:
+    """Mixin binding an instance of a class to the current execution context.
+
+    The instance returned by :py:meth:`current` is stored in a :py:class:`contextvars.ContextVar`. This is
+    used by the repositories to isolate the state of concurrent conversions running in the same process.
+
+    Isolation is only guaranteed for the instances bound with :py:meth:`activate`, for the duration of the
+    ``with`` block. Each thread starts with its own default instance, but an asyncio task copies the context
+    of the code creating it: once that code has called :py:meth:`current`, the tasks it creates share the
+    same default instance.
+
+    Example:
+        >>> class Session(ContextBound):
+        ...     pass
+        ...
+        >>> default = Session.current()
+        >>> with Session().activate() as session:
+        ...     print(Session.current() is session)
+        True
+        >>> print(Session.current() is default)
+        True
+    """
+
+    _context_var: ClassVar[ContextVar]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._context_var = ContextVar(f"{cls.__module__}.{cls.__qualname__}", default=None)
+
+    @classmethod
+    def current(cls) -> Self:
+        """Returns the instance bound to the current context, creating it on first access.
+
+        The instance created on first access is stored in the current context, so it is inherited by the
+        asyncio tasks created afterwards from this context.
+
+        Returns:
+            The instance bound to the current context.
+        """
+        instance = cls._context_var.get()
+        if instance is None:
+            instance = cls._new_default()
+            cls._context_var.set(instance)
+        return instance
+
+    @classmethod
+    def _new_default(cls) -> Self:
+        """Creates the instance bound to a context on first access, when none was bound explicitly."""
+        return cls()
+
+    def bind(self) -> Self:
+        """Binds this instance to the current context until another instance is bound.
+
+        Returns:
+            This instance.
+        """
+        self._context_var.set(self)
+        return self
+
+    @contextmanager
+    def activate(self) -> Iterator[Self]:
+        """Binds this instance to the current context for the duration of the ``with`` block.
+
+        Yields:
+            This instance.
+        """
+        token = self._context_var.set(self)
+        try:
+            yield self
+        finally:
+            self._context_var.reset(token)
+
 
 class Singleton(type):
     """Metaclass implementation of the Singleton design pattern.
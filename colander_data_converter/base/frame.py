@@ -0,0 +1,551 @@
+from array import array
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+from colander_data_converter.base.common import ReferenceFieldsSchema, TlpPapLevel
+from colander_data_converter.base.models import (
+    Case,
+    ColanderFeed,
+    CommonEntitySuperType,
+    CommonEntitySuperTypes,
+    get_id,
+)
+from colander_data_converter.base.types.base import CommonEntityType
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+__all__ = ["ColanderFrame", "FrameMask"]
+
+type Column = Any
+"""A column of integers: a NumPy array if NumPy is installed, an :py:class:`array.array` otherwise."""
+
+type FrameMask = Any
+"""A row selection: a NumPy boolean array if NumPy is installed, a :py:class:`bytearray` of 0 and 1 otherwise."""
+
+_NUMPY_DTYPES = {"B": "uint8", "H": "uint16", "I": "uint32", "q": "int64", "Q": "uint64"}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+_ENTITY_COLUMNS = ("id_hi", "id_lo", "super_type", "type", "name", "tlp", "pap", "created_at", "updated_at", "case")
+"""Columns of the entities table, in addition to one column per entity reference field."""
+
+_RELATION_COLUMNS = ("id_hi", "id_lo", "name", "obj_from", "obj_to", "created_at", "updated_at", "case")
+"""Columns of the relations table."""
+
+_SUPER_TYPES: Tuple[CommonEntitySuperType, ...] = tuple(member.value for member in CommonEntitySuperTypes)
+
+
+def _column(typecode: str, values: Iterable[int]) -> Column:
+    """Builds a column of integers.
+
+    Args:
+        typecode: The :py:mod:`array` type code of the column (B, H, I, q or Q).
+        values: The values of the column.
+
+    Returns:
+        The column.
+    """
+    if np is not None:
+        return np.fromiter(values, dtype=_NUMPY_DTYPES[typecode])
+    return array(typecode, values)
+
+
+def _take(column: Column, rows: Column) -> Column:
+    """Returns the values of a column at the given rows."""
+    if np is not None:
+        return column[rows]
+    return array(column.typecode, (column[row] for row in rows))
+
+
+def _rows(mask: FrameMask) -> Column:
+    """Returns the indexes of the selected rows of a mask."""
+    if np is not None:
+        return np.flatnonzero(mask)
+    return array("q", (row for row, selected in enumerate(mask) if selected))
+
+
+def _remap(column: Column, row_map: Column) -> Column:
+    """Replaces the row indexes stored in a column by their new value in row_map, -1 being kept as -1."""
+    if np is not None:
+        return np.where(column >= 0, row_map[np.maximum(column, 0)], -1)
+    return array("q", (row_map[row] if row >= 0 else -1 for row in column))
+
+
+def _isin(column: Column, codes: Set[int], size: int) -> FrameMask:
+    """Selects the rows whose value is one of the given codes.
+
+    Args:
+        column: The column of codes, -1 standing for no value.
+        codes: The codes to select.
+        size: The number of distinct codes.
+
+    Returns:
+        The mask of the selected rows.
+    """
+    if np is not None:
+        # A lookup table indexed by the codes, its last item being looked up for -1
+        table = np.zeros(size + 1, dtype=bool)
+        table[list(codes)] = True
+        return table[column]
+    return bytearray(value in codes for value in column)
+
+
+def _less(column: Column, bound: int) -> FrameMask:
+    """Selects the rows whose value is strictly below the bound."""
+    if np is not None:
+        return column < bound
+    return bytearray(value < bound for value in column)
+
+
+def _greater(column: Column, bound: int) -> FrameMask:
+    """Selects the rows whose value is strictly above the bound."""
+    if np is not None:
+        return column > bound
+    return bytearray(value > bound for value in column)
+
+
+def _and(mask: Optional[FrameMask], other: FrameMask) -> FrameMask:
+    """Intersects two masks, the first one being possibly missing."""
+    if mask is None:
+        return other
+    if np is not None:
+        return mask & other
+    return bytearray(a & b for a, b in zip(mask, other))
+
+
+def _bincount(column: Column, size: int) -> List[int]:
+    """Counts the occurrences of each code of a column."""
+    if np is not None:
+        return np.bincount(column, minlength=size).tolist()
+    counts = [0] * size
+    for value in column:
+        counts[value] += 1
+    return counts
+
+
+def _to_epoch(value: datetime) -> int:
+    """Converts a datetime into microseconds since the epoch, naive datetimes being considered as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_epoch(value: int) -> datetime:
+    """Converts microseconds since the epoch into a UTC datetime."""
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+class _Vocabulary:
+    """Assigns small integer codes to values, in order of first appearance."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+
+    def code(self, value: Any, key: Any = None) -> int:
+        """Returns the code of a value, assigning a new code on first appearance.
+
+        Args:
+            value: The value to encode.
+            key: The hashable key identifying the value, the value itself by default.
+
+        Returns:
+            The code of the value.
+        """
+        key = value if key is None else key
+        if (code := self.codes.get(key)) is None:
+            code = self.codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _type_key(entity_type: CommonEntityType) -> Tuple:
+    return type(entity_type), entity_type.short_name, entity_type.name, entity_type.description
+
+
+class ColanderFrame:
+    """A columnar, read-only representation of a Colander feed, for analytics over large numbers of entities.
+
+    Entities and relations are stored in tables of integer columns: IDs as two 64-bit halves, super types,
+    types and names as codes into vocabularies, TLP and PAP levels as their ordering values, timestamps as
+    microseconds since the epoch, and references as the row of the referenced entity (-1 if there is none).
+    The columns are NumPy arrays if NumPy is installed, :py:class:`array.array` otherwise, so that
+    filters, counts and joins run over whole columns.
+
+    The fields with no column (descriptions, attributes, lists of references...) are kept per row, with
+    their default values omitted, so that the frame converts back to an identical feed.
+
+    Example:
+        >>> from colander_data_converter.base.models import Observable
+        >>> from colander_data_converter.base.types.observable import ObservableTypes
+        >>> feed = ColanderFeed()
+        >>> for i in range(3):
+        ...     feed.add(Observable(name=f"10.0.0.{i}", type=ObservableTypes.IPV4.value, tlp=TlpPapLevel.GREEN))
+        >>> feed.add(Observable(name="example.com", type=ObservableTypes.DOMAIN.value, tlp=TlpPapLevel.RED))
+        >>> frame = ColanderFrame.from_feed(feed)
+        >>> frame.count_by("type")
+        {('OBSERVABLE', 'IPV4'): 3, ('OBSERVABLE', 'DOMAIN'): 1}
+        >>> len(frame.take(frame.where(maximum_tlp_level=TlpPapLevel.AMBER)))
+        3
+    """
+
+    def __init__(self):
+        self.entities: Dict[str, Column] = {}
+        """The columns of the entities table."""
+
+        self.relations: Dict[str, Column] = {}
+        """The columns of the relations table."""
+
+        self.reference_fields: Tuple[str, ...] = ()
+        """The entity reference fields having a column in the entities table."""
+
+        self.types: List[CommonEntityType] = []
+        """The entity types, indexed by the codes of the type column."""
+
+        self.names: List[str] = []
+        """The entity and relation names, indexed by the codes of the name columns."""
+
+        self.cases: List[Case] = []
+        """The cases, indexed by the values of the case columns."""
+
+        self.entity_extras: List[Optional[Dict[str, Any]]] = []
+        """Per entity row, the values of the fields without column which differ from their default."""
+
+        self.relation_extras: List[Optional[Dict[str, Any]]] = []
+        """Per relation row, the values of the fields without column which differ from their default."""
+
+        self.feed_fields: Dict[str, Any] = {}
+        """The fields of the feed itself (ID, name, description)."""
+
+        self._rows_by_id: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        """Returns the number of entities."""
+        return len(self.entities.get("id_hi", ()))
+
+    @staticmethod
+    def from_feed(feed: ColanderFeed) -> "ColanderFrame":
+        """Builds a frame from a feed.
+
+        Args:
+            feed: The feed to convert.
+
+        Returns:
+            The frame holding the entities, relations and cases of the feed.
+        """
+        frame = ColanderFrame()
+        frame.feed_fields = feed.model_dump(include={"id", "name", "description"})
+        frame.cases = list((feed.cases or {}).values())
+        case_rows = {case.id: row for row, case in enumerate(frame.cases)}
+        entities = list((feed.entities or {}).values())
+        relations = list((feed.relations or {}).values())
+        entity_rows = {entity.id: row for row, entity in enumerate(entities)}
+
+        reference_fields: List[str] = []
+        for entity_class in {entity.__class__ for entity in entities}:
+            for field_name in ReferenceFieldsSchema.of(entity_class).single_references:
+                if field_name != "case" and field_name not in reference_fields:
+                    reference_fields.append(field_name)
+        frame.reference_fields = tuple(sorted(reference_fields))
+
+        types = _Vocabulary()
+        names = _Vocabulary()
+        super_type_codes = {super_type.model_class: code for code, super_type in enumerate(_SUPER_TYPES)}
+        entity_columns: Dict[str, List[int]] = {name: [] for name in (*_ENTITY_COLUMNS, *frame.reference_fields)}
+        for entity in entities:
+            entity_columns["id_hi"].append(entity.id.int >> 64)
+            entity_columns["id_lo"].append(entity.id.int & 0xFFFFFFFFFFFFFFFF)
+            entity_columns["super_type"].append(super_type_codes[entity.__class__])
+            entity_columns["type"].append(types.code(entity.type, _type_key(entity.type)))
+            entity_columns["name"].append(names.code(entity.name))
+            entity_columns["tlp"].append(entity.tlp.value.ordering_value)
+            entity_columns["pap"].append(entity.pap.value.ordering_value)
+            entity_columns["created_at"].append(_to_epoch(entity.created_at))
+            entity_columns["updated_at"].append(_to_epoch(entity.updated_at))
+            entity_columns["case"].append(case_rows.get(get_id(entity.case), -1) if entity.case else -1)
+            extras = ColanderFrame._extras(entity, {"id", *_ENTITY_COLUMNS})
+            for field_name in frame.reference_fields:
+                reference = getattr(entity, field_name, None)
+                row = entity_rows.get(get_id(reference), -1) if reference else -1
+                entity_columns[field_name].append(row)
+                if reference and row < 0:
+                    extras = {**(extras or {}), field_name: get_id(reference)}
+            frame.entity_extras.append(extras)
+        for column_name, values in entity_columns.items():
+            frame.entities[column_name] = _column(ColanderFrame._typecode(column_name), values)
+
+        relation_columns: Dict[str, List[int]] = {name: [] for name in _RELATION_COLUMNS}
+        for relation in relations:
+            relation_columns["id_hi"].append(relation.id.int >> 64)
+            relation_columns["id_lo"].append(relation.id.int & 0xFFFFFFFFFFFFFFFF)
+            relation_columns["name"].append(names.code(relation.name))
+            relation_columns["created_at"].append(_to_epoch(relation.created_at))
+            relation_columns["updated_at"].append(_to_epoch(relation.updated_at))
+            relation_columns["case"].append(case_rows.get(get_id(relation.case), -1) if relation.case else -1)
+            extras = ColanderFrame._extras(relation, {"id", *_RELATION_COLUMNS})
+            for field_name in ("obj_from", "obj_to"):
+                row = entity_rows.get(get_id(getattr(relation, field_name)), -1)
+                relation_columns[field_name].append(row)
+                if row < 0:
+                    extras = {**(extras or {}), field_name: get_id(getattr(relation, field_name))}
+            frame.relation_extras.append(extras)
+        for column_name, values in relation_columns.items():
+            frame.relations[column_name] = _column(ColanderFrame._typecode(column_name), values)
+
+        frame.types = types.values
+        frame.names = names.values
+        return frame
+
+    @staticmethod
+    def _typecode(column_name: str) -> str:
+        if column_name in ("id_hi", "id_lo"):
+            return "Q"
+        if column_name in ("super_type", "tlp", "pap"):
+            return "B"
+        if column_name in ("type", "name"):
+            return "I"
+        return "q"
+
+    @staticmethod
+    def _extras(obj: Any, columns: Set[str]) -> Optional[Dict[str, Any]]:
+        """Returns the values of the fields of an object without column which differ from their default."""
+        schema = ReferenceFieldsSchema.of(obj.__class__)
+        extras = {}
+        for field_name, field in obj.__class__.model_fields.items():
+            if field_name in columns:
+                continue
+            value = getattr(obj, field_name)
+            if field_name in schema.list_references:
+                value = [get_id(v) for v in value] if value else value
+            elif schema.is_reference(field_name):
+                if obj.__class__ is not Case:
+                    continue
+                value = value and get_id(value)
+            if value != field.get_default(call_default_factory=False) and field_name != "colander_internal_type":
+                extras[field_name] = value
+        return extras or None
+
+    def to_feed(self) -> ColanderFeed:
+        """Converts the frame back into a feed.
+
+        Objects are constructed without validation, as their values come from a valid feed.
+
+        Returns:
+            The feed holding the entities, relations and cases of the frame.
+        """
+        levels = {level.value.ordering_value: level for level in TlpPapLevel}
+        entity_ids = [self._uuid(self.entities, row) for row in range(len(self))]
+        entities = {}
+        for row, entity_id in enumerate(entity_ids):
+            super_type = _SUPER_TYPES[self.entities["super_type"][row]]
+            raw: Dict[str, Any] = {
+                "id": entity_id,
+                "colander_internal_type": super_type.model_class.model_fields["colander_internal_type"].default,
+                "type": self.types[self.entities["type"][row]],
+                "name": self.names[self.entities["name"][row]],
+                "tlp": levels[int(self.entities["tlp"][row])],
+                "pap": levels[int(self.entities["pap"][row])],
+                "created_at": _from_epoch(self.entities["created_at"][row]),
+                "updated_at": _from_epoch(self.entities["updated_at"][row]),
+            }
+            if (case_row := self.entities["case"][row]) >= 0:
+                raw["case"] = self.cases[case_row].id
+            for field_name in self.reference_fields:
+                if (reference_row := self.entities[field_name][row]) >= 0:
+                    raw[field_name] = entity_ids[reference_row]
+            raw.update(self.entity_extras[row] or {})
+            entities[entity_id] = raw
+        relations = {}
+        for row in range(len(self.relations.get("id_hi", ()))):
+            relation_id = self._uuid(self.relations, row)
+            raw = {
+                "id": relation_id,
+                "name": self.names[self.relations["name"][row]],
+                "created_at": _from_epoch(self.relations["created_at"][row]),
+                "updated_at": _from_epoch(self.relations["updated_at"][row]),
+            }
+            if (case_row := self.relations["case"][row]) >= 0:
+                raw["case"] = self.cases[case_row].id
+            for field_name in ("obj_from", "obj_to"):
+                if (entity_row := self.relations[field_name][row]) >= 0:
+                    raw[field_name] = entity_ids[entity_row]
+            raw.update(self.relation_extras[row] or {})
+            relations[relation_id] = raw
+        cases = {case.id: {**(self._extras(case, set()) or {}), "id": case.id} for case in self.cases}
+        return ColanderFeed.load(
+            {**self.feed_fields, "entities": entities, "relations": relations, "cases": cases}, trusted=True
+        )
+
+    @staticmethod
+    def _uuid(table: Dict[str, Column], row: int) -> UUID:
+        return UUID(int=(int(table["id_hi"][row]) << 64) | int(table["id_lo"][row]))
+
+    def row_of(self, object_id: Union[str, UUID]) -> int:
+        """Returns the row of an entity.
+
+        Args:
+            object_id: The ID of the entity.
+
+        Returns:
+            The row of the entity, or -1 if it is not in the frame.
+        """
+        if self._rows_by_id is None:
+            self._rows_by_id = {
+                (int(hi) << 64) | int(lo): row
+                for row, (hi, lo) in enumerate(zip(self.entities["id_hi"], self.entities["id_lo"]))
+            }
+        return self._rows_by_id.get((object_id if isinstance(object_id, UUID) else UUID(object_id)).int, -1)
+
+    def where(
+        self,
+        super_types: Optional[Iterable[str]] = None,
+        types: Optional[Iterable[CommonEntityType]] = None,
+        maximum_tlp_level: Optional[TlpPapLevel] = None,
+        maximum_pap_level: Optional[TlpPapLevel] = None,
+        updated_after: Optional[datetime] = None,
+        case: Optional[Case] = None,
+    ) -> FrameMask:
+        """Selects the entities matching all the given predicates, over whole columns.
+
+        Args:
+            super_types: If set, only the entities of these super types (short names, case-insensitive).
+            types: If set, only the entities of these types.
+            maximum_tlp_level: If set, only the entities with a TLP level strictly below this value.
+            maximum_pap_level: If set, only the entities with a PAP level strictly below this value.
+            updated_after: If set, only the entities updated after this time.
+            case: If set, only the entities belonging to this case.
+
+        Returns:
+            The mask of the selected entity rows, to pass to :py:meth:`take` or :py:meth:`count_by`.
+        """
+        mask = None
+        if super_types is not None:
+            short_names = {super_type.replace("_", "").upper() for super_type in super_types}
+            codes = {code for code, super_type in enumerate(_SUPER_TYPES) if super_type.short_name in short_names}
+            mask = _and(mask, _isin(self.entities["super_type"], codes, len(_SUPER_TYPES)))
+        if types is not None:
+            keys = {_type_key(entity_type) for entity_type in types}
+            codes = {code for code, entity_type in enumerate(self.types) if _type_key(entity_type) in keys}
+            mask = _and(mask, _isin(self.entities["type"], codes, len(self.types)))
+        if maximum_tlp_level is not None:
+            mask = _and(mask, _less(self.entities["tlp"], maximum_tlp_level.value.ordering_value))
+        if maximum_pap_level is not None:
+            mask = _and(mask, _less(self.entities["pap"], maximum_pap_level.value.ordering_value))
+        if updated_after is not None:
+            mask = _and(mask, _greater(self.entities["updated_at"], _to_epoch(updated_after)))
+        if case is not None:
+            case_codes = {row for row, c in enumerate(self.cases) if c.id == case.id}
+            mask = _and(mask, _isin(self.entities["case"], case_codes, len(self.cases)))
+        if mask is None:
+            mask = np.ones(len(self), dtype=bool) if np is not None else bytearray(b"\x01") * len(self)
+        return mask
+
+    def count_by(self, column: str, mask: Optional[FrameMask] = None) -> Dict[Any, int]:
+        """Counts the entities per value of a column.
+
+        Args:
+            column: The column to group by: super_type, type, tlp, pap or name.
+            mask: If set, only the selected entities are counted.
+
+        Returns:
+            The number of entities per value, omitting the values with no entity. Super types are keyed by
+            short name, types by (super type short name, type short name), levels by TlpPapLevel member.
+        """
+        values = self.entities[column]
+        if mask is not None:
+            values = _take(values, _rows(mask))
+        if column == "super_type":
+            labels: List[Any] = [super_type.short_name for super_type in _SUPER_TYPES]
+        elif column == "type":
+            super_type_names = {super_type.type_class: super_type.short_name for super_type in _SUPER_TYPES}
+            labels = [(super_type_names.get(type(t), ""), t.short_name) for t in self.types]
+        elif column in ("tlp", "pap"):
+            labels = [None] * 256
+            for level in TlpPapLevel:
+                labels[level.value.ordering_value] = level
+        elif column == "name":
+            labels = self.names
+        else:
+            raise ValueError(f"Entities cannot be counted by {column}")
+        counts: Dict[Any, int] = {}
+        for code, count in enumerate(_bincount(values, len(labels))):
+            if count:
+                counts[labels[code]] = counts.get(labels[code], 0) + count
+        return counts
+
+    def related(self, mask: FrameMask, name: Optional[str] = None, outgoing: bool = True) -> FrameMask:
+        """Selects the entities related to the selected ones, joining the relations table over whole columns.
+
+        Args:
+            mask: The selected entities.
+            name: If set, only the relations with this name are followed.
+            outgoing: If True, follows relations from the selected entities, otherwise to them.
+
+        Returns:
+            The mask of the entities at the other end of the followed relations.
+        """
+        sources, targets = ("obj_from", "obj_to") if outgoing else ("obj_to", "obj_from")
+        source_rows = self.relations[sources]
+        target_rows = self.relations[targets]
+        if np is not None:
+            followed = (source_rows >= 0) & (target_rows >= 0)
+            followed[followed] &= mask[source_rows[followed]]
+            if name is not None:
+                followed &= self.relations["name"] == self._name_code(name)
+            related = np.zeros(len(self), dtype=bool)
+            related[target_rows[followed]] = True
+            return related
+        name_code = None if name is None else self._name_code(name)
+        related = bytearray(len(self))
+        for relation_row, (source, target) in enumerate(zip(source_rows, target_rows)):
+            if source >= 0 and target >= 0 and mask[source]:
+                if name_code is None or self.relations["name"][relation_row] == name_code:
+                    related[target] = 1
+        return related
+
+    def _name_code(self, name: str) -> int:
+        return self.names.index(name) if name in self.names else -1
+
+    def take(self, mask: FrameMask) -> "ColanderFrame":
+        """Returns a frame holding the selected entities, and the relations between them.
+
+        References to entities which are not selected are dropped.
+
+        Args:
+            mask: The selected entities.
+
+        Returns:
+            The new frame, sharing the vocabularies and cases of this one.
+        """
+        rows = _rows(mask)
+        # The new row of each entity, -1 for the entities which are not selected
+        if np is not None:
+            row_map = np.full(len(self), -1, dtype=np.int64)
+            row_map[rows] = np.arange(len(rows))
+        else:
+            row_map = array("q", [-1]) * len(self)
+            for new_row, row in enumerate(rows):
+                row_map[row] = new_row
+        frame = ColanderFrame()
+        frame.reference_fields = self.reference_fields
+        frame.types, frame.names, frame.cases, frame.feed_fields = self.types, self.names, self.cases, self.feed_fields
+        for column_name, values in self.entities.items():
+            values = _take(values, rows)
+            frame.entities[column_name] = _remap(values, row_map) if column_name in self.reference_fields else values
+        frame.entity_extras = [self.entity_extras[row] for row in rows]
+
+        obj_from = _remap(self.relations["obj_from"], row_map)
+        obj_to = _remap(self.relations["obj_to"], row_map)
+        relation_rows = _rows(_and(_greater(obj_from, -1), _greater(obj_to, -1)))
+        for column_name, values in self.relations.items():
+            if column_name == "obj_from":
+                values = obj_from
+            elif column_name == "obj_to":
+                values = obj_to
+            frame.relations[column_name] = _take(values, relation_rows)
+        frame.relation_extras = [self.relation_extras[row] for row in relation_rows]
+        return frame
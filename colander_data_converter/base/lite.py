@@ -0,0 +1,452 @@
+from datetime import datetime
+from types import MappingProxyType
+from typing import IO, Any, ClassVar, Dict, Iterable, Optional, Set, Tuple, Union
+from uuid import UUID
+
+from colander_data_converter.base.common import ReferenceFieldsSchema
+from colander_data_converter.base.models import (
+    Case,
+    ColanderFeed,
+    ColanderType,
+    CommonEntitySuperType,
+    CommonEntitySuperTypes,
+    Entity,
+    EntityRelation,
+    get_id,
+)
+from colander_data_converter.base.streaming import FEED_COLLECTIONS, FeedLoadFilter, iter_raw_feed
+
+__all__ = ["Interner", "LiteRecord", "LiteEntity", "LiteFeed"]
+
+_PLAIN = 0
+_REFERENCE = 1
+_LIST_REFERENCE = 2
+_UNIQUE = 3
+
+_UNIQUE_ENTITY_FIELDS = frozenset({"name", "description", "raw_value", "content", "original_name"})
+"""Entity fields whose values are mostly unique, interning them would cost more memory than it saves."""
+
+
+class Interner:
+    """Shares a single instance of equal immutable values: strings, dates and string dictionaries.
+
+    Dictionaries are shared as read-only :py:class:`~types.MappingProxyType` views, their keys and values
+    being shared too.
+
+    Example:
+        >>> interner = Interner()
+        >>> a = interner("".join(["address", "_block"]))
+        >>> a is interner("".join(["address_", "block"]))
+        True
+        >>> interner({"ASN": "13335"}) is interner({"ASN": "13335"})
+        True
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self):
+        self._values: Dict[Any, Any] = {}
+
+    def __call__(self, value: Any) -> Any:
+        """Returns the shared instance equal to the given value, registering the value on first appearance.
+
+        Args:
+            value: The value to share, values other than strings, dates and dictionaries are returned as is.
+
+        Returns:
+            The shared instance.
+        """
+        if isinstance(value, str):
+            return self._values.setdefault(value, value)
+        if isinstance(value, datetime):
+            # Dates of different time zones may be equal, the time zone is part of the key
+            return self._values.setdefault((value, value.tzinfo), value)
+        if isinstance(value, dict):
+            items = tuple((self(key), self(item)) for key, item in value.items())
+            try:
+                shared = self._values.get((dict, items))
+            except TypeError:
+                # Unhashable values, the dictionary cannot be shared
+                return MappingProxyType(dict(items))
+            if shared is None:
+                shared = self._values[(dict, items)] = MappingProxyType(dict(items))
+            return shared
+        return value
+
+    def __len__(self) -> int:
+        """Returns the number of shared values."""
+        return len(self._values)
+
+
+class LiteRecord:
+    """Base class of the slotted records mirroring the Colander models, for read-mostly workloads.
+
+    A record class is derived once per model class with :py:meth:`of`. It has one slot per model field
+    and no ``__dict__``, so the fields are read like the ones of the model (``record.name``,
+    ``record.attributes["ASN"]``...) for a fraction of its memory. Dates, attributes and repeated strings
+    are shared through an :py:class:`Interner`, attributes being read-only. The mostly unique strings of
+    entities (name, description, raw value...) are not interned. References to other objects hold either
+    the referenced record or its ID. Records are converted back to models with :py:meth:`to_model`, or through a
+    :py:class:`LiteFeed`.
+
+    Example:
+        >>> from colander_data_converter.base.models import Observable
+        >>> from colander_data_converter.base.types.observable import ObservableTypes
+        >>> obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, attributes={"ASN": "13335"})
+        >>> record = LiteRecord.from_model(obs)
+        >>> type(record).__name__, record.name, record.attributes["ASN"], record.super_type.short_name
+        ('LiteObservable', '1.1.1.1', '13335', 'OBSERVABLE')
+        >>> record.to_model().model_dump() == obs.model_dump()
+        True
+    """
+
+    __slots__ = ()
+
+    _cache: ClassVar[Dict[type, type["LiteRecord"]]] = {}
+
+    model_class: ClassVar[type[ColanderType]]
+    """The model class mirrored by the record class."""
+
+    fields: ClassVar[Tuple[str, ...]]
+    """The names of the fields of the model stored in the slots of the record."""
+
+    _field_kinds: ClassVar[Tuple[Tuple[str, int], ...]]
+
+    @classmethod
+    def of(cls, model_class: type[ColanderType]) -> type["LiteRecord"]:
+        """Returns the record class of the given model class, deriving it on first access.
+
+        Args:
+            model_class: The model class to mirror.
+
+        Returns:
+            The record class, named after the model class.
+        """
+        record_class = LiteRecord._cache.get(model_class)
+        if record_class is None:
+            # The internal type has the same value for all the instances, it is a class attribute
+            fields = tuple(name for name in model_class.model_fields if name != "colander_internal_type")
+            schema = ReferenceFieldsSchema.of(model_class)
+            unique_fields = _UNIQUE_ENTITY_FIELDS if issubclass(model_class, Entity) else frozenset()
+            field_kinds = tuple(
+                (
+                    name,
+                    _LIST_REFERENCE
+                    if name in schema.list_references
+                    else _REFERENCE
+                    if name in schema.single_references
+                    else _UNIQUE
+                    if name in unique_fields
+                    else _PLAIN,
+                )
+                for name in fields
+            )
+            namespace: Dict[str, Any] = {
+                "__slots__": fields,
+                "model_class": model_class,
+                "fields": fields,
+                "_field_kinds": field_kinds,
+            }
+            if "colander_internal_type" in model_class.model_fields:
+                namespace["colander_internal_type"] = model_class.model_fields["colander_internal_type"].default
+            base = LiteEntity if issubclass(model_class, Entity) else LiteRecord
+            record_class = LiteRecord._cache[model_class] = type(f"Lite{model_class.__name__}", (base,), namespace)
+        return record_class
+
+    @classmethod
+    def from_model(cls, obj: ColanderType, interner: Optional[Interner] = None) -> "LiteRecord":
+        """Converts a model instance into a record.
+
+        Referenced objects are stored as their IDs, :py:meth:`LiteFeed.resolve_references` replaces them
+        by the records of the feed.
+
+        Args:
+            obj: The model instance.
+            interner: The interner sharing the strings and dates of the records, a new one if not set.
+
+        Returns:
+            The record.
+        """
+        interner = interner if interner is not None else Interner()
+        record_class = cls.of(obj.__class__)
+        record = record_class.__new__(record_class)
+        for field_name, kind in record_class._field_kinds:
+            value = getattr(obj, field_name)
+            if value is None or isinstance(value, UUID):
+                pass
+            elif kind == _LIST_REFERENCE:
+                value = [get_id(reference) for reference in value] if value else value
+            elif kind == _REFERENCE:
+                value = get_id(value)
+            elif kind == _PLAIN:
+                value = interner(value)
+            setattr(record, field_name, value)
+        return record
+
+    def to_raw(self) -> Dict[str, Any]:
+        """Returns the field values of the record, references being replaced by the IDs they point to.
+
+        Returns:
+            The field values, ready to be constructed as a model.
+        """
+        raw: Dict[str, Any] = {}
+        for field_name, kind in self._field_kinds:
+            value = getattr(self, field_name)
+            if kind == _LIST_REFERENCE:
+                value = [get_id(reference) for reference in value] if value else value
+            elif kind == _REFERENCE:
+                value = get_id(value) if value else value
+            elif isinstance(value, MappingProxyType):
+                value = dict(value)
+            raw[field_name] = value
+        if hasattr(self, "colander_internal_type"):
+            raw["colander_internal_type"] = self.colander_internal_type
+        return raw
+
+    def to_model(self) -> ColanderType:
+        """Converts the record back into a model instance, registered into the current repository.
+
+        Returns:
+            The model instance, holding the IDs of the objects it references.
+        """
+        return self.model_class.model_validate(self.to_raw())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(id={getattr(self, 'id', None)!r}, name={getattr(self, 'name', None)!r})"
+
+
+class LiteEntity(LiteRecord):
+    """Base class of the records mirroring the entity models."""
+
+    __slots__ = ()
+
+    @property
+    def super_type(self) -> CommonEntitySuperType:
+        """The super type of the entity."""
+        return self.get_super_type()
+
+    def get_super_type(self) -> CommonEntitySuperType:
+        """Returns the super type of the entity, shared by all the records of its class."""
+        return CommonEntitySuperTypes.by_model_class(self.model_class)  # type: ignore[return-value]
+
+    def get_type(self) -> Any:
+        """Returns the type definition of the entity."""
+        return getattr(self, "type", None)
+
+    def __hash__(self) -> int:
+        return hash(self.id)  # type: ignore[attr-defined]
+
+
+class LiteFeed:
+    """A feed of slotted records, holding the entities, relations and cases of a Colander feed with a low
+    memory footprint.
+
+    Collections are keyed by the :py:class:`~uuid.UUID` of the records, the key being the ID of the record
+    itself, and all the records of a feed share the same :py:class:`Interner`. Use :py:meth:`load` to build a
+    feed from a file one object at a time, without ever holding the models of the whole feed in memory.
+
+    Example:
+        >>> from colander_data_converter.base.models import Observable, Threat
+        >>> from colander_data_converter.base.types.observable import ObservableTypes
+        >>> from colander_data_converter.base.types.threat import ThreatTypes
+        >>> feed = ColanderFeed()
+        >>> threat = Threat(name="Stalkerware", type=ThreatTypes.STALKERWARE.value)
+        >>> feed.add(threat)
+        >>> feed.add(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, associated_threat=threat))
+        >>> lite_feed = LiteFeed.from_feed(feed)
+        >>> [entity.associated_threat.name for entity in lite_feed.entities.values() if entity.name == "1.1.1.1"]
+        ['Stalkerware']
+        >>> lite_feed.to_feed().model_dump() == feed.model_dump()
+        True
+    """
+
+    def __init__(self, fields: Optional[Dict[str, Any]] = None, interner: Optional[Interner] = None):
+        """Initializes an empty feed.
+
+        Args:
+            fields: The fields of the feed itself (ID, name, description).
+            interner: The interner shared by the records of the feed, a new one if not set.
+        """
+        self.fields: Dict[str, Any] = fields or {}
+        """The fields of the feed itself (ID, name, description)."""
+
+        self.interner: Interner = interner if interner is not None else Interner()
+        """The interner shared by the records of the feed."""
+
+        self.entities: Dict[UUID, LiteEntity] = {}
+        """The entity records, keyed by their IDs."""
+
+        self.relations: Dict[UUID, LiteRecord] = {}
+        """The relation records, keyed by their IDs."""
+
+        self.cases: Dict[UUID, LiteRecord] = {}
+        """The case records, keyed by their IDs."""
+
+    def __len__(self) -> int:
+        """Returns the number of entities."""
+        return len(self.entities)
+
+    def add(self, obj: Union[Case, Entity, EntityRelation]) -> LiteRecord:
+        """Converts a model instance into a record of the feed.
+
+        Call :py:meth:`resolve_references` once all the objects are added.
+
+        Args:
+            obj: The case, entity or relation to add.
+
+        Returns:
+            The record of the object.
+        """
+        record = LiteRecord.from_model(obj, self.interner)
+        if isinstance(obj, Entity):
+            self.entities[record.id] = record  # type: ignore[attr-defined, assignment]
+        elif isinstance(obj, EntityRelation):
+            self.relations[record.id] = record  # type: ignore[attr-defined]
+        else:
+            self.cases[record.id] = record  # type: ignore[attr-defined]
+        return record
+
+    def get(self, object_id: Union[str, UUID]) -> Optional[LiteRecord]:
+        """Returns the entity, relation or case record with the given ID.
+
+        Args:
+            object_id: The ID of the object.
+
+        Returns:
+            The record, or None if the feed has no object with this ID.
+        """
+        object_id = object_id if isinstance(object_id, UUID) else UUID(object_id)
+        for collection in (self.entities, self.relations, self.cases):
+            if (record := collection.get(object_id)) is not None:
+                return record
+        return None
+
+    def resolve_references(self):
+        """Replaces the IDs held by the reference fields of the records by the records of the feed."""
+        for collection in (self.cases, self.entities, self.relations):
+            for record in collection.values():
+                schema = ReferenceFieldsSchema.of(record.model_class)
+                for field_name, is_list in schema.references:
+                    value = getattr(record, field_name)
+                    if not value:
+                        continue
+                    if is_list:
+                        setattr(record, field_name, [self.get(get_id(reference)) or reference for reference in value])
+                    elif isinstance(value, UUID):
+                        setattr(record, field_name, self.get(value) or value)
+
+    @staticmethod
+    def from_feed(feed: ColanderFeed, interner: Optional[Interner] = None) -> "LiteFeed":
+        """Converts a feed into a feed of records.
+
+        Args:
+            feed: The feed to convert.
+            interner: The interner shared by the records, a new one if not set.
+
+        Returns:
+            The feed of records, whose references are resolved.
+        """
+        lite_feed = LiteFeed(feed.model_dump(include={"id", "name", "description"}), interner)
+        for collection in (feed.cases, feed.entities, feed.relations):
+            for obj in (collection or {}).values():
+                lite_feed.add(obj)
+        lite_feed.resolve_references()
+        return lite_feed
+
+    @staticmethod
+    def load(
+        fp: IO,
+        load_filter: Optional[FeedLoadFilter] = None,
+        resolve_types: bool = True,
+        interner: Optional[Interner] = None,
+        chunk_size: int = 1 << 16,
+    ) -> "LiteFeed":
+        """Loads a Colander feed file into a feed of records, one object at a time.
+
+        Each object is read, checked against the filter, validated, converted into a record and released, like
+        :py:func:`~colander_data_converter.base.streaming.load_feed` does, so only the records are held in memory.
+        Objects are not registered into any repository.
+
+        Args:
+            fp: The feed file, opened in text or binary mode.
+            load_filter: The predicates selecting the objects to load, everything is loaded if not set.
+            resolve_types: If True, resolves entity types based on the types enum.
+            interner: The interner shared by the records, a new one if not set.
+            chunk_size: The number of characters (or bytes) read from the file at once.
+
+        Returns:
+            The feed of records, whose references are resolved.
+
+        Raises:
+            ValueError: If there are inconsistencies in object IDs or an unsupported entity super type.
+
+        Example:
+            >>> import io
+            >>> raw = '''{"name": "feed", "entities": {"bcbb2c31-ff61-465a-a770-85c154733567": {
+            ...     "id": "bcbb2c31-ff61-465a-a770-85c154733567", "name": "1.1.1.1",
+            ...     "super_type": {"short_name": "OBSERVABLE"}, "type": {"short_name": "IPV4", "name": "IPv4"}
+            ... }}}'''
+            >>> lite_feed = LiteFeed.load(io.StringIO(raw))
+            >>> lite_feed.get("bcbb2c31-ff61-465a-a770-85c154733567").type.name
+            'IPv4'
+        """
+        load_filter = load_filter or FeedLoadFilter()
+        context = {"register": False}
+        lite_feed = LiteFeed(interner=interner)
+        skipped_entities: Set[UUID] = set()
+        for key, object_id, raw_object in iter_raw_feed(fp, chunk_size=chunk_size):
+            if object_id is None:
+                if key not in FEED_COLLECTIONS:
+                    lite_feed.fields[key] = raw_object
+                continue
+            if object_id != raw_object.get("id"):
+                raise ValueError(f"{object_id} does not match with the ID of {raw_object}")
+            if not load_filter.accepts(key, raw_object):
+                if key == "entities":
+                    skipped_entities.add(UUID(object_id))
+                continue
+            if key == "entities":
+                super_type_name = (raw_object.get("super_type") or {}).get("short_name", "")
+                if (super_type := CommonEntitySuperTypes.by_short_name(super_type_name)) is None:
+                    raise ValueError(f"Unsupported super type {super_type_name} of {object_id}")
+                obj = super_type.model_class.model_validate(raw_object, context=context)
+                if resolve_types:
+                    obj.type = super_type.types_class.by_short_name(obj.type.short_name)
+            elif key == "relations":
+                obj = EntityRelation.model_validate(raw_object, context=context)
+            else:
+                obj = Case.model_validate(raw_object, context=context)
+            lite_feed.add(obj)
+
+        if skipped_entities:
+            lite_feed.relations = {
+                relation_id: relation
+                for relation_id, relation in lite_feed.relations.items()
+                if relation.obj_from not in skipped_entities and relation.obj_to not in skipped_entities  # type: ignore[attr-defined]
+            }
+        lite_feed.resolve_references()
+        return lite_feed
+
+    @staticmethod
+    def _raw_collection(records: Iterable[LiteRecord]) -> Dict[UUID, Dict[str, Any]]:
+        """Returns the field values of the given records, keyed by their IDs."""
+        return {record.id: record.to_raw() for record in records}  # type: ignore[attr-defined]
+
+    def to_feed(self) -> ColanderFeed:
+        """Converts the feed of records back into a feed.
+
+        Objects are constructed without validation, as their values come from valid models.
+
+        Returns:
+            The feed holding the entities, relations and cases of the records.
+        """
+        return ColanderFeed.load(
+            {
+                **self.fields,
+                "entities": self._raw_collection(self.entities.values()),
+                "relations": self._raw_collection(self.relations.values()),
+                "cases": self._raw_collection(self.cases.values()),
+            },
+            resolve_types=False,
+            trusted=True,
+        )
@@ -1,8 +1,31 @@
 import abc
 import enum
+import hashlib
+import json
+from copy import copy
+import os
+import random
+import threading
 from datetime import datetime, UTC
-from typing import List, Dict, Optional, Union, Annotated, Literal, get_args, Any
-from uuid import uuid4, UUID
+from pathlib import Path
+from typing import (
+    List,
+    Dict,
+    Optional,
+    Union,
+    Annotated,
+    Literal,
+    Any,
+    Tuple,
+    NamedTuple,
+    Iterator,
+    Callable,
+    Set,
+    Self,
+    get_args,
+)
+from uuid import uuid4, uuid5, UUID
+from weakref import WeakValueDictionary, ref
 
 from pydantic import (
     PositiveInt,
@@ -12,19 +35,28 @@ from pydantic import (
     AnyUrl,
     computed_field,
     model_validator,
+    field_validator,
+    field_serializer,
     ConfigDict,
     Field,
+    PrivateAttr,
+    AliasChoices,
+    Discriminator,
+    Tag,
+    ValidationError,
+    ValidationInfo,
 )
 
 from colander_data_converter.base.common import (
     ObjectReference,
     TlpPapLevel,
-    Singleton,
     LRUDict,
+    ContextBound,
+    ReferenceFieldsSchema,
 )
 from colander_data_converter.base.types.actor import ActorType, ActorTypes
 from colander_data_converter.base.types.artifact import ArtifactType, ArtifactTypes
-from colander_data_converter.base.types.base import EntityType_T
+from colander_data_converter.base.types.base import EntityType_T, CommonEntityType
 from colander_data_converter.base.types.data_fragment import DataFragmentType, DataFragmentTypes
 from colander_data_converter.base.types.detection_rule import DetectionRuleType, DetectionRuleTypes
 from colander_data_converter.base.types.device import DeviceType, DeviceTypes
@@ -34,6 +66,12 @@ from colander_data_converter.base.types.threat import ThreatType, ThreatTypes
 
 resource_package = __name__
 
+_FINGERPRINTS = "_fingerprints"
+"""The key of the memoized fingerprints in the ``__dict__`` of a model, ignored by pydantic."""
+
+_INDEXES = "_indexes"
+"""The key of the weak references to the indexes holding a model in its ``__dict__``, ignored by pydantic."""
+
 
 def get_id(obj: Any) -> Optional[UUID4]:
     """
@@ -61,21 +99,72 @@ def get_id(obj: Any) -> Optional[UUID4]:
     return None
 
 
+def get_entity_discriminator(obj: Any) -> Optional[str]:
+    """Returns the internal type of an entity, given as a model instance or as raw data.
+
+    Raw data is discriminated by its 'colander_internal_type' key if any, otherwise by the short name
+    of its super type, as in the feeds exported by Colander. This lets pydantic select the entity
+    class while validating, including from JSON, without any pre-processing of the data.
+
+    Args:
+        obj: The entity or its raw data.
+
+    Returns:
+        The internal type of the entity (observable, datafragment...), or None if it cannot be determined.
+
+    Example:
+        >>> get_entity_discriminator({"super_type": {"short_name": "DATA_FRAGMENT"}})
+        'datafragment'
+        >>> get_entity_discriminator("bcbb2c31-ff61-465a-a770-85c154733567") is None
+        True
+    """
+    if isinstance(obj, dict):
+        if (internal_type := obj.get("colander_internal_type")) is not None:
+            return internal_type
+        super_type = obj.get("super_type")
+        if isinstance(super_type, dict) and isinstance(short_name := super_type.get("short_name"), str):
+            return short_name.lower().replace("_", "")
+        return None
+    return getattr(obj, "colander_internal_type", None)
+
+
+_fingerprinted_fields_cache: Dict[Tuple[type, bool], Set[str]] = {}
+
+
+def _fingerprinted_fields(model_class: type[BaseModel], ignore_updated_at: bool) -> Set[str]:
+    """Returns the names of the plain fields of a model class that are part of the object fingerprints.
+
+    Args:
+        model_class: The model class.
+        ignore_updated_at: If True, the ``updated_at`` field is left out.
+
+    Returns:
+        The names of the fields, computed once per model class.
+    """
+    key = (model_class, ignore_updated_at)
+    fields = _fingerprinted_fields_cache.get(key)
+    if fields is None:
+        excluded = {"id", "updated_at"} if ignore_updated_at else {"id"}
+        fields = set(ReferenceFieldsSchema.of(model_class).plain_fields) - excluded
+        _fingerprinted_fields_cache[key] = fields
+    return fields
+
+
 # Annotated union type representing all possible entity definitions in the model.
 # This type is used for fields that can accept any of the defined entity classes.
-# The Field discriminator 'colander_internal_type' is used for type resolution during (de)serialization.
+# The callable discriminator is used for type resolution during (de)serialization.
 EntityTypes = Annotated[
     Union[
-        "Actor",
-        "Artifact",
-        "DataFragment",
-        "Observable",
-        "DetectionRule",
-        "Device",
-        "Event",
-        "Threat",
+        Annotated["Actor", Tag("actor")],
+        Annotated["Artifact", Tag("artifact")],
+        Annotated["DataFragment", Tag("datafragment")],
+        Annotated["Observable", Tag("observable")],
+        Annotated["DetectionRule", Tag("detectionrule")],
+        Annotated["Device", Tag("device")],
+        Annotated["Event", Tag("event")],
+        Annotated["Threat", Tag("threat")],
     ],
-    Field(discriminator="colander_internal_type"),
+    Discriminator(get_entity_discriminator),
 ]
 
 
@@ -94,37 +183,150 @@ class ColanderType(BaseModel):
         """Executes post-initialization logic for the model, ensuring the repository
         registers the current subclass instance.
 
+        The instance is registered into the repository provided by the validation context
+        (``context={"repository": ...}``) if any, otherwise into the repository of the current context.
+        It is not registered at all with ``context={"register": False}``.
+
         Args:
             __context (Any): Additional context provided for post-initialization handling.
         """
-        _ = ColanderRepository()
-        _ << self
+        if isinstance(__context, dict) and __context.get("register") is False:
+            return
+        repository = __context.get("repository") if isinstance(__context, dict) else None
+        if repository is None:
+            repository = ColanderRepository.current()
+        repository << self
+
+    def __setattr__(self, name: str, value: Any):
+        """Sets an attribute and forgets the memoized fingerprints of the object.
+
+        Args:
+            name: The name of the attribute.
+            value: The new value of the attribute.
+        """
+        super().__setattr__(name, value)
+        self.__dict__.pop(_FINGERPRINTS, None)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> Any:
+        """Returns a copy of the model, without the memoized fingerprints if fields are updated.
 
-    def _process_reference_fields(self, operation, strict=False):
+        Args:
+            update: Values to change or add in the copy.
+            deep: Set to True to make a deep copy of the model.
+
+        Returns:
+            The copy of the model.
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied.__dict__.pop(_FINGERPRINTS, None)
+        return copied
+
+    def __copy__(self) -> Any:
+        # A copy does not belong to the indexes of the original object
+        copied = super().__copy__()
+        copied.__dict__.pop(_INDEXES, None)
+        return copied
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Any:
+        copied = super().__deepcopy__(memo)
+        copied.__dict__.pop(_INDEXES, None)
+        return copied
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        state = super().__getstate__()
+        if _INDEXES in state["__dict__"]:
+            state["__dict__"] = {k: v for k, v in state["__dict__"].items() if k != _INDEXES}
+        return state
+
+    def fingerprint(self, ignore_updated_at: bool = False) -> str:
+        """Returns a stable fingerprint of the content of the object.
+
+        All the fields but the ID are hashed, references to other objects by the ID of the referenced
+        object only: resolving or unlinking references does not change the fingerprint. The fingerprint
+        is memoized until an attribute of the object is set. Changes made in place, such as updating the
+        ``attributes`` dictionary without assigning it, are not detected.
+
+        Args:
+            ignore_updated_at: If True, the ``updated_at`` field is not part of the fingerprint.
+
+        Returns:
+            The fingerprint, as a hexadecimal string.
+
+        Example:
+            >>> obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+            >>> obs2 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, updated_at=datetime.now(UTC))
+            >>> obs1.fingerprint() == obs2.fingerprint()
+            False
+            >>> obs1.fingerprint(ignore_updated_at=True) == obs2.fingerprint(ignore_updated_at=True)
+            True
+            >>> fingerprint = obs1.fingerprint()
+            >>> obs1.name = "8.8.8.8"
+            >>> obs1.fingerprint() == fingerprint
+            False
+        """
+        fingerprints = self.__dict__.get(_FINGERPRINTS)
+        if fingerprints is None:
+            fingerprints = self.__dict__[_FINGERPRINTS] = {}
+        elif (found := fingerprints.get(ignore_updated_at)) is not None:
+            return found
+        schema = ReferenceFieldsSchema.of(self.__class__)
+        content = self.model_dump(mode="json", include=_fingerprinted_fields(self.__class__, ignore_updated_at))
+        for field, is_list in schema.references:
+            ref = getattr(self, field)
+            if is_list:
+                content[field] = [str(get_id(r)) for r in ref] if ref is not None else None
+            else:
+                content[field] = str(get_id(ref)) if ref is not None else None
+        serialized = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+        found = fingerprints[ignore_updated_at] = hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+        return found
+
+    @staticmethod
+    def _lookup_reference(ref: UUID, repository: Optional["ColanderRepository"] = None) -> Any:
+        """Looks up a referenced object, first in the given repository then in the current one.
+
+        Args:
+            ref: The UUID of the referenced object.
+            repository: The repository to search first. Defaults to None.
+
+        Returns:
+            The referenced object if found, the UUID otherwise.
+        """
+        if repository is not None:
+            x = repository >> ref
+            if not isinstance(x, UUID):
+                return x
+        return ColanderRepository.current() >> ref
+
+    def _process_reference_fields(self, operation, strict=False, repository=None):
         """Helper method to process reference fields for both unlinking and resolving operations.
 
         Args:
             operation: The operation to perform, either 'unlink' or 'resolve'.
             strict: If True, raises a ValueError when a UUID reference cannot be resolved.
                 Only used for 'resolve' operation. Defaults to False.
+            repository: The repository used to resolve references before falling back to the
+                current repository. Only used for 'resolve' operation. Defaults to None.
 
         Raises:
             ValueError: If strict is True, and a UUID reference cannot be resolved.
             AttributeError: If the class instance does not have the expected field or attribute.
         """
-        for field, info in self.__class__.model_fields.items():
-            annotation_args = get_args(info.annotation)
-            if ObjectReference in annotation_args:
+        for field, is_list in ReferenceFieldsSchema.of(self.__class__).references:
+            if not is_list:
                 ref = getattr(self, field)
                 if operation == "unlink" and ref and type(ref) is not UUID:
                     setattr(self, field, ref.id)
                 elif operation == "resolve" and type(ref) is UUID:
-                    x = ColanderRepository() >> ref
+                    x = self._lookup_reference(ref, repository)
                     if strict and isinstance(x, UUID):
                         raise ValueError(f"Unable to resolve UUID reference {x}")
                     setattr(self, field, x)
-            elif List[ObjectReference] in annotation_args:
+            else:
                 refs = getattr(self, field)
+                if not refs:
+                    continue
                 new_refs = []
                 _update = False
                 for ref in refs:
@@ -132,11 +334,13 @@ class ColanderType(BaseModel):
                         new_refs.append(ref.id)
                         _update = True
                     elif operation == "resolve" and type(ref) is UUID:
-                        x = ColanderRepository() >> ref
+                        x = self._lookup_reference(ref, repository)
                         if strict and isinstance(x, UUID):
                             raise ValueError(f"Unable to resolve UUID reference {x}")
                         new_refs.append(x)
                         _update = True
+                    else:
+                        new_refs.append(ref)
                 if _update:
                     setattr(self, field, new_refs)
 
@@ -160,7 +364,7 @@ class ColanderType(BaseModel):
         """
         self._process_reference_fields("unlink")
 
-    def resolve_references(self, strict=False):
+    def resolve_references(self, strict=False, repository: Optional["ColanderRepository"] = None):
         """Resolves references for the fields in the object's model.
 
         Fields annotated with `ObjectReference` or `List[ObjectReference]` are processed
@@ -171,33 +375,35 @@ class ColanderType(BaseModel):
         Args:
             strict: If True, raises a ValueError when a UUID reference cannot be resolved.
                    If False, unresolved references remain as UUIDs.
+            repository: The repository to search first, the current repository is used as fallback.
 
         Raises:
             ValueError: If strict is True and a UUID reference cannot be resolved.
         """
-        self._process_reference_fields("resolve", strict)
+        self._process_reference_fields("resolve", strict, repository)
 
-    def is_fully_resolved(self) -> bool:
+    def is_fully_resolved(self, repository: Optional["ColanderRepository"] = None) -> bool:
         """
         Checks whether all object references in the model are fully resolved.
 
         This method verifies that all fields annotated as `ObjectReference` or `List[ObjectReference]`
         do not contain unresolved UUIDs, indicating that references have been replaced with actual objects.
 
+        Args:
+            repository: The repository to search first when resolving references, the current
+                repository is used as fallback.
+
         Returns:
             bool: True if all references are resolved to objects, False if any remain as UUIDs.
         """
-        self.resolve_references()
+        self.resolve_references(repository=repository)
 
-        for field, info in self.__class__.model_fields.items():
-            annotation_args = get_args(info.annotation)
-            if ObjectReference in annotation_args:
-                ref = getattr(self, field)
-                if isinstance(ref, UUID):
+        for field, is_list in ReferenceFieldsSchema.of(self.__class__).references:
+            if not is_list:
+                if isinstance(getattr(self, field), UUID):
                     return False
-            elif List[ObjectReference] in annotation_args:
-                refs = getattr(self, field)
-                for ref in refs:
+            else:
+                for ref in getattr(self, field) or []:
                     if isinstance(ref, UUID):
                         return False
         return True
@@ -292,13 +498,25 @@ class ColanderType(BaseModel):
         return self.get_super_type()
 
     def get_super_type(self) -> "CommonEntitySuperType":
-        return CommonEntitySuperType(
-            **{
-                "name": self.__class__.__name__,
-                "short_name": self.__class__.__name__.upper(),
-                "_class": self.__class__,
-            }
-        )
+        """Returns the super type of this object, shared by all the instances of its class.
+
+        Returns:
+            The super type, named after the class of this object.
+
+        Example:
+            >>> obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+            >>> obs.get_super_type().short_name
+            'OBSERVABLE'
+            >>> obs.get_super_type() is Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value).super_type
+            True
+        """
+        if (super_type := _SUPER_TYPES.get(self.__class__)) is None:
+            super_type = CommonEntitySuperType(name=self.__class__.__name__, short_name=self.__class__.__name__.upper())
+            _SUPER_TYPES[self.__class__] = super_type
+        return super_type
+
+
+_SUPER_TYPES: Dict[type, "CommonEntitySuperType"] = {}
 
 
 class Case(ColanderType):
@@ -383,6 +601,20 @@ class Entity(ColanderType, abc.ABC):
     tlp: TlpPapLevel = TlpPapLevel.WHITE
     """The TLP (Traffic Light Protocol) level for the entity."""
 
+    @field_validator("type", mode="before", check_fields=False)
+    @classmethod
+    def _intern_type(cls, value: Any, info: ValidationInfo) -> Any:
+        """Resolves a raw entity type to the shared member of the types enum it describes.
+
+        Entities of the same type then share a single type instance instead of validating their own copy.
+        With ``context={"resolve_types": True}``, the member is selected by short name only, as
+        :py:meth:`ColanderFeed.resolve_types` would do after validation.
+        """
+        if isinstance(value, dict):
+            resolve = isinstance(info.context, dict) and info.context.get("resolve_types") is True
+            return _intern_entity_type(cls.model_fields["type"].annotation, value, resolve=resolve)
+        return value
+
     def touch(self):
         """Touch this entity's attributes."""
         self.updated_at = datetime.now(UTC)
@@ -401,73 +633,92 @@ class Entity(ColanderType, abc.ABC):
             return getattr(self, "type")
         return None
 
-    def get_immutable_relations(
+    def iter_immutable_relations(
         self, mapping: Optional[Dict[str, str]] = None, default_name: Optional[str] = None
-    ) -> Dict[str, "EntityRelation"]:
+    ) -> Iterator["ImmutableRelation"]:
         """
-        Returns a dictionary of immutable relations derived from the entity's reference fields.
-
-        This method automatically creates EntityRelation objects by inspecting the entity's fields
-        and identifying those annotated as ObjectReference or List[ObjectReference]. These represent
-        the entity's connections to other entities in the knowledge graph, forming the basis for
-        graph traversal and relationship analysis.
+        Iterates over the immutable relations derived from the entity's reference fields.
 
         Immutable relations are derived from the entity's structure and cannot be modified directly.
         They represent inherent relationships defined by the entity's reference fields, such as
-        'extracted_from', 'operated_by', 'associated_threat', etc.
+        'extracted_from', 'operated_by', 'associated_threat', etc. They are yielded as lightweight
+        :py:class:`ImmutableRelation` views: no EntityRelation is validated nor registered in a
+        repository, and each view has a deterministic ID computed from this entity, the field and
+        the referenced entity.
 
         Args:
-            mapping: A dictionary to customize relation names. Keys should
-                be field names, and values should be the desired relation names. If not provided,
-                field names are converted to human-readable format by replacing underscores with spaces.
-                Defaults to None.
+            mapping: A dictionary to customize relation names. Keys should be field names, and values
+                should be the desired relation names. If not provided, field names are used.
             default_name: If a mapping is provided but no field mapping was found, the relation
-                will be named 'default_new_name'.
+                is named 'default_name'.
 
-        Returns:
-            A dictionary of EntityRelation objects keyed by their string
-            representation of relation IDs. Each relation represents a connection from this entity
-            to another entity referenced in its fields.
+        Yields:
+            An ImmutableRelation per referenced entity, having this entity as the source (obj_from).
 
-        Note:
-            - The 'case' field is explicitly excluded from relation generation as it represents
-              a grouping mechanism rather than a semantic relationship.
-            - Only fields with actual values (not None or empty) are processed.
-            - Each EntityRelation created has this entity as the source (obj_from) and the
-              referenced entity as the target (obj_to).
+        Example:
+            >>> threat = Threat(name="Threat", type=ThreatTypes.GENERIC.value)
+            >>> obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, associated_threat=threat)
+            >>> relation = next(obs.iter_immutable_relations())
+            >>> relation.name, relation.obj_to is threat
+            ('associated_threat', True)
+            >>> relation.id == next(obs.iter_immutable_relations()).id
+            True
         """
         name_mapping = mapping or {}
-        relations: Dict[str, "EntityRelation"] = {}
-        for field_name, field_info in self.__class__.model_fields.items():
+        for field_name, is_list in ReferenceFieldsSchema.of(self.__class__).references:
             if field_name == "case":
                 continue
-            field_annotation = get_args(field_info.annotation)
             field_value = getattr(self, field_name, None)
 
-            if not field_value or not field_annotation:
+            if not field_value:
                 continue
 
-            # Handle single ObjectReference
-            if ObjectReference in field_annotation:
-                relation_name = name_mapping.get(field_name, default_name or field_name)
-                relation = EntityRelation(
+            relation_name = name_mapping.get(field_name, default_name or field_name)
+            for object_reference in field_value if is_list else (field_value,):
+                # Name-based UUID carrying the version 4 bits expected by the UUID4 fields
+                relation_id = UUID(bytes=uuid5(self.id, f"{field_name}:{get_id(object_reference)}").bytes, version=4)
+                yield ImmutableRelation(
+                    id=relation_id,
                     name=relation_name,
                     obj_from=self,
-                    obj_to=field_value,
+                    obj_to=object_reference,
+                    field_name=field_name,
                 )
-                relations[str(relation.id)] = relation
-
-            # Handle List[ObjectReference]
-            elif List[ObjectReference] in field_annotation:
-                for object_reference in field_value:
-                    relation_name = name_mapping.get(field_name, default_name or field_name)
-                    relation = EntityRelation(
-                        name=relation_name,
-                        obj_from=self,
-                        obj_to=object_reference,
-                    )
-                    relations[str(relation.id)] = relation
 
+    def get_immutable_relations(
+        self, mapping: Optional[Dict[str, str]] = None, default_name: Optional[str] = None
+    ) -> Dict[UUID, "EntityRelation"]:
+        """
+        Returns a dictionary of immutable relations derived from the entity's reference fields.
+
+        This method materializes the views yielded by :py:meth:`iter_immutable_relations` as
+        EntityRelation objects. These represent the entity's connections to other entities in the
+        knowledge graph, forming the basis for graph traversal and relationship analysis. Prefer
+        :py:meth:`iter_immutable_relations` when the relations are only read.
+
+        Args:
+            mapping: A dictionary to customize relation names. Keys should
+                be field names, and values should be the desired relation names. If not provided,
+                field names are used. Defaults to None.
+            default_name: If a mapping is provided but no field mapping was found, the relation
+                will be named 'default_new_name'.
+
+        Returns:
+            A dictionary of EntityRelation objects keyed by their relation IDs,
+            string IDs being accepted too. Each relation represents a connection from this entity
+            to another entity referenced in its fields.
+
+        Note:
+            - The 'case' field is explicitly excluded from relation generation as it represents
+              a grouping mechanism rather than a semantic relationship.
+            - Only fields with actual values (not None or empty) are processed.
+            - Each EntityRelation created has this entity as the source (obj_from) and the
+              referenced entity as the target (obj_to).
+            - The EntityRelation objects are not registered in any repository.
+        """
+        relations: Dict[UUID, "EntityRelation"] = ObjectIdDict()
+        for immutable_relation in self.iter_immutable_relations(mapping=mapping, default_name=default_name):
+            relations[immutable_relation.id] = immutable_relation.to_relation()
         return relations
 
     def add_tags(self, tags: Optional[List[str]]):
@@ -493,6 +744,21 @@ class Entity(ColanderType, abc.ABC):
     def __hash__(self) -> int:
         return hash(self.id)
 
+    def __setattr__(self, name: str, value: Any):
+        """Sets an attribute and keeps the indexes holding the entity up to date when a similarity field changes.
+
+        Args:
+            name: The name of the attribute.
+            value: The new value of the attribute.
+        """
+        if name not in EntityIndex.indexed_fields or not self.__dict__.get(_INDEXES):
+            super().__setattr__(name, value)
+            return
+        previous = getattr(self, name, None)
+        super().__setattr__(name, value)
+        if previous != value:
+            EntityIndex.notify(self)
+
 
 class EntityRelation(ColanderType):
     """EntityRelation represents a relationship between two entities in the model.
@@ -539,16 +805,67 @@ class EntityRelation(ColanderType):
     attributes: Optional[Dict[str, str]] = None
     """Dictionary of additional attributes for the relation."""
 
-    obj_from: EntityTypes | ObjectReference = Field(...)
-    """The source entity or reference in the relation."""
+    obj_from: EntityTypes | ObjectReference = Field(..., validation_alias=AliasChoices("obj_from", "obj_from_id"))
+    """The source entity or reference in the relation, also read from 'obj_from_id' (legacy)."""
 
-    obj_to: EntityTypes | ObjectReference = Field(...)
-    """The target entity or reference in the relation."""
+    obj_to: EntityTypes | ObjectReference = Field(..., validation_alias=AliasChoices("obj_to", "obj_to_id"))
+    """The target entity or reference in the relation, also read from 'obj_to_id' (legacy)."""
 
     def touch(self):
         """Touch this relation's attributes."""
         self.updated_at = datetime.now(UTC)
 
+    def __setattr__(self, name: str, value: Any):
+        """Sets an attribute and keeps the indexes holding the relation up to date when the name or an end changes.
+
+        Args:
+            name: The name of the attribute.
+            value: The new value of the attribute.
+        """
+        if name not in RelationIndex.indexed_fields or not self.__dict__.get(_INDEXES):
+            super().__setattr__(name, value)
+            return
+        previous = getattr(self, name, None)
+        super().__setattr__(name, value)
+        if name == "name" and previous == value or name != "name" and get_id(previous) == get_id(value):
+            return
+        RelationIndex.notify(self)
+
+
+class ImmutableRelation(NamedTuple):
+    """Lightweight view of an immutable relation, i.e. a reference held by a field of an entity.
+
+    Views are plain tuples yielded by :py:meth:`Entity.iter_immutable_relations`. They expose the
+    same ``id``, ``name``, ``obj_from`` and ``obj_to`` attributes as EntityRelation, and are
+    materialized as EntityRelation objects by :py:meth:`to_relation` only when needed.
+    """
+
+    id: UUID
+    """The deterministic ID of the relation, derived from the source entity, the field and the target."""
+
+    name: str
+    """The name of the relation."""
+
+    obj_from: Entity
+    """The entity holding the reference."""
+
+    obj_to: Any
+    """The referenced entity, or its ID if the reference is not resolved."""
+
+    field_name: str
+    """The name of the reference field."""
+
+    def to_relation(self) -> EntityRelation:
+        """Materializes the view as an EntityRelation having the same ID, without registering it in a repository.
+
+        Returns:
+            The EntityRelation.
+        """
+        return EntityRelation.model_validate(
+            {"id": self.id, "name": self.name, "obj_from": self.obj_from, "obj_to": self.obj_to},
+            context={"register": False},
+        )
+
 
 class Actor(Entity):
     """
@@ -880,22 +1197,444 @@ class Event(Entity):
         return self
 
 
-class ColanderRepository(object, metaclass=Singleton):
-    """Singleton repository for managing and storing Case, Entity, and EntityRelation objects.
+def _object_key(key: Any) -> Any:
+    """Returns the UUID an object ID stands for, parsing it if it is given as a string.
+
+    Args:
+        key: The object ID, as a UUID or as a string.
+
+    Returns:
+        The UUID of the object, or the key itself if it is not an object ID.
+    """
+    if isinstance(key, str):
+        try:
+            return UUID(key)
+        except ValueError:
+            return key
+    return key
+
+
+class ObjectIdDict(dict):
+    """Dictionary of Colander objects keyed by the UUIDs of their IDs.
+
+    Objects are looked up with the UUIDs they hold, without converting them to strings and back. For
+    compatibility, string IDs are accepted by all the methods and parsed once, keys which are not IDs
+    are kept as they are. The collections of a feed are still serialized with string keys.
+
+    Example:
+        >>> obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        >>> objects = ObjectIdDict({str(obs.id): obs})
+        >>> objects[obs.id] is objects[str(obs.id)] is obs
+        True
+        >>> list(objects) == [obs.id], "not-an-id" in objects
+        (True, False)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def __getitem__(self, key: str | UUID) -> Any:
+        return super().__getitem__(key if type(key) is UUID else _object_key(key))
+
+    def __contains__(self, key: Any) -> bool:
+        return super().__contains__(key if type(key) is UUID else _object_key(key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return super().get(key if type(key) is UUID else _object_key(key), default)
+
+    def __setitem__(self, key: str | UUID, value: Any):
+        super().__setitem__(_object_key(key), value)
+
+    def __delitem__(self, key: str | UUID):
+        super().__delitem__(_object_key(key))
+
+    def pop(self, key: str | UUID, *default):
+        return super().pop(_object_key(key), *default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: str | UUID, default: Any = None):
+        key = _object_key(key)
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, dict) and not isinstance(other, ObjectIdDict):
+            # Dictionaries keyed by string IDs are equal to the same dictionaries keyed by UUIDs
+            other = ObjectIdDict(other)
+        return super().__eq__(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __or__(self, other):
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def copy(self):
+        return self.__class__(self)
+
+
+class IndexedDict(ObjectIdDict, abc.ABC):
+    """Dictionary of Colander objects keyed by their IDs, maintaining secondary indexes over them.
+
+    Subclasses maintain their indexes in :py:meth:`_index`, :py:meth:`_unindex` and :py:meth:`_reset_index`,
+    which are called as objects are added to or removed from the dictionary. Each indexed object keeps weak
+    references to the indexes holding it; when one of its ``indexed_fields`` changes, the object calls
+    :py:meth:`notify` so that these indexes, and only these, are updated. The indexes are only built on
+    the first lookup, calling :py:meth:`_ensure_index`, so loading a feed whose indexes are never used does
+    not pay for them.
+    """
+
+    indexed_fields: frozenset = frozenset()
+    """The object fields the index depends on."""
+
+    def __init__(self, *args, **kwargs):
+        self._reset_index()
+        self._indexed = False
+        # Objects shared between threads may notify the index concurrently
+        self._lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _ensure_index(self):
+        """Builds the indexes of the objects of the dictionary, if they are not built yet."""
+        if self._indexed:
+            return
+        with self._lock:
+            if not self._indexed:
+                for key, value in super().items():
+                    self._index(key, value)
+                    self._own(value)
+                self._indexed = True
+
+    @abc.abstractmethod
+    def _reset_index(self):
+        """Creates empty indexes."""
+
+    @abc.abstractmethod
+    def _index(self, key: UUID, value: Any):
+        """Adds the entries of an object to the indexes."""
+
+    @abc.abstractmethod
+    def _unindex(self, key: UUID):
+        """Removes the entries of an object from the indexes."""
+
+    def _own(self, value: Any):
+        """Records this index among the indexes holding an object, forgetting the released ones."""
+        owners = value.__dict__.setdefault(_INDEXES, {})
+        for owner_id, owner in tuple(owners.items()):
+            if owner() is None:
+                owners.pop(owner_id, None)
+        owners[id(self)] = ref(self)
+
+    def _disown(self, value: Any):
+        """Removes this index from the indexes holding an object."""
+        if owners := value.__dict__.get(_INDEXES):
+            owners.pop(id(self), None)
+
+    @staticmethod
+    def notify(value: Any):
+        """Updates the index entries of an object in the indexes holding it after an indexed field changed.
+
+        Args:
+            value: The object whose indexed fields changed.
+        """
+        if owners := value.__dict__.get(_INDEXES):
+            for owner in tuple(owners.values()):
+                if (index := owner()) is not None:
+                    index.reindex(value)
+
+    def reindex(self, value: Any):
+        """Updates the index entries of an object after one of its indexed fields changed.
+
+        Args:
+            value: The object to reindex, ignored if it is not in this dictionary.
+        """
+        key = value.id
+        with self._lock:
+            if self._indexed and super().get(key) is value:
+                self._unindex(key)
+                self._index(key, value)
+
+    def __setitem__(self, key: str | UUID, value: Any):
+        key = _object_key(key)
+        if not self._indexed:
+            super().__setitem__(key, value)
+            return
+        previous = super().get(key)
+        self._unindex(key)
+        if previous is not None and previous is not value:
+            self._disown(previous)
+        super().__setitem__(key, value)
+        self._index(key, value)
+        self._own(value)
+
+    def __delitem__(self, key: str | UUID):
+        key = _object_key(key)
+        value = super().pop(key)
+        if self._indexed:
+            self._unindex(key)
+            self._disown(value)
+
+    def pop(self, key: str | UUID, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        key = _object_key(key)
+        value = super().pop(key)
+        if self._indexed:
+            self._unindex(key)
+            self._disown(value)
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        if self._indexed:
+            self._unindex(key)
+            self._disown(value)
+        return key, value
+
+    def clear(self):
+        if self._indexed:
+            for value in super().values():
+                self._disown(value)
+        super().clear()
+        self._reset_index()
+
+
+class RelationIndex(IndexedDict):
+    """Dictionary of relations keyed by their IDs, maintaining a from/to adjacency index.
+
+    The adjacency index maps each entity ID to the relations it is the source (obj_from) or the
+    target (obj_to) of, optionally by relation name. It is updated as relations are added to or
+    removed from the dictionary, and when the name or an end of an indexed relation changes, so
+    relation lookups for an entity take time proportional to the number of relations of this entity.
+
+    Example:
+        >>> obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        >>> obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        >>> relation = EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2)
+        >>> relations = RelationIndex({relation.id: relation})
+        >>> list(relations.outgoing(obs1.id).values()) == [relation]
+        True
+        >>> len(relations.incoming(obs2.id, name="resolves"))
+        0
+    """
+
+    indexed_fields = frozenset(["name", "obj_from", "obj_to"])
+    """The relation fields the index depends on."""
+
+    def _reset_index(self):
+        self._endpoints: Dict[UUID, Tuple[Optional[UUID], Optional[UUID], str]] = {}
+        self._outgoing: Dict[Any, Dict[UUID, EntityRelation]] = {}
+        self._incoming: Dict[Any, Dict[UUID, EntityRelation]] = {}
+
+    def _index(self, key: UUID, relation: EntityRelation):
+        obj_from = get_id(relation.obj_from)
+        obj_to = get_id(relation.obj_to)
+        self._endpoints[key] = (obj_from, obj_to, relation.name)
+        for adjacency, entity_id in ((self._outgoing, obj_from), (self._incoming, obj_to)):
+            adjacency.setdefault(entity_id, {})[key] = relation
+            adjacency.setdefault((entity_id, relation.name), {})[key] = relation
+
+    def _unindex(self, key: UUID):
+        if (endpoints := self._endpoints.pop(key, None)) is None:
+            return
+        obj_from, obj_to, name = endpoints
+        for adjacency, entity_id in ((self._outgoing, obj_from), (self._incoming, obj_to)):
+            for bucket_key in (entity_id, (entity_id, name)):
+                bucket = adjacency.get(bucket_key)
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del adjacency[bucket_key]
+
+    def outgoing(self, entity_id: str | UUID4, name: Optional[str] = None) -> ObjectIdDict:
+        """Returns the relations whose source (obj_from) is the given entity.
+
+        Args:
+            entity_id: The ID of the source entity.
+            name: If set, only the relations with this name are returned.
+
+        Returns:
+            A dictionary mapping relation IDs to relations.
+        """
+        self._ensure_index()
+        entity_id = get_id(entity_id)
+        return ObjectIdDict(self._outgoing.get(entity_id if name is None else (entity_id, name), {}))
+
+    def incoming(self, entity_id: str | UUID4, name: Optional[str] = None) -> ObjectIdDict:
+        """Returns the relations whose target (obj_to) is the given entity.
+
+        Args:
+            entity_id: The ID of the target entity.
+            name: If set, only the relations with this name are returned.
+
+        Returns:
+            A dictionary mapping relation IDs to relations.
+        """
+        self._ensure_index()
+        entity_id = get_id(entity_id)
+        return ObjectIdDict(self._incoming.get(entity_id if name is None else (entity_id, name), {}))
+
+
+class EntityIndex(IndexedDict):
+    """Dictionary of entities keyed by their IDs, maintaining an index of their similarity keys.
+
+    The similarity key of an entity is made of its class, the short name of its type and its name,
+    plus the SHA256 of Artifacts, the content of DataFragments and DetectionRules, and the
+    first_seen and last_seen timestamps of Events. The index is updated as entities are added to or
+    removed from the dictionary, and when a field of an indexed entity used in its key changes, so
+    similar entities are found in constant time. As types are not hashable, the full types of the
+    entities sharing a key are compared on lookup.
+
+    Example:
+        >>> obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        >>> obs2 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        >>> entities = EntityIndex({obs1.id: obs1})
+        >>> list(entities.similar_to(obs2).values()) == [obs1]
+        True
+        >>> obs1.name = "8.8.8.8"
+        >>> len(entities.similar_to(obs2))
+        0
+    """
+
+    indexed_fields = frozenset(["name", "type", "sha256", "content", "first_seen", "last_seen"])
+    """The entity fields the index depends on."""
+
+    @staticmethod
+    def similarity_key(entity: EntityTypes) -> Optional[Tuple]:
+        """Computes the key under which entities are considered similar.
+
+        Args:
+            entity: The entity to compute the key of.
+
+        Returns:
+            The similarity key, or None for Artifacts without SHA256 which are never similar to anything.
+        """
+        entity_type = getattr(entity, "type", None)
+        key: Tuple = (type(entity), getattr(entity_type, "short_name", entity_type), entity.name)
+        if isinstance(entity, Artifact):
+            if entity.sha256 is None:
+                return None
+            key += (entity.sha256,)
+        elif isinstance(entity, (DataFragment, DetectionRule)):
+            key += (entity.content,)
+        elif isinstance(entity, Event):
+            key += (entity.first_seen, entity.last_seen)
+        return key
+
+    def _reset_index(self):
+        self._keys: Dict[UUID, Tuple] = {}
+        self._similar: Dict[Tuple, Dict[UUID, EntityTypes]] = {}
+
+    def _index(self, key: UUID, entity: EntityTypes):
+        if (similarity_key := self.similarity_key(entity)) is None:
+            return
+        self._keys[key] = similarity_key
+        self._similar.setdefault(similarity_key, {})[key] = entity
+
+    def _unindex(self, key: UUID):
+        if (similarity_key := self._keys.pop(key, None)) is None:
+            return
+        bucket = self._similar[similarity_key]
+        bucket.pop(key, None)
+        if not bucket:
+            del self._similar[similarity_key]
+
+    def similar_to(self, entity: EntityTypes) -> ObjectIdDict:
+        """Returns the entities having the same similarity key as the given entity.
+
+        Args:
+            entity: The entity to find similar entities for.
+
+        Returns:
+            A dictionary mapping entity IDs to entities, including the given entity if it is indexed.
+        """
+        if (similarity_key := self.similarity_key(entity)) is None:
+            return ObjectIdDict()
+        self._ensure_index()
+        # Types are not hashable, the key only holds their short name
+        entity_type = getattr(entity, "type", None)
+        return ObjectIdDict(
+            {
+                entity_id: similar
+                for entity_id, similar in self._similar.get(similarity_key, {}).items()
+                if getattr(similar, "type", None) == entity_type
+            }
+        )
+
+
+class ColanderRepository(ContextBound):
+    """Repository for managing and storing Case, Entity, and EntityRelation objects.
+
+    This class provides storage and reference management for model instances, supporting insertion,
+    lookup, and reference resolution/unlinking. A repository is owned by a feed or by a conversion;
+    the repository bound to the current context, returned by :py:meth:`current`, is used when none
+    is provided. Activate a repository with :py:meth:`activate` to isolate concurrent work: each thread has
+    its own default current repository, but asyncio tasks share the one of the context they are created from.
 
-    This class provides centralized storage and reference management for all model instances,
-    supporting insertion, lookup, and reference resolution/unlinking.
+    By default, the repository is unbounded and keeps strong references to the objects it stores. The
+    repository created on first access by :py:meth:`current` only keeps weak references instead, so the
+    objects built without an explicit repository are released once nothing else uses them.
+
+    Warning:
+        A reference to an object only known by its ID is not resolved by the default repository once the
+        object has been released: ``EntityRelation(obj_from=Observable(...).id, ...)`` keeps a bare UUID
+        after ``resolve_references()`` if nothing else holds the observable. Keep the objects in a feed,
+        which owns its repository, or build them inside ``with ColanderRepository().activate():``.
+
+    Example:
+        >>> repository = ColanderRepository()
+        >>> obs = Observable.model_validate(
+        ...     {"name": "1.1.1.1", "type": ObservableTypes.IPV4.value},
+        ...     context={"repository": repository}
+        ... )
+        >>> (repository >> obs.id) is obs
+        True
     """
 
-    cases: Dict[str, Case]
-    entities: Dict[str, EntityTypes]
-    relations: Dict[str, EntityRelation]
+    cases: Dict[UUID, Case]
+    entities: Dict[UUID, EntityTypes]
+    relations: Dict[UUID, EntityRelation]
 
-    def __init__(self):
-        """Initializes the repository with empty dictionaries for cases, entities, and relations."""
-        self.cases = LRUDict()
-        self.entities = LRUDict()
-        self.relations = LRUDict()
+    def __init__(self, weak: bool = False, max_size: Optional[int] = None):
+        """Initializes the repository with empty dictionaries for cases, entities, and relations.
+
+        Args:
+            weak: If True, only weak references are kept so objects are released once nothing else uses them.
+            max_size: If set, least recently used objects are evicted once a collection holds more than
+                max_size objects. Cannot be combined with weak references.
+        """
+        assert not (weak and max_size), "weak and max_size are mutually exclusive"
+        self.weak = weak
+        self.max_size = max_size
+        self.cases = self._new_storage()
+        self.entities = self._new_storage()
+        self.relations = self._new_storage()
+
+    @classmethod
+    def _new_default(cls) -> Self:
+        return cls(weak=True)
+
+    def _new_storage(self) -> Dict[UUID, Any]:
+        # Objects are stored under their UUIDs, lookups parse string IDs once in __rshift__
+        if self.weak:
+            return WeakValueDictionary()  # type: ignore[return-value]
+        if self.max_size:
+            return LRUDict(cache_len=self.max_size)
+        return ObjectIdDict()
 
     def clear(self):
         self.cases.clear()
@@ -909,11 +1648,11 @@ class ColanderRepository(object, metaclass=Singleton):
             other: The object (Entity, EntityRelation, or Case) to insert.
         """
         if isinstance(other, Entity):
-            self.entities[str(other.id)] = other
+            self.entities[other.id] = other
         elif isinstance(other, EntityRelation):
-            self.relations[str(other.id)] = other
+            self.relations[other.id] = other
         elif isinstance(other, Case):
-            self.cases[str(other.id)] = other
+            self.cases[other.id] = other
 
     def __rshift__(self, other: str | UUID4) -> EntityTypes | EntityRelation | Case | str | UUID4:
         """Retrieves an object by its identifier from entities, relations, or cases.
@@ -924,13 +1663,13 @@ class ColanderRepository(object, metaclass=Singleton):
         Returns:
             The found object or the identifier if not found.
         """
-        _other = str(other)
-        if _other in self.entities:
-            return self.entities[_other]
-        elif _other in self.relations:
-            return self.relations[_other]
-        elif _other in self.cases:
-            return self.cases[_other]
+        _other = other if type(other) is UUID else _object_key(other)
+        if (obj := self.entities.get(_other)) is not None:
+            return obj
+        if (obj := self.relations.get(_other)) is not None:
+            return obj
+        if (obj := self.cases.get(_other)) is not None:
+            return obj
         return other
 
     def unlink_references(self):
@@ -945,11 +1684,111 @@ class ColanderRepository(object, metaclass=Singleton):
     def resolve_references(self):
         """Resolves all UUID references in entities, relations, and cases to their corresponding objects."""
         for _, entity in self.entities.items():
-            entity.resolve_references()
+            entity.resolve_references(repository=self)
         for _, relation in self.relations.items():
-            relation.resolve_references()
+            relation.resolve_references(repository=self)
         for _, case in self.cases.items():
-            case.resolve_references()
+            case.resolve_references(repository=self)
+
+
+class DuplicateRelationStrategy(str, enum.Enum):
+    """Defines which relation is kept when removing duplicate relations from a feed."""
+
+    OLDEST = "oldest"
+    NEWEST = "newest"
+    MERGE = "merge"
+
+
+class AudiencePolicy(BaseModel):
+    """Defines what an audience of a feed is allowed to receive.
+
+    Used by :py:meth:`ColanderFeed.filter_many` to build the feeds of several audiences at once.
+
+    Example:
+        >>> policy = AudiencePolicy(name="partners", maximum_tlp_level=TlpPapLevel.AMBER)
+        >>> policy.allows(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, tlp=TlpPapLevel.GREEN))
+        True
+        >>> policy.allows(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, tlp=TlpPapLevel.AMBER))
+        False
+    """
+
+    model_config: ConfigDict = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    name: str
+    """The name of the audience."""
+
+    maximum_tlp_level: TlpPapLevel
+    """Only objects with a TLP level strictly below this value are included."""
+
+    maximum_pap_level: Optional[TlpPapLevel] = None
+    """If set, only objects with a PAP level strictly below this value are included."""
+
+    exclude_entity_types: List[Any] = Field(default_factory=list)
+    """Entity classes (Observable, Threat...) excluded from the feed."""
+
+    include_relations: bool = True
+    """Whether relations between included entities are included."""
+
+    include_cases: bool = True
+    """Whether the cases of the included entities are included."""
+
+    def allows(self, obj: EntityTypes | Case) -> bool:
+        """Checks the TLP and PAP levels of an entity or a case against the thresholds of the policy.
+
+        Args:
+            obj: The entity or case to check.
+
+        Returns:
+            True if the object can be shared with the audience, False otherwise.
+        """
+        if obj.tlp.value >= self.maximum_tlp_level.value:
+            return False
+        if self.maximum_pap_level is not None and obj.pap.value >= self.maximum_pap_level.value:
+            return False
+        return type(obj) not in self.exclude_entity_types
+
+
+class FeedChangeset(BaseModel):
+    """The changes turning a feed into another one, as computed by :py:meth:`ColanderFeed.diff`.
+
+    Objects are matched by their IDs and compared by their fingerprints (see :py:meth:`ColanderType.fingerprint`).
+    The changeset is applied to a feed with :py:meth:`ColanderFeed.apply_changeset`.
+
+    Example:
+        >>> changeset = FeedChangeset()
+        >>> changeset.is_empty()
+        True
+    """
+
+    model_config: ConfigDict = ConfigDict(arbitrary_types_allowed=True)
+
+    added: Set[UUID4] = Field(default_factory=set)
+    """IDs of the entities, relations and cases only found in the new feed."""
+
+    removed: Set[UUID4] = Field(default_factory=set)
+    """IDs of the entities, relations and cases only found in the old feed."""
+
+    modified: Set[UUID4] = Field(default_factory=set)
+    """IDs of the entities, relations and cases found in both feeds with different contents."""
+
+    objects: Dict[UUID4, Any] = Field(default_factory=dict)
+    """The new version of the added and modified objects, keyed by their IDs."""
+
+    def is_empty(self) -> bool:
+        """Checks whether the changeset holds any change.
+
+        Returns:
+            True if no object was added, removed or modified, False otherwise.
+        """
+        return not (self.added or self.removed or self.modified)
+
+
+_FEED_COLLECTION_CLASSES: Dict[str, type[ObjectIdDict]] = {
+    "entities": EntityIndex,
+    "relations": RelationIndex,
+    "cases": ObjectIdDict,
+}
+"""The classes of the collections of a feed, by field name."""
 
 
 class ColanderFeed(ColanderType):
@@ -973,7 +1812,9 @@ class ColanderFeed(ColanderType):
         ... }
         >>> feed = ColanderFeed.load(feed_data)
         >>> print(list(feed.entities.keys()))
-        ['204d4590-a3ee-4f24-8eaf-350ec2fa751b']
+        [UUID('204d4590-a3ee-4f24-8eaf-350ec2fa751b')]
+        >>> feed.entities["204d4590-a3ee-4f24-8eaf-350ec2fa751b"].name
+        'Example Observable'
     """
 
     id: UUID4 = Field(frozen=True, default_factory=lambda: uuid4())
@@ -985,23 +1826,99 @@ class ColanderFeed(ColanderType):
     description: str = ""
     """Optional description of the feed."""
 
-    entities: Optional[Dict[str, EntityTypes]] = {}
-    """Dictionary of entity objects, keyed by their IDs."""
+    entities: Optional[Dict[UUID4, EntityTypes]] = {}
+    """Dictionary of entity objects, keyed by their IDs (UUIDs, string IDs are accepted too)."""
+
+    relations: Optional[Dict[UUID4, EntityRelation]] = {}
+    """Dictionary of entity relations, keyed by their IDs (UUIDs, string IDs are accepted too)."""
+
+    cases: Optional[Dict[UUID4, Case]] = {}
+    """Dictionary of case objects, keyed by their IDs (UUIDs, string IDs are accepted too)."""
+
+    _repository: Optional[ColanderRepository] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        """Adopts the repository provided by the validation context, if any, as the feed repository.
+
+        Args:
+            __context (Any): Additional context provided for post-initialization handling.
+        """
+        if isinstance(__context, dict) and isinstance(__context.get("repository"), ColanderRepository):
+            self._repository = __context["repository"]
+        self._get_relation_index()
+        self._get_entity_index()
+        if not isinstance(self.cases, ObjectIdDict):
+            self.cases = ObjectIdDict(self.cases or {})
+
+    def __setattr__(self, name: str, value: Any):
+        """Sets an attribute, wrapping the collections assigned to the feed so that they are keyed by UUIDs.
+
+        Args:
+            name: The name of the attribute.
+            value: The new value of the attribute.
+        """
+        collection_class = _FEED_COLLECTION_CLASSES.get(name)
+        if collection_class is not None and value is not None and not isinstance(value, collection_class):
+            value = collection_class(value)
+        super().__setattr__(name, value)
+
+    @field_serializer("entities", "relations", "cases", mode="wrap")
+    def _serialize_collection(self, collection: Optional[Dict[UUID, Any]], handler) -> Optional[Dict[str, Any]]:
+        """Serializes a collection with string keys, as found in JSON feeds."""
+        serialized = handler(collection)
+        if serialized is None:
+            return None
+        return {str(key): value for key, value in serialized.items()}
+
+    def _get_entity_index(self) -> EntityIndex:
+        """Returns the entities of the feed as an :py:class:`EntityIndex`, wrapping them if needed.
+
+        Returns:
+            The indexed entities of the feed.
+        """
+        if not isinstance(self.entities, EntityIndex):
+            self.entities = EntityIndex(self.entities or {})
+        return self.entities
+
+    def _get_relation_index(self) -> RelationIndex:
+        """Returns the relations of the feed as a :py:class:`RelationIndex`, wrapping them if needed.
+
+        Returns:
+            The indexed relations of the feed.
+        """
+        if not isinstance(self.relations, RelationIndex):
+            self.relations = RelationIndex(self.relations or {})
+        return self.relations
+
+    @property
+    def repository(self) -> ColanderRepository:
+        """The repository owned by this feed, backed by the feed's own collections.
 
-    relations: Optional[Dict[str, EntityRelation]] = {}
-    """Dictionary of entity relations, keyed by their IDs."""
+        References are resolved against this repository first so that they do not depend on
+        the content of the current repository.
 
-    cases: Optional[Dict[str, Case]] = {}
-    """Dictionary of case objects, keyed by their IDs."""
+        Returns:
+            The feed repository.
+        """
+        if self._repository is None:
+            self._repository = ColanderRepository()
+        repository = self._repository
+        repository.entities = self.entities or {}  # type: ignore[assignment]
+        repository.relations = self.relations or {}  # type: ignore[assignment]
+        repository.cases = self.cases or {}  # type: ignore[assignment]
+        return repository
 
     @staticmethod
-    def load(raw_object: dict, reset_ids=False, resolve_types=True) -> "ColanderFeed":
+    def load(raw_object: dict, reset_ids=False, resolve_types=True, trusted=False) -> "ColanderFeed":
         """Loads an EntityFeed from a raw object, which can be either a dictionary or a list.
 
         Args:
             raw_object: The raw data representing the entities and relations to be loaded into the EntityFeed.
             reset_ids: If true, resets the ids of the entities and relations to their values.
             resolve_types: If True, resolves entity types based on the types enum. Mandatory to find similar entities.
+            trusted: If True, the raw data is known to be valid (e.g. exported by this library and checksummed):
+                objects are constructed without validation, only converting values to the field types
+                (IDs, dates, levels, types). Call :py:meth:`validate` to validate the feed afterward.
 
         Returns:
             The EntityFeed loaded from a raw object.
@@ -1009,25 +1926,8 @@ class ColanderFeed(ColanderType):
         Raises:
             ValueError: If there are inconsistencies in entity IDs or relations.
         """
-        ColanderRepository().clear()
-
-        if "entities" in raw_object:
-            for entity_id, entity in raw_object["entities"].items():
-                if entity_id != entity.get("id"):
-                    raise ValueError(f"Relation {entity_id} does not match with the ID of {entity}")
-                entity["colander_internal_type"] = entity["super_type"]["short_name"].lower()
-        if "relations" in raw_object:
-            for relation_id, relation in raw_object["relations"].items():
-                if relation_id != relation.get("id"):
-                    raise ValueError(f"Relation {relation_id} does not match with the ID of {relation}")
-                if (
-                    "obj_from" not in relation
-                    and "obj_to" not in relation
-                    and "obj_from_id" in relation
-                    and "obj_to_id" in relation
-                ):
-                    relation["obj_from"] = relation["obj_from_id"]
-                    relation["obj_to"] = relation["obj_to_id"]
+        # Objects are registered into a repository owned by the feed, not into the current one
+        repository = ColanderRepository()
 
         if reset_ids:
             # feed_objects = raw_object
@@ -1053,34 +1953,135 @@ class ColanderFeed(ColanderType):
             raw_object["entities"] = entities
             raw_object["relations"] = relations
 
-        entity_feed = ColanderFeed.model_validate(raw_object)
+        if trusted:
+            entity_feed = _construct_trusted_feed(raw_object, repository, resolve_types)
+        else:
+            context = {"repository": repository, "resolve_types": resolve_types}
+            entity_feed = ColanderFeed.model_validate(raw_object, context=context)
+            entity_feed._check_ids()
+            if resolve_types:
+                entity_feed.resolve_types()
+        entity_feed.resolve_references()
+        return entity_feed
+
+    @staticmethod
+    def load_json(data: bytes | str | os.PathLike, resolve_types=True) -> "ColanderFeed":
+        """Loads a feed from JSON, validated directly by pydantic-core without building intermediate dictionaries.
+
+        The entity classes are selected by the entity discriminator and the legacy relation fields
+        ('obj_from_id' and 'obj_to_id') are read through validation aliases, so the JSON document
+        is not pre-processed.
+
+        Args:
+            data: The JSON document, or the path of the file holding it.
+            resolve_types: If True, resolves entity types based on the types enum. Mandatory to find similar entities.
+
+        Returns:
+            The loaded feed.
+
+        Raises:
+            ValueError: If there are inconsistencies in object IDs.
+
+        Example:
+            >>> feed = ColanderFeed.load_json(b'''{"entities": {"bcbb2c31-ff61-465a-a770-85c154733567": {
+            ...     "id": "bcbb2c31-ff61-465a-a770-85c154733567", "name": "1.1.1.1",
+            ...     "super_type": {"short_name": "OBSERVABLE"}, "type": {"short_name": "IPV4", "name": "IPv4"}
+            ... }}}''')
+            >>> type(feed.entities["bcbb2c31-ff61-465a-a770-85c154733567"]).__name__
+            'Observable'
+        """
+        if not isinstance(data, (bytes, bytearray)):
+            data = Path(data).read_bytes()
+        # Objects are registered into a repository owned by the feed, not into the current one
+        repository = ColanderRepository()
+        context = {"repository": repository, "resolve_types": resolve_types}
+        entity_feed = ColanderFeed.model_validate_json(data, context=context)
+        entity_feed._check_ids()
         if resolve_types:
             entity_feed.resolve_types()
         entity_feed.resolve_references()
         return entity_feed
 
+    def _check_ids(self):
+        """Checks that the objects of the feed are keyed by their IDs.
+
+        Raises:
+            ValueError: If an object is not keyed by its ID.
+        """
+        for collection in (self.entities, self.relations, self.cases):
+            for object_id, obj in (collection or {}).items():
+                if object_id != obj.id:
+                    raise ValueError(f"{object_id} does not match with the ID of {obj}")
+
+    def validate(self, sample: Optional[int] = None) -> Dict[str, ValidationError]:
+        """Fully validates the entities, relations and cases of the feed, e.g. after a trusted load.
+
+        Each object is dumped and validated again by its model class, with references replaced by
+        their IDs. The feed is not modified and nothing is registered in any repository, so the
+        validation can run in a background thread.
+
+        Args:
+            sample: If set, only this number of objects, randomly selected, are validated.
+
+        Returns:
+            A dictionary mapping the IDs of the invalid objects to their validation errors, empty if
+            every validated object is valid.
+
+        Example:
+            >>> obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+            >>> feed = ColanderFeed(entities={obs.id: obs})
+            >>> feed.validate()
+            {}
+            >>> obs.name = ""
+            >>> list(feed.validate()) == [str(obs.id)]
+            True
+        """
+        objects: List[ColanderType] = [
+            *(self.entities or {}).values(),
+            *(self.relations or {}).values(),
+            *(self.cases or {}).values(),
+        ]
+        if sample is not None and sample < len(objects):
+            objects = random.sample(objects, sample)
+        errors: Dict[str, ValidationError] = {}
+        for obj in objects:
+            schema = ReferenceFieldsSchema.of(obj.__class__)
+            data = obj.model_dump(include=set(schema.plain_fields))
+            for field_name, is_list in schema.references:
+                value = getattr(obj, field_name)
+                data[field_name] = [get_id(v) for v in value] if is_list and value else value and get_id(value)
+            try:
+                obj.__class__.model_validate(data, context={"register": False})
+            except ValidationError as e:
+                errors[str(obj.id)] = e
+        return errors
+
     def resolve_types(self):
         for entity_id, entity in self.entities.items():
-            super_type = CommonEntitySuperTypes.by_short_name(entity.super_type.short_name)
-            entity.type = super_type.types_class.by_short_name(entity.type.short_name)
+            super_type = CommonEntitySuperTypes.by_model_class(entity.__class__)
+            entity.type = super_type.type_by_short_name(entity.type.short_name)
 
-    def resolve_references(self, strict=False):
+    def resolve_references(self, strict=False, repository: Optional[ColanderRepository] = None):
         """Resolves references within entities, relations, and cases.
 
         Iterates over each entity, relation, and case within the respective collections, calling their
         `resolve_references` method to update them with any referenced data. This helps in synchronizing
         internal state with external dependencies or updates.
 
+        References are looked up in the feed repository first, then in the current repository.
+
         Args:
             strict: If True, raises a ValueError when a UUID reference cannot be resolved.
                    If False, unresolved references remain as UUIDs.
+            repository: The repository to search instead of the feed repository. Defaults to None.
         """
+        repository = repository or self.repository
         for _, entity in self.entities.items():
-            entity.resolve_references(strict=strict)
+            entity.resolve_references(strict=strict, repository=repository)
         for _, relation in self.relations.items():
-            relation.resolve_references(strict=strict)
+            relation.resolve_references(strict=strict, repository=repository)
         for _, case in self.cases.items():
-            case.resolve_references(strict=strict)
+            case.resolve_references(strict=strict, repository=repository)
 
     def unlink_references(self) -> None:
         """Unlinks references from all entities, relations, and cases within the current context.
@@ -1118,14 +2119,14 @@ class ColanderFeed(ColanderType):
         Example:
             >>> feed = ColanderFeed()
             >>> obs = Observable(name="test", type=ObservableTypes.IPV4.value)
-            >>> feed.entities[str(obs.id)] = obs
+            >>> feed.entities[obs.id] = obs
             >>> feed.contains(obs)
             True
             >>> feed.contains("nonexistent-id")
             False
         """
-        object_id = str(get_id(obj))
-        if not object_id:
+        object_id = get_id(obj)
+        if object_id is None:
             return False
 
         if object_id in self.entities:
@@ -1145,14 +2146,14 @@ class ColanderFeed(ColanderType):
             obj: The object to add. Can be a Case, EntityTypes, or EntityRelation.
 
         This method inserts the object into the appropriate dictionary (entities, relations, or cases)
-        based on its type, using its stringified ID as the key. If the object already exists, it is not overwritten.
+        based on its type, using its ID as the key. If the object already exists, it is not overwritten.
         """
         if isinstance(obj, Entity):
-            self.entities.setdefault(str(obj.id), obj)
+            self.entities.setdefault(obj.id, obj)
         if isinstance(obj, EntityRelation):
-            self.relations.setdefault(str(obj.id), obj)
+            self.relations.setdefault(obj.id, obj)
         if isinstance(obj, Case):
-            self.cases.setdefault(str(obj.id), obj)
+            self.cases.setdefault(obj.id, obj)
 
     def get(self, obj: Any) -> Optional[Union[Case, EntityTypes, EntityRelation]]:
         """Retrieve an object from the feed by its identifier.
@@ -1171,17 +2172,13 @@ class ColanderFeed(ColanderType):
         Returns:
             The found object if it exists in any of the collections (entities, relations, or cases), otherwise None.
         """
-        if not self.contains(obj):
+        object_id = get_id(obj)
+        if object_id is None:
             return None
 
-        object_id = str(get_id(obj))
-
-        if object_id in self.entities:
-            return self.entities.get(object_id)
-        if object_id in self.relations:
-            return self.relations.get(object_id)
-        if object_id in self.cases:
-            return self.cases.get(object_id)
+        for collection in (self.entities, self.relations, self.cases):
+            if (found := collection.get(object_id)) is not None:
+                return found
 
         return None
 
@@ -1201,76 +2198,122 @@ class ColanderFeed(ColanderType):
                 entities.append(entity)
         return entities
 
-    def remove_relation_duplicates(self):
+    def remove_relation_duplicates(
+        self, strategy: DuplicateRelationStrategy = DuplicateRelationStrategy.OLDEST
+    ) -> Dict[UUID, EntityRelation]:
         """
-        Remove duplicate EntityRelation objects from the repository.
+        Remove duplicate EntityRelation objects from the feed.
 
-        Iterates over all stored relations and identifies duplicates by comparing
-        the `name`, `obj_from`, and `obj_to` properties. If two distinct relation
-        instances are semantically identical, the latter discovered instance is
-        scheduled for removal.
-        """
-        duplicates = []
-        for relation_a in self.relations.values():
-            for relation_b in self.relations.values():
-                if (
-                    relation_a != relation_b
-                    and relation_a.name == relation_b.name
-                    and relation_a.obj_from == relation_b.obj_from
-                    and relation_a.obj_to == relation_b.obj_to
-                ):
-                    duplicates.append(relation_b)
-        for duplicate in duplicates:
-            self.relations.pop(str(duplicate.id))
+        Relations are grouped in a single pass by their `name` and the IDs of their `obj_from`
+        and `obj_to` ends. In each group of duplicates, one relation is kept according to the
+        strategy and the others are removed from the feed.
+
+        Args:
+            strategy: Which relation of each group is kept:
+
+                - ``OLDEST``: keep the relation created first
+                - ``NEWEST``: keep the relation created last
+                - ``MERGE``: keep the relation created first, merging into it the attributes of its
+                  duplicates (the most recently updated value wins) and their latest update time
+
+        Returns:
+            A dictionary mapping the IDs of the removed relations to the removed relations.
 
-    def get_incoming_relations(self, entity: EntityTypes) -> Dict[str, EntityRelation]:
+        Example:
+            >>> feed = ColanderFeed()
+            >>> obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+            >>> obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+            >>> for _ in range(3):
+            ...     feed.add(EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2))
+            >>> removed = feed.remove_relation_duplicates()
+            >>> len(removed), len(feed.relations)
+            (2, 1)
+        """
+        strategy = DuplicateRelationStrategy(strategy)
+        groups: Dict[Tuple[str, Optional[UUID], Optional[UUID]], List[EntityRelation]] = {}
+        for relation in self.relations.values():
+            key = (relation.name, get_id(relation.obj_from), get_id(relation.obj_to))
+            groups.setdefault(key, []).append(relation)
+
+        removed: Dict[UUID, EntityRelation] = ObjectIdDict()
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            # sorted() is stable, ties keep the insertion order
+            group = sorted(group, key=lambda r: r.created_at)
+            kept = group[-1] if strategy == DuplicateRelationStrategy.NEWEST else group[0]
+            if strategy == DuplicateRelationStrategy.MERGE:
+                attributes: Dict[str, str] = {}
+                for relation in sorted(group, key=lambda r: r.updated_at):
+                    attributes.update(relation.attributes or {})
+                if attributes:
+                    kept.attributes = attributes
+                kept.updated_at = max(relation.updated_at for relation in group)
+            for relation in group:
+                if relation is not kept:
+                    removed[relation.id] = self.relations.pop(relation.id)
+        return removed
+
+    def get_incoming_relations(self, entity: EntityTypes, name: Optional[str] = None) -> Dict[UUID, EntityRelation]:
         """Retrieve all relations where the specified entity is the target (obj_to).
 
         This method finds all entity relations in the feed where the given entity
         is the destination or target of the relationship. Only fully resolved
         relations are considered to ensure data consistency.
 
+        Relations are looked up in the adjacency index of the feed, so the cost is proportional
+        to the number of relations of the entity.
+
         Args:
             entity: The entity to find incoming relations for. Must be an instance of Entity.
+            name: If set, only the relations with this name are returned.
 
         Returns:
             A dictionary mapping relation IDs to EntityRelation objects where the entity is the target (obj_to).
         """
         assert isinstance(entity, Entity)
-        relations = {}
-        for relation_id, relation in self.relations.items():
-            if not relation.is_fully_resolved():
-                continue
-            if relation.obj_to == entity:
+        repository = self.repository
+        relations = ObjectIdDict()
+        for relation_id, relation in self._get_relation_index().incoming(entity.id, name).items():
+            if relation.is_fully_resolved(repository=repository):
                 relations[relation_id] = relation
         return relations
 
-    def get_outgoing_relations(self, entity: EntityTypes, exclude_immutables=True) -> Dict[str, EntityRelation]:
+    def get_outgoing_relations(
+        self, entity: EntityTypes, exclude_immutables=True, name: Optional[str] = None
+    ) -> Dict[UUID, EntityRelation | ImmutableRelation]:
         """Retrieve all relations where the specified entity is the source (obj_from).
 
         This method finds all entity relations in the feed where the given entity
         is the source or origin of the relationship. Only fully resolved
         relations are considered to ensure data consistency.
 
+        Relations are looked up in the adjacency index of the feed, so the cost is proportional
+        to the number of relations of the entity.
+
         Args:
             entity: The entity to find outgoing relations for. Must be an instance of Entity.
-            exclude_immutables: If True, exclude immutable relations.
+            exclude_immutables: If True, exclude immutable relations. Otherwise, they are returned as
+                :py:class:`ImmutableRelation` views.
+            name: If set, only the relations with this name are returned.
 
         Returns:
             A dictionary mapping relation IDs to EntityRelation objects where the entity is the source (obj_from).
         """
-        relations = {}
+        relations: Dict[UUID, EntityRelation | ImmutableRelation] = ObjectIdDict()
         if not exclude_immutables:
-            for _, entity in self.entities.items():
-                relations.update(entity.get_immutable_relations())
-        for relation_id, relation in self.relations.items():
-            if not relation.is_fully_resolved():
-                continue
-            if relation.obj_from == entity:
+            for relation in entity.iter_immutable_relations():
+                if name is None or relation.name == name:
+                    relations[relation.id] = relation
+        repository = self.repository
+        for relation_id, relation in self._get_relation_index().outgoing(entity.id, name).items():
+            if relation.is_fully_resolved(repository=repository):
                 relations[relation_id] = relation
         return relations
 
-    def get_relations(self, entity: EntityTypes, exclude_immutables=True) -> Dict[str, EntityRelation]:
+    def get_relations(
+        self, entity: EntityTypes, exclude_immutables=True
+    ) -> Dict[UUID, EntityRelation | ImmutableRelation]:
         """Retrieve all relations (both incoming and outgoing) for the specified entity.
 
         This method combines the results of get_incoming_relations() and
@@ -1287,13 +2330,13 @@ class ColanderFeed(ColanderType):
         """
         assert isinstance(entity, Entity)
 
-        relations = {}
+        relations = ObjectIdDict()
         relations.update(self.get_incoming_relations(entity))
         relations.update(self.get_outgoing_relations(entity, exclude_immutables=exclude_immutables))
 
         return relations
 
-    def get_entities_similar_to(self, entity: EntityTypes) -> Dict[str, EntityTypes]:
+    def get_entities_similar_to(self, entity: EntityTypes) -> Dict[UUID, EntityTypes]:
         """Find entities in the feed that are similar to the given entity.
 
         This method searches through all entities in the feed to find those that match
@@ -1321,28 +2364,9 @@ class ColanderFeed(ColanderType):
               for comparison to occur
             - The method performs exact matches on all criteria - no fuzzy matching
             - Entity type comparison uses the entity's type attribute for matching
+            - Entities are looked up in the similarity index of the feed, in constant time
         """
-        candidates: Dict[str, EntityTypes] = {}
-
-        for feed_entity_id, feed_entity in self.entities.items():
-            match = feed_entity.type == entity.type
-            if not match:
-                continue
-            match &= feed_entity.name == entity.name
-            if isinstance(entity, CommonEntitySuperTypes.ARTIFACT.value.model_class):
-                match &= entity.sha256 is not None
-                match &= feed_entity.sha256 == entity.sha256
-            if isinstance(entity, CommonEntitySuperTypes.DATA_FRAGMENT.value.model_class):
-                match &= feed_entity.content == entity.content
-            if isinstance(entity, CommonEntitySuperTypes.DETECTION_RULE.value.model_class):
-                match &= feed_entity.content == entity.content
-            if isinstance(entity, CommonEntitySuperTypes.EVENT.value.model_class):
-                match &= feed_entity.first_seen == entity.first_seen
-                match &= feed_entity.last_seen == entity.last_seen
-            if match:
-                candidates[feed_entity_id] = feed_entity
-
-        return candidates
+        return self._get_entity_index().similar_to(entity)
 
     def filter(
         self,
@@ -1355,7 +2379,8 @@ class ColanderFeed(ColanderType):
 
         This method creates a new ColanderFeed containing only entities whose TLP level is below
         the specified maximum threshold. It can optionally include relations between filtered
-        entities and cases associated with the filtered entities.
+        entities and cases associated with the filtered entities. Entities and relations are
+        each visited once.
 
         Args:
             maximum_tlp_level: The maximum TLP level threshold. Only entities
@@ -1371,28 +2396,166 @@ class ColanderFeed(ColanderType):
         """
         assert isinstance(maximum_tlp_level, TlpPapLevel)
 
-        excluded_types = exclude_entity_types or []
+        policy = AudiencePolicy(
+            name="",
+            maximum_tlp_level=maximum_tlp_level,
+            exclude_entity_types=exclude_entity_types or [],
+            include_relations=include_relations,
+            include_cases=include_cases,
+        )
+        return self.filter_many([policy])[policy.name]
+
+    def filter_many(self, policies: List[AudiencePolicy]) -> Dict[str, "ColanderFeed"]:
+        """Build the filtered feeds of several audiences in a single traversal of the feed.
+
+        References are resolved once, then each entity and each relation is visited once and
+        checked against every policy. The filtered feeds share the entity, relation and case
+        objects of this feed, nothing is copied.
+
+        Args:
+            policies: The policies of the audiences, with distinct names.
+
+        Returns:
+            A dictionary mapping the policy names to the filtered feeds. The entities, relations and
+            cases included for an audience are the ones of its feed.
+
+        Example:
+            >>> feed = ColanderFeed()
+            >>> obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, tlp=TlpPapLevel.GREEN)
+            >>> obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value, tlp=TlpPapLevel.AMBER)
+            >>> feed.add(obs1)
+            >>> feed.add(obs2)
+            >>> feed.add(EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2))
+            >>> feeds = feed.filter_many([
+            ...     AudiencePolicy(name="community", maximum_tlp_level=TlpPapLevel.AMBER),
+            ...     AudiencePolicy(name="partners", maximum_tlp_level=TlpPapLevel.RED),
+            ... ])
+            >>> len(feeds["community"].entities), len(feeds["community"].relations)
+            (1, 0)
+            >>> len(feeds["partners"].entities), len(feeds["partners"].relations)
+            (2, 1)
+        """
+        assert len({policy.name for policy in policies}) == len(policies), "policy names must be distinct"
 
         self.resolve_references()
-        filtered = ColanderFeed(name=self.name, description=self.description)
+        filtered = {
+            policy.name: (policy, ColanderFeed(name=self.name, description=self.description)) for policy in policies
+        }
 
         for entity_id, entity in self.entities.items():
-            if entity.tlp.value < maximum_tlp_level.value and type(entity) not in excluded_types:
-                filtered.entities[entity_id] = entity
-
-        for entity_id, entity in filtered.entities.items():
-            # Only include relations of the entity
-            if include_relations:
-                for relation_id, relation in self.get_relations(entity).items():
-                    if filtered.contains(relation.obj_from) and filtered.contains(relation.obj_to):
-                        filtered.relations[relation_id] = relation
-            # Only include the case associated with the entity
-            if include_cases:
-                if (case := self.get(entity.case)) is not None and case.tlp.value < maximum_tlp_level.value:
-                    filtered.cases[str(case.id)] = case
-
-        filtered.resolve_references()
-        return filtered
+            case = None
+            for policy, feed in filtered.values():
+                if not policy.allows(entity):
+                    continue
+                feed.entities[entity_id] = entity
+                # Only include the case associated with the entity
+                if policy.include_cases and entity.case is not None:
+                    if case is None:
+                        case = self.get(entity.case)
+                    if case is not None and policy.allows(case):
+                        feed.cases[case.id] = case
+
+        # Only include relations between filtered entities
+        with_relations = [feed for policy, feed in filtered.values() if policy.include_relations]
+        if with_relations:
+            repository = self.repository
+            for relation_id, relation in self.relations.items():
+                obj_from = get_id(relation.obj_from)
+                obj_to = get_id(relation.obj_to)
+                resolved = None
+                for feed in with_relations:
+                    if obj_from not in feed.entities or obj_to not in feed.entities:
+                        continue
+                    if resolved is None:
+                        resolved = relation.is_fully_resolved(repository=repository)
+                    if resolved:
+                        feed.relations[relation_id] = relation
+
+        return {name: feed for name, (_, feed) in filtered.items()}
+
+    def diff(self, other: "ColanderFeed", ignore_updated_at: bool = False) -> FeedChangeset:
+        """Computes the changes turning this feed into another one.
+
+        Objects are matched by their IDs and compared by their memoized fingerprints, so the cost is
+        linear in the size of the feeds and comparing the same feeds again is cheap.
+
+        Args:
+            other: The new version of the feed.
+            ignore_updated_at: If True, objects only differing by their ``updated_at`` field are not modified.
+
+        Returns:
+            The changeset, to be applied to this feed with :py:meth:`apply_changeset`.
+
+        Example:
+            >>> old = ColanderFeed()
+            >>> old.add(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value))
+            >>> new = ColanderFeed.load(old.model_dump(mode="json"))
+            >>> obs = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+            >>> new.add(obs)
+            >>> changeset = old.diff(new)
+            >>> changeset.added == {obs.id}, changeset.removed, changeset.modified
+            (True, set(), set())
+            >>> old.apply_changeset(changeset)
+            >>> old.diff(new).is_empty()
+            True
+        """
+        changeset = FeedChangeset()
+        for collection_name in _FEED_COLLECTION_CLASSES:
+            old_objects = getattr(self, collection_name) or {}
+            new_objects = getattr(other, collection_name) or {}
+            for object_id, obj in new_objects.items():
+                previous = old_objects.get(object_id)
+                if previous is None:
+                    changeset.added.add(obj.id)
+                elif type(previous) is type(obj) and previous.fingerprint(ignore_updated_at) == obj.fingerprint(
+                    ignore_updated_at
+                ):
+                    continue
+                else:
+                    changeset.modified.add(obj.id)
+                changeset.objects[obj.id] = obj
+            for object_id, obj in old_objects.items():
+                if object_id not in new_objects:
+                    changeset.removed.add(obj.id)
+        return changeset
+
+    def apply_changeset(self, changeset: FeedChangeset):
+        """Applies the changes computed by :py:meth:`diff` to this feed.
+
+        Modified objects are updated in place, so the objects of the feed referencing them keep doing so.
+        Added objects are copied into the feed. References are then resolved against the feed repository.
+
+        Args:
+            changeset: The changes to apply.
+        """
+        repository = self.repository
+        for object_id in changeset.removed:
+            for collection in (self.entities, self.relations, self.cases):
+                collection.pop(object_id, None)
+            for storage in (repository.entities, repository.relations, repository.cases):
+                storage.pop(object_id, None)
+
+        for object_id, obj in changeset.objects.items():
+            values = _unlinked_values(obj)
+            current = self.get(object_id)
+            if current is not None and type(current) is type(obj):
+                for field_name, value in values.items():
+                    if obj.__class__.model_fields[field_name].frozen:
+                        continue
+                    previous = getattr(current, field_name)
+                    if ReferenceFieldsSchema.of(obj.__class__).is_reference(field_name):
+                        previous = [get_id(r) for r in previous] if isinstance(previous, list) else get_id(previous)
+                    if previous != value:
+                        setattr(current, field_name, value)
+                continue
+            if current is not None:
+                for collection in (self.entities, self.relations, self.cases):
+                    collection.pop(object_id, None)
+            copied = obj.model_copy(update=values)
+            repository << copied
+            self.add(copied)
+
+        self.resolve_references()
 
     def overwrite_case(self, case: Case):
         """
@@ -1404,7 +2567,7 @@ class ColanderFeed(ColanderType):
         Args:
             case: The Case object to assign to all entities and relations in the feed.
         """
-        self.cases[str(case.id)] = case
+        self.cases[case.id] = case
         for _, entity in self.entities.items():
             entity.case = case
         for _, relation in self.relations.items():
@@ -1444,13 +2607,14 @@ class ColanderFeed(ColanderType):
             - Clearing the original reference fields on entities
         """
         for _, entity in self.entities.items():
-            for _, immutable_relation in entity.get_immutable_relations().items():
-                self.relations[str(immutable_relation.id)] = immutable_relation
-                object_reference = getattr(entity, immutable_relation.name)
-                if isinstance(object_reference, list):
-                    setattr(entity, immutable_relation.name, [])
+            immutable_relations = list(entity.iter_immutable_relations())
+            for immutable_relation in immutable_relations:
+                self.relations[immutable_relation.id] = immutable_relation.to_relation()
+            for field_name in {immutable_relation.field_name for immutable_relation in immutable_relations}:
+                if isinstance(getattr(entity, field_name), list):
+                    setattr(entity, field_name, [])
                 else:
-                    setattr(entity, immutable_relation.name, None)
+                    setattr(entity, field_name, None)
 
     def rebuild_immutable_relations(self):
         """
@@ -1480,20 +2644,230 @@ class ColanderFeed(ColanderType):
                 if not hasattr(obj_from, relation.name):
                     continue
                 actual = getattr(obj_from, relation.name, None)
-                field_info = obj_from.__class__.model_fields[relation.name]
-                annotation_args = get_args(field_info.annotation) or []  # type: ignore[var-annotated]
+                annotation_args = ReferenceFieldsSchema.of(obj_from.__class__).annotation_args.get(relation.name, ())
                 obj_to_type = type(obj_to)
                 if List[obj_to_type] in annotation_args:
                     if obj_to not in actual:
                         actual.append(obj_to)
                         setattr(obj_from, relation.name, actual)
                     if obj_to in actual:
-                        self.relations.pop(str(relation.id))
+                        self.relations.pop(relation.id)
                 elif obj_to_type in annotation_args:
                     if actual is None:
                         setattr(obj_from, relation.name, obj_to)
                     if obj_to == getattr(obj_from, relation.name, None):
-                        self.relations.pop(str(relation.id))
+                        self.relations.pop(relation.id)
+
+
+def _intern_entity_type(type_class: type[CommonEntityType], raw_type: Dict[str, Any], resolve: bool = False) -> Any:
+    """Returns the member of the types enum described by a raw entity type.
+
+    The member is returned if it has the same short name and the same values for all the other fields
+    set in the raw type, fields not set take the value of the member. Otherwise, the raw type is returned
+    unchanged to be validated.
+
+    Args:
+        type_class: The class of the entity type (ObservableType...).
+        raw_type: The raw entity type.
+        resolve: If True, the member having the same short name is returned whatever the other fields.
+
+    Returns:
+        The shared member of the types enum, or the raw type.
+
+    Example:
+        >>> raw_type = {"short_name": "IPV4", "name": "IPv4"}
+        >>> _intern_entity_type(ObservableType, raw_type) is ObservableTypes.IPV4.value
+        True
+        >>> _intern_entity_type(ObservableType, {"short_name": "IPV4", "name": "IP"}) is ObservableTypes.IPV4.value
+        False
+        >>> _intern_entity_type(ObservableType, {"short_name": "IPV4", "name": "IP"}, resolve=True).name
+        'IPv4'
+    """
+    if (members := _ENTITY_TYPE_MEMBERS.get(type_class)) is None:
+        members = {}
+        for super_type in CommonEntitySuperTypes:
+            if super_type.value.type_class is type_class:
+                members = {member.value.short_name: member.value for member in super_type.value.types_class}
+        _ENTITY_TYPE_MEMBERS[type_class] = members
+    member = members.get(raw_type.get("short_name"))  # type: ignore[arg-type]
+    if member is None or resolve:
+        return member or raw_type
+    for field_name, value in raw_type.items():
+        if field_name in type_class.model_fields and getattr(member, field_name) != value:
+            return raw_type
+    return member
+
+
+_ENTITY_TYPE_MEMBERS: Dict[type, Dict[str, CommonEntityType]] = {}
+
+
+def _trusted_field_converters(
+    model_class: type[BaseModel], resolve_types: bool
+) -> Dict[str, Tuple[Tuple, Callable, Callable]]:
+    """Returns, for each field of a model class, the keys it is read from, the converter of its raw values
+    and the factory of its default value.
+
+    The converters build the values pydantic would produce for valid data, without checking them.
+    Immutable default values are shared instead of being deep-copied by ``model_construct``.
+
+    Args:
+        model_class: The model class.
+        resolve_types: If True, entity types are resolved based on the types enum.
+
+    Returns:
+        A dictionary mapping field names to (keys, converter, default factory) tuples.
+    """
+    cache_key = (model_class, resolve_types)
+    if (converters := _TRUSTED_CONVERTERS.get(cache_key)) is not None:
+        return converters
+
+    def to_uuid(value):
+        return value if isinstance(value, UUID) or value is None else UUID(str(value))
+
+    def to_datetime(value):
+        return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+    def to_level(value):
+        return TlpPapLevel.by_name(value) if isinstance(value, str) else value
+
+    def to_references(value):
+        return [to_uuid(v) for v in value] if value else value
+
+    def identity(value):
+        return value
+
+    schema = ReferenceFieldsSchema.of(model_class)
+    list_references = set(schema.list_references)
+    converters = {}
+    for field_name, field in model_class.model_fields.items():
+        keys: Tuple = (field_name,)
+        if isinstance(field.validation_alias, AliasChoices):
+            keys = tuple(choice for choice in field.validation_alias.choices if isinstance(choice, str))
+        annotation_args = get_args(field.annotation) or (field.annotation,)
+        converter: Callable = identity
+        if schema.is_reference(field_name):
+            converter = to_references if field_name in list_references else to_uuid
+        elif UUID in annotation_args:
+            converter = to_uuid
+        elif datetime in annotation_args:
+            converter = to_datetime
+        elif TlpPapLevel in annotation_args:
+            converter = to_level
+        elif isinstance(field.annotation, type) and issubclass(field.annotation, CommonEntityType):
+            type_class = field.annotation
+            types_class = next(
+                (m.value.types_class for m in CommonEntitySuperTypes if m.value.type_class is type_class), None
+            )
+            if resolve_types and types_class is not None:
+
+                def converter(value, types_class=types_class):
+                    return types_class.by_short_name(value["short_name"]) if isinstance(value, dict) else value
+
+            else:
+
+                def converter(value, type_class=type_class):
+                    if not isinstance(value, dict):
+                        return value
+                    if (member := _intern_entity_type(type_class, value)) is not value:
+                        return member
+                    return type_class.model_construct(
+                        **{k: v for k, v in value.items() if k in type_class.model_fields}
+                    )
+
+        if field.default_factory is not None:
+            default_factory = field.default_factory
+        elif isinstance(field.default, (list, dict, set)):
+
+            def default_factory(default=field.default):
+                return copy(default)
+
+        else:
+
+            def default_factory(default=field.default):
+                return default
+
+        converters[field_name] = (keys, converter, default_factory)
+    _TRUSTED_CONVERTERS[cache_key] = converters
+    return converters
+
+
+_TRUSTED_CONVERTERS: Dict[Tuple[type, bool], Dict[str, Tuple[Tuple, Callable, Callable]]] = {}
+
+
+def _unlinked_values(obj: ColanderType) -> Dict[str, Any]:
+    """Returns the field values of an object, with references replaced by IDs and containers copied.
+
+    Args:
+        obj: The entity, relation or case.
+
+    Returns:
+        The field values, which can be assigned to another object without sharing any reference nor container.
+    """
+    values = {}
+    schema = ReferenceFieldsSchema.of(obj.__class__)
+    for field_name in obj.__class__.model_fields:
+        value = getattr(obj, field_name)
+        if schema.is_reference(field_name):
+            value = [get_id(r) for r in value] if isinstance(value, list) else get_id(value)
+        elif isinstance(value, (dict, list)):
+            value = copy(value)
+        values[field_name] = value
+    return values
+
+
+def _construct_trusted(model_class: type[BaseModel], raw_object: Dict[str, Any], resolve_types: bool) -> Any:
+    """Constructs a model instance from trusted raw data, without validation.
+
+    Args:
+        model_class: The model class.
+        raw_object: The raw data, known to be valid.
+        resolve_types: If True, entity types are resolved based on the types enum.
+
+    Returns:
+        The model instance.
+    """
+    values = {}
+    for field_name, (keys, converter, default_factory) in _trusted_field_converters(model_class, resolve_types).items():
+        for key in keys:
+            if key in raw_object:
+                values[field_name] = converter(raw_object[key])
+                break
+        else:
+            values[field_name] = default_factory()
+    return model_class.model_construct(**values)
+
+
+def _construct_trusted_feed(
+    raw_object: Dict[str, Any], repository: ColanderRepository, resolve_types: bool
+) -> ColanderFeed:
+    """Constructs a feed and its objects from trusted raw data, without validation.
+
+    Args:
+        raw_object: The raw feed, known to be valid.
+        repository: The repository of the feed, in which its objects are registered.
+        resolve_types: If True, entity types are resolved based on the types enum.
+
+    Returns:
+        The feed, whose references are not resolved yet.
+    """
+    model_classes = {
+        member.value.model_class.model_fields["colander_internal_type"].default: member.value.model_class
+        for member in CommonEntitySuperTypes
+    }
+    collections = {"entities": {}, "relations": {}, "cases": {}}
+    # model_construct calls model_post_init without context, objects are registered in the current repository
+    with repository.activate():
+        for entity_id, raw_entity in (raw_object.get("entities") or {}).items():
+            model_class = model_classes[get_entity_discriminator(raw_entity)]
+            collections["entities"][entity_id] = _construct_trusted(model_class, raw_entity, resolve_types)
+        for relation_id, raw_relation in (raw_object.get("relations") or {}).items():
+            collections["relations"][relation_id] = _construct_trusted(EntityRelation, raw_relation, resolve_types)
+        for case_id, raw_case in (raw_object.get("cases") or {}).items():
+            collections["cases"][case_id] = _construct_trusted(Case, raw_case, resolve_types)
+        feed_fields = {k: v for k, v in raw_object.items() if k not in collections}
+        feed = _construct_trusted(ColanderFeed, {**feed_fields, **collections}, resolve_types)
+    feed._repository = repository
+    return feed
 
 
 class CommonEntitySuperType(BaseModel):
@@ -1528,10 +2902,25 @@ class CommonEntitySuperType(BaseModel):
     default_type: Any = Field(default=None, exclude=True)
     """The default entity type (GENERIC...)."""
 
+    _types_by_short_name: Optional[Dict[str, CommonEntityType]] = PrivateAttr(default=None)
+
     def type_by_short_name(self, short_name: str):
-        for t in self.types:
-            if hasattr(t, short_name.upper()):
-                return getattr(t, short_name.upper()).value
+        """Returns the entity type of this super type having the given short name.
+
+        Args:
+            short_name: The short name of the entity type, case-insensitive.
+
+        Returns:
+            The entity type, or the default type if there is none with this short name.
+
+        Example:
+            >>> CommonEntitySuperTypes.OBSERVABLE.value.type_by_short_name("ipv4").name
+            'IPv4'
+        """
+        if self._types_by_short_name is None:
+            self._types_by_short_name = {t.name: t.value for t in self.types or []}
+        if (entity_type := self._types_by_short_name.get(short_name.replace(" ", "_").upper())) is not None:
+            return entity_type
         return self.default_type.value
 
     def __str__(self):
@@ -1632,8 +3021,40 @@ class CommonEntitySuperTypes(enum.Enum):
 
     @classmethod
     def by_short_name(cls, short_name: str) -> Optional[CommonEntitySuperType]:
-        sn = short_name.replace(" ", "_").upper()
-        for member in cls:
-            if member.value.short_name == sn:
-                return member.value
-        return None
+        """Returns the super type having the given short name.
+
+        Args:
+            short_name: The short name of the super type, case-insensitive.
+
+        Returns:
+            The super type, or None if there is none with this short name.
+
+        Example:
+            >>> CommonEntitySuperTypes.by_short_name("observable").name
+            'Observable'
+        """
+        if not _SUPER_TYPES_BY_SHORT_NAME:
+            _SUPER_TYPES_BY_SHORT_NAME.update({member.value.short_name: member.value for member in cls})
+        return _SUPER_TYPES_BY_SHORT_NAME.get(short_name.replace(" ", "_").upper())
+
+    @classmethod
+    def by_model_class(cls, model_class: type) -> Optional[CommonEntitySuperType]:
+        """Returns the super type implemented by the given entity class.
+
+        Args:
+            model_class: The entity class (Observable...).
+
+        Returns:
+            The super type, or None if the class does not implement any.
+
+        Example:
+            >>> CommonEntitySuperTypes.by_model_class(Observable) is CommonEntitySuperTypes.OBSERVABLE.value
+            True
+        """
+        if not _SUPER_TYPES_BY_MODEL_CLASS:
+            _SUPER_TYPES_BY_MODEL_CLASS.update({member.value.model_class: member.value for member in cls})
+        return _SUPER_TYPES_BY_MODEL_CLASS.get(model_class)
+
+
+_SUPER_TYPES_BY_SHORT_NAME: Dict[str, CommonEntitySuperType] = {}
+_SUPER_TYPES_BY_MODEL_CLASS: Dict[type, CommonEntitySuperType] = {}
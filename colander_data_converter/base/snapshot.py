@@ -0,0 +1,657 @@
+import bz2
+import lzma
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone, UTC
+from typing import IO, Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple, get_origin
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter
+
+from colander_data_converter.base.common import ReferenceFieldsSchema, TlpPapLevel
+from colander_data_converter.base.models import (
+    Case,
+    ColanderFeed,
+    ColanderRepository,
+    CommonEntitySuperTypes,
+    EntityRelation,
+    get_id,
+)
+from colander_data_converter.base.streaming import FEED_COLLECTIONS
+from colander_data_converter.base.types.base import CommonEntityType
+
+__all__ = ["SNAPSHOT_VERSION", "SnapshotReader", "save_snapshot", "load_snapshot"]
+
+SNAPSHOT_MAGIC = b"CLDRSNAP"
+"""The first bytes of a snapshot file."""
+
+SNAPSHOT_VERSION = 1
+"""The version of the snapshot format written by :py:func:`save_snapshot`."""
+
+COMPRESSIONS = ("zlib", "bz2", "lzma")
+"""The algorithms the sections of a snapshot can be compressed with."""
+
+# Header: magic, version, number of sections. It is followed by the section directory.
+_HEADER = struct.Struct("<8sHH")
+# Section directory entry: name, compression, offset of the section in the file, length of the section.
+_SECTION = struct.Struct("<16sBQQ")
+_COUNT = struct.Struct("<I")
+_DATETIME = struct.Struct("<qi")
+_TYPE = struct.Struct("<III")
+_LAYOUT = struct.Struct("<II")
+_LAYOUT_FIELD = struct.Struct("<IB")
+
+_COMPRESSORS: Dict[str, Tuple[int, Callable[[bytes], bytes]]] = {
+    "zlib": (1, zlib.compress),
+    "bz2": (2, bz2.compress),
+    "lzma": (3, lzma.compress),
+}
+_DECOMPRESSORS: Dict[int, Callable[[bytes], bytes]] = {
+    0: bytes,
+    1: zlib.decompress,
+    2: bz2.decompress,
+    3: lzma.decompress,
+}
+
+# Values standing for None: index 0 of the tables, the nil UUID, the smallest integer, a count of 2**32 - 1
+_NIL = bytes(16)
+_NO_INTEGER = -(1 << 63)
+_NO_COUNT = 0xFFFFFFFF
+_NAIVE = -(1 << 31)
+_EPOCH = datetime(1970, 1, 1)
+
+# Kinds of fields, telling how their values are encoded
+_UUID = 1
+_REFERENCE = 2
+_STRING = 3
+_DATETIME_INDEX = 4
+_LEVEL = 5
+_TYPE_INDEX = 6
+_INTEGER = 7
+_JSON = 8
+_REFERENCES = 9
+_STRING_DICT = 10
+
+_FIXED_FORMATS = {
+    _UUID: "16s",
+    _REFERENCE: "16s",
+    _STRING: "I",
+    _DATETIME_INDEX: "I",
+    _LEVEL: "B",
+    _TYPE_INDEX: "I",
+    _INTEGER: "q",
+    _JSON: "I",
+}
+"""The struct formats of the fields encoded with a fixed size, the other fields have a count and a variable size."""
+
+_LEVELS: Tuple[Optional[TlpPapLevel], ...] = (None, *TlpPapLevel)
+_LEVEL_CODES = {level: code for code, level in enumerate(_LEVELS) if level is not None}
+
+_MODEL_CLASSES: Dict[str, type[BaseModel]] = {
+    model_class.__name__: model_class
+    for model_class in (
+        ColanderFeed,
+        Case,
+        EntityRelation,
+        *(member.value.model_class for member in CommonEntitySuperTypes),
+    )
+}
+
+
+def _field_kind(model_class: type[BaseModel], field_name: str) -> Optional[int]:
+    """Returns how the values of a field are encoded in snapshots.
+
+    Args:
+        model_class: The model class.
+        field_name: The name of the field.
+
+    Returns:
+        The kind of the field, or None if the field is not stored (constant or feed collection).
+    """
+    if model_class is ColanderFeed and field_name in FEED_COLLECTIONS:
+        return None
+    schema = ReferenceFieldsSchema.of(model_class)
+    if field_name in schema.single_references:
+        return _REFERENCE
+    if field_name in schema.list_references:
+        return _REFERENCES
+    annotation = model_class.model_fields[field_name].annotation
+    if get_origin(annotation) is Literal:
+        return None
+    annotation_args = schema.annotation_args[field_name] or (annotation,)
+    if UUID in annotation_args:
+        return _UUID
+    if datetime in annotation_args:
+        return _DATETIME_INDEX
+    if TlpPapLevel in annotation_args:
+        return _LEVEL
+    if isinstance(annotation, type) and issubclass(annotation, CommonEntityType):
+        return _TYPE_INDEX
+    if Dict[str, str] in annotation_args:
+        return _STRING_DICT
+    if str in annotation_args:
+        return _STRING
+    if int in annotation_args:
+        return _INTEGER
+    return _JSON
+
+
+class _Layout:
+    """The fields of a model class stored in a snapshot, with their kinds.
+
+    Each record starts with the code of its layout, followed by the fields of fixed size packed with a
+    single struct, then by the fields of variable size.
+    """
+
+    __slots__ = (
+        "code",
+        "model_class",
+        "fields",
+        "fixed_names",
+        "fixed",
+        "variable_fields",
+        "references",
+        "converters",
+        "dropped",
+        "constants",
+        "defaults",
+    )
+
+    def __init__(self, code: int, model_class: type[BaseModel], fields: Tuple[Tuple[str, int], ...]):
+        self.code = code
+        self.model_class = model_class
+        self.fields = fields
+        fixed_fields = [(name, kind) for name, kind in fields if kind in _FIXED_FORMATS]
+        self.fixed_names = tuple(name for name, _ in fixed_fields)
+        self.fixed = struct.Struct("<" + "".join(_FIXED_FORMATS[kind] for _, kind in fixed_fields))
+        self.variable_fields = tuple((name, kind) for name, kind in fields if kind not in _FIXED_FORMATS)
+        model_fields = model_class.model_fields
+        self.references = tuple(
+            (name, kind == _REFERENCES)
+            for name, kind in fields
+            if kind in (_REFERENCE, _REFERENCES) and name in model_fields
+        )
+        # Fields removed from the model since the snapshot was written, and fields added to it
+        self.dropped = tuple(name for name, _ in fields if name not in model_fields)
+        stored = {name for name, _ in fields}
+        missing = [(name, field) for name, field in model_fields.items() if name not in stored]
+        # The immutable default values of the fields not stored are shared by all the records
+        self.constants = {
+            name: field.default
+            for name, field in missing
+            if field.default_factory is None and isinstance(field.default, (str, int, type(None)))
+        }
+        self.defaults = tuple((name, field) for name, field in missing if name not in self.constants)
+        self.converters: Tuple[Optional[Callable], ...] = ()
+
+    @classmethod
+    def of(cls, code: int, model_class: type[BaseModel]) -> "_Layout":
+        """Returns the layout of the fields of a model class, as written by this version of the library."""
+        fields = tuple(
+            (name, kind) for name in model_class.model_fields if (kind := _field_kind(model_class, name)) is not None
+        )
+        return cls(code, model_class, fields)
+
+
+class _SnapshotWriter:
+    """Encodes objects into records, collecting the tables they refer to."""
+
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.datetimes: Dict[Tuple[int, int], int] = {}
+        self.types: Dict[int, Tuple[int, bytes]] = {}
+        self.layouts: Dict[type, _Layout] = {}
+        self._encoders: Dict[type, Tuple[Callable[[Any], Any], ...]] = {}
+        # The entity types are indexed by identity, they must be kept alive while writing
+        self._type_objects: List[Any] = []
+
+    def string_index(self, value: Any) -> int:
+        if value is None:
+            return 0
+        value = str(value)
+        if (index := self.strings.get(value)) is None:
+            index = self.strings[value] = len(self.strings) + 1
+        return index
+
+    def datetime_index(self, value: Optional[datetime]) -> int:
+        if value is None:
+            return 0
+        offset = value.utcoffset()
+        key = (
+            (value.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1),
+            _NAIVE if offset is None else int(offset.total_seconds()),
+        )
+        if (index := self.datetimes.get(key)) is None:
+            index = self.datetimes[key] = len(self.datetimes) + 1
+        return index
+
+    def type_index(self, value: Optional[CommonEntityType], model_class: type[BaseModel]) -> int:
+        if value is None:
+            return 0
+        if (found := self.types.get(id(value))) is not None:
+            return found[0]
+        super_type = CommonEntitySuperTypes.by_model_class(model_class)
+        # Members of the types enum are stored by their short names, other types in JSON
+        is_member = super_type.type_by_short_name(value.short_name) is value
+        entry = _TYPE.pack(
+            self.string_index(super_type.short_name),
+            self.string_index(value.short_name),
+            0 if is_member else self.string_index(value.model_dump_json()),
+        )
+        index = len(self.types) + 1
+        self.types[id(value)] = (index, entry)
+        self._type_objects.append(value)
+        return index
+
+    def _fixed_encoder(self, model_class: type[BaseModel], name: str, kind: int) -> Callable[[Any], Any]:
+        if kind in (_UUID, _REFERENCE):
+            return lambda value: _NIL if (object_id := get_id(value)) is None else object_id.bytes
+        if kind == _STRING:
+            return self.string_index
+        if kind == _DATETIME_INDEX:
+            return self.datetime_index
+        if kind == _LEVEL:
+            return lambda value: 0 if value is None else _LEVEL_CODES[value]
+        if kind == _TYPE_INDEX:
+            return lambda value: self.type_index(value, model_class)
+        if kind == _INTEGER:
+            return lambda value: _NO_INTEGER if value is None else value
+        adapter = TypeAdapter(model_class.model_fields[name].annotation)
+        return lambda value: 0 if value is None else self.string_index(adapter.dump_json(value).decode())
+
+    def layout(self, model_class: type[BaseModel]) -> _Layout:
+        if (layout := self.layouts.get(model_class)) is None:
+            layout = self.layouts[model_class] = _Layout.of(len(self.layouts), model_class)
+            self._encoders[model_class] = tuple(
+                self._fixed_encoder(model_class, name, kind) for name, kind in layout.fields if kind in _FIXED_FORMATS
+            )
+        return layout
+
+    def records(self, objects: Iterable[BaseModel]) -> bytes:
+        """Encodes objects into a section: the number of records followed by the records."""
+        buffer = bytearray(_COUNT.size)
+        count = 0
+        for obj in objects:
+            layout = self.layout(obj.__class__)
+            encoders = self._encoders[obj.__class__]
+            buffer.append(layout.code)
+            buffer += layout.fixed.pack(
+                *[encode(getattr(obj, name)) for name, encode in zip(layout.fixed_names, encoders)]
+            )
+            for name, kind in layout.variable_fields:
+                value = getattr(obj, name)
+                if value is None:
+                    buffer += _COUNT.pack(_NO_COUNT)
+                elif kind == _REFERENCES:
+                    buffer += _COUNT.pack(len(value))
+                    buffer += b"".join(_NIL if (ref := get_id(r)) is None else ref.bytes for r in value)
+                else:
+                    indexes = [self.string_index(item) for pair in value.items() for item in pair]
+                    buffer += struct.pack(f"<{len(indexes) + 1}I", len(value), *indexes)
+            count += 1
+        _COUNT.pack_into(buffer, 0, count)
+        return bytes(buffer)
+
+    def tables(self) -> List[Tuple[str, bytes]]:
+        """Encodes the tables referred to by the records, once all the objects are encoded."""
+        layouts = bytearray(_COUNT.pack(len(self.layouts)))
+        for layout in self.layouts.values():
+            layouts += _LAYOUT.pack(self.string_index(layout.model_class.__name__), len(layout.fields))
+            for name, kind in layout.fields:
+                layouts += _LAYOUT_FIELD.pack(self.string_index(name), kind)
+        datetimes = b"".join(_DATETIME.pack(*key) for key in self.datetimes)
+        types = b"".join(entry for _, entry in self.types.values())
+        # The string table is encoded last, the layouts adding the field names to it
+        strings = list(self.strings)
+        lengths = struct.pack(f"<{len(strings) + 1}I", len(strings), *map(len, strings))
+        return [
+            ("strings", lengths + "".join(strings).encode("utf-8", "surrogatepass")),
+            ("datetimes", _COUNT.pack(len(self.datetimes)) + datetimes),
+            ("types", _COUNT.pack(len(self.types)) + types),
+            ("layouts", bytes(layouts)),
+        ]
+
+
+def save_snapshot(feed: ColanderFeed, fp: IO[bytes], compression: Optional[str] = None):
+    """Saves a feed as a binary snapshot, much smaller and faster to load than its JSON export.
+
+    The snapshot is made of sections, listed with their offsets in a directory at the start of the file:
+    the tables of strings (names, type codes...), dates, entity types and field layouts shared by the
+    records, then one section per feed collection. IDs are stored as 16 bytes and references to other
+    objects by their IDs, so the references of the feed do not have to be unlinked first. Dates are
+    restored with fixed UTC offsets and URLs as strings.
+
+    Args:
+        feed: The feed to save.
+        fp: The file to write to, opened in binary mode.
+        compression: If set, the algorithm used to compress each section: "zlib", "bz2" or "lzma".
+
+    Raises:
+        ValueError: If the compression algorithm is not supported.
+
+    Example:
+        >>> import io
+        >>> from colander_data_converter.base.models import Observable
+        >>> from colander_data_converter.base.types.observable import ObservableTypes
+        >>> feed = ColanderFeed()
+        >>> feed.add(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value))
+        >>> fp = io.BytesIO()
+        >>> save_snapshot(feed, fp, compression="zlib")
+        >>> _ = fp.seek(0)
+        >>> load_snapshot(fp).model_dump() == feed.model_dump()
+        True
+    """
+    if compression is not None and compression not in _COMPRESSORS:
+        raise ValueError(f"Unsupported compression {compression}, expected one of {COMPRESSIONS}")
+    writer = _SnapshotWriter()
+    records = [("feed", writer.records([feed]))]
+    for collection in FEED_COLLECTIONS:
+        records.append((collection, writer.records((getattr(feed, collection) or {}).values())))
+    sections = writer.tables() + records
+
+    code = 0
+    if compression is not None:
+        code, compress = _COMPRESSORS[compression]
+        sections = [(name, compress(payload)) for name, payload in sections]
+    offset = _HEADER.size + len(sections) * _SECTION.size
+    directory = []
+    for name, payload in sections:
+        directory.append(_SECTION.pack(name.encode(), code, offset, len(payload)))
+        offset += len(payload)
+    fp.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections)))
+    fp.write(b"".join(directory))
+    for _, payload in sections:
+        fp.write(payload)
+
+
+def _to_uuid(value: bytes) -> Optional[UUID]:
+    return None if value == _NIL else UUID(bytes=value)
+
+
+def _to_integer(value: int) -> Optional[int]:
+    return None if value == _NO_INTEGER else value
+
+
+_object_setattr = object.__setattr__
+
+
+def _construct(model_class: type[BaseModel], values: Dict[str, Any]) -> Any:
+    """Creates a model instance from the values of all its fields, without validation.
+
+    Unlike ``model_construct``, no default value is computed and the object is not registered in
+    any repository, the feed loading the snapshot registers it in its own.
+    """
+    if model_class.__private_attributes__:
+        return model_class.model_construct(**values)
+    obj = model_class.__new__(model_class)
+    _object_setattr(obj, "__dict__", values)
+    _object_setattr(obj, "__pydantic_fields_set__", set(values))
+    _object_setattr(obj, "__pydantic_extra__", None)
+    _object_setattr(obj, "__pydantic_private__", None)
+    return obj
+
+
+def _resolve_references(decoded: List[Tuple[Any, _Layout]], objects: Dict[bytes, Any]):
+    """Replaces the IDs of the referenced objects, as read from the records, by the objects themselves.
+
+    Args:
+        decoded: The objects read from the records, with their layouts.
+        objects: The objects the references may point to, keyed by the bytes of their IDs. References to
+            other objects are replaced by their UUIDs.
+    """
+    for obj, layout in decoded:
+        if not layout.references:
+            continue
+        values = obj.__dict__
+        for name, is_list in layout.references:
+            ref = values[name]
+            if is_list:
+                if ref is not None:
+                    values[name] = [found if (found := objects.get(r)) is not None else UUID(bytes=r) for r in ref]
+            elif (found := objects.get(ref)) is not None:
+                values[name] = found
+            else:
+                values[name] = _to_uuid(ref)
+
+
+class SnapshotReader:
+    """Reads the sections of a snapshot written by :py:func:`save_snapshot` on demand.
+
+    Only the header and the section directory are read when the reader is created, then each section is
+    read on first use by seeking to its offset: loading the cases of a snapshot does not read its entities.
+
+    Example:
+        >>> import io
+        >>> feed = ColanderFeed()
+        >>> feed.add(Case(name="Investigation", description="Investigation"))
+        >>> fp = io.BytesIO()
+        >>> save_snapshot(feed, fp)
+        >>> reader = SnapshotReader(fp)
+        >>> [case.name for case in reader.load_collection("cases").values()]
+        ['Investigation']
+    """
+
+    def __init__(self, fp: IO[bytes]):
+        """Reads the header and the section directory of the snapshot.
+
+        Args:
+            fp: The snapshot file, opened in binary mode. It must be seekable.
+
+        Raises:
+            ValueError: If the file is not a snapshot or was written by a newer version of the format.
+        """
+        self._fp = fp
+        fp.seek(0)
+        header = fp.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError("Not a Colander snapshot")
+        _, self.version, count = _HEADER.unpack(header)
+        if self.version > SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {self.version}")
+        self.sections: Dict[str, Tuple[int, int, int]] = {}
+        """The sections of the snapshot, as (compression, offset, length) tuples keyed by name."""
+        for entry in _SECTION.iter_unpack(fp.read(count * _SECTION.size)):
+            name, compression, offset, length = entry
+            self.sections[name.rstrip(b"\0").decode()] = (compression, offset, length)
+        self._strings: Optional[List[Optional[str]]] = None
+        self._layouts: Optional[List[_Layout]] = None
+
+    def read_section(self, name: str) -> bytes:
+        """Reads and decompresses a section.
+
+        Args:
+            name: The name of the section.
+
+        Returns:
+            The content of the section.
+
+        Raises:
+            ValueError: If the snapshot has no such section or it uses an unsupported compression.
+        """
+        if name not in self.sections:
+            raise ValueError(f"No section {name} in the snapshot")
+        compression, offset, length = self.sections[name]
+        if compression not in _DECOMPRESSORS:
+            raise ValueError(f"Unsupported compression {compression} of section {name}")
+        self._fp.seek(offset)
+        return _DECOMPRESSORS[compression](self._fp.read(length))
+
+    def _read_strings(self) -> List[Optional[str]]:
+        if self._strings is None:
+            data = self.read_section("strings")
+            (count,) = _COUNT.unpack_from(data)
+            lengths = struct.unpack_from(f"<{count}I", data, _COUNT.size)
+            text = data[_COUNT.size * (count + 1) :].decode("utf-8", "surrogatepass")
+            strings: List[Optional[str]] = [None]
+            start = 0
+            for length in lengths:
+                strings.append(text[start : start + length])
+                start += length
+            self._strings = strings
+        return self._strings
+
+    def _read_datetimes(self) -> List[Optional[datetime]]:
+        timezones: Dict[int, timezone] = {0: UTC}
+        datetimes: List[Optional[datetime]] = [None]
+        for microseconds, offset in _DATETIME.iter_unpack(self.read_section("datetimes")[_COUNT.size :]):
+            value = _EPOCH + timedelta(microseconds=microseconds)
+            if offset != _NAIVE:
+                if (tz := timezones.get(offset)) is None:
+                    tz = timezones[offset] = timezone(timedelta(seconds=offset))
+                value = value.replace(tzinfo=tz)
+            datetimes.append(value)
+        return datetimes
+
+    def _read_types(self) -> List[Optional[CommonEntityType]]:
+        strings = self._read_strings()
+        types: List[Optional[CommonEntityType]] = [None]
+        for super_type_name, short_name, raw_type in _TYPE.iter_unpack(self.read_section("types")[_COUNT.size :]):
+            super_type = CommonEntitySuperTypes.by_short_name(strings[super_type_name])
+            if raw_type:
+                types.append(super_type.type_class.model_validate_json(strings[raw_type]))
+            else:
+                types.append(super_type.type_by_short_name(strings[short_name]))
+        return types
+
+    def _read_layouts(self) -> List[_Layout]:
+        if self._layouts is not None:
+            return self._layouts
+        strings = self._read_strings()
+        data = self.read_section("layouts")
+        (count,) = _COUNT.unpack_from(data)
+        position = _COUNT.size
+        layouts = []
+        for code in range(count):
+            class_name, field_count = _LAYOUT.unpack_from(data, position)
+            position += _LAYOUT.size
+            fields = []
+            for _ in range(field_count):
+                name, kind = _LAYOUT_FIELD.unpack_from(data, position)
+                position += _LAYOUT_FIELD.size
+                fields.append((strings[name], kind))
+            if (model_class := _MODEL_CLASSES.get(strings[class_name])) is None:
+                raise ValueError(f"Unsupported class {strings[class_name]} in the snapshot")
+            layouts.append(_Layout(code, model_class, tuple(fields)))
+
+        datetimes = self._read_datetimes()
+        types = self._read_types()
+        fixed_converters = {
+            _UUID: _to_uuid,
+            _REFERENCE: None,
+            _STRING: strings.__getitem__,
+            _DATETIME_INDEX: datetimes.__getitem__,
+            _LEVEL: _LEVELS.__getitem__,
+            _TYPE_INDEX: types.__getitem__,
+            _INTEGER: _to_integer,
+        }
+        for layout in layouts:
+            converters = []
+            for name, kind in layout.fields:
+                if kind not in _FIXED_FORMATS:
+                    continue
+                if kind != _JSON:
+                    converters.append(fixed_converters[kind])
+                elif name in layout.model_class.model_fields:
+                    adapter = TypeAdapter(layout.model_class.model_fields[name].annotation)
+                    converters.append(
+                        lambda index, adapter=adapter: adapter.validate_json(strings[index]) if index else None
+                    )
+                else:
+                    converters.append(None)
+            layout.converters = tuple(converters)
+        self._layouts = layouts
+        return layouts
+
+    def _read_records(self, name: str) -> List[Tuple[Any, _Layout]]:
+        """Reads the objects of a section, leaving the IDs of the referenced objects as bytes."""
+        layouts = self._read_layouts()
+        strings = self._strings
+        data = self.read_section(name)
+        (count,) = _COUNT.unpack_from(data)
+        position = _COUNT.size
+        decoded = []
+        for _ in range(count):
+            layout = layouts[data[position]]
+            position += 1
+            fixed = layout.fixed.unpack_from(data, position)
+            position += layout.fixed.size
+            values = {
+                name: value if convert is None else convert(value)
+                for name, convert, value in zip(layout.fixed_names, layout.converters, fixed)
+            }
+            for name, kind in layout.variable_fields:
+                (size,) = _COUNT.unpack_from(data, position)
+                position += _COUNT.size
+                if size == _NO_COUNT:
+                    values[name] = None
+                elif kind == _REFERENCES:
+                    values[name] = [data[start : start + 16] for start in range(position, position + 16 * size, 16)]
+                    position += 16 * size
+                else:
+                    indexes = struct.unpack_from(f"<{2 * size}I", data, position)
+                    position += 8 * size
+                    values[name] = {strings[key]: strings[value] for key, value in zip(indexes[::2], indexes[1::2])}
+            for name in layout.dropped:
+                del values[name]
+            if layout.constants:
+                values.update(layout.constants)
+            for name, field in layout.defaults:
+                values[name] = field.get_default(call_default_factory=True)
+            decoded.append((_construct(layout.model_class, values), layout))
+        return decoded
+
+    def load_collection(self, name: str) -> Dict[UUID, Any]:
+        """Loads the objects of one feed collection, without reading the sections of the other collections.
+
+        References to objects of other collections are left as UUIDs.
+
+        Args:
+            name: The name of the collection: "entities", "relations" or "cases".
+
+        Returns:
+            The objects of the collection, keyed by their IDs.
+
+        Raises:
+            ValueError: If the collection is not in the snapshot.
+        """
+        decoded = self._read_records(name)
+        objects = {obj.id.bytes: obj for obj, _ in decoded}
+        _resolve_references(decoded, objects)
+        return {obj.id: obj for obj, _ in decoded}
+
+
+def load_snapshot(fp: IO[bytes], collections: Optional[Iterable[str]] = None) -> ColanderFeed:
+    """Loads a feed saved with :py:func:`save_snapshot`.
+
+    The objects are constructed without validation, as they were valid when the snapshot was written: only
+    load snapshots from trusted sources, and call :py:meth:`ColanderFeed.validate` otherwise. References between
+    the loaded objects are resolved, the objects being registered in the repository of the feed.
+
+    Args:
+        fp: The snapshot file, opened in binary mode. It must be seekable.
+        collections: If set, only these feed collections ("entities", "relations", "cases") are loaded, the
+            sections of the others are not read. References to objects of the other collections are left as UUIDs.
+
+    Returns:
+        The loaded feed.
+
+    Raises:
+        ValueError: If the file is not a snapshot, or it has an unsupported version or content.
+    """
+    reader = SnapshotReader(fp)
+    collections = FEED_COLLECTIONS if collections is None else tuple(collections)
+    if unknown := set(collections) - set(FEED_COLLECTIONS):
+        raise ValueError(f"Unknown feed collections {sorted(unknown)}")
+    decoded = {collection: reader._read_records(collection) for collection in collections}
+    objects = {obj.id.bytes: obj for records in decoded.values() for obj, _ in records}
+    for records in decoded.values():
+        _resolve_references(records, objects)
+
+    feed = reader._read_records("feed")[0][0]
+    repository = ColanderRepository()
+    for obj in objects.values():
+        repository << obj
+    for collection, records in decoded.items():
+        setattr(feed, collection, {obj.id: obj for obj, _ in records})
+    feed._repository = repository
+    return feed
@@ -0,0 +1,613 @@
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+
+from colander_data_converter.base.common import ReferenceFieldsSchema, TlpPapLevel
+from colander_data_converter.base.models import (
+    Case,
+    ColanderFeed,
+    ColanderRepository,
+    CommonEntitySuperType,
+    CommonEntitySuperTypes,
+    Entity,
+    EntityRelation,
+    EntityTypes,
+    ImmutableRelation,
+    ObjectIdDict,
+    get_entity_discriminator,
+    get_id,
+)
+from colander_data_converter.base.streaming import FEED_COLLECTIONS, unlinked_dump
+from colander_data_converter.base.types.base import CommonEntityType
+
+__all__ = ["FeedStore"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS properties (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS entities (
+    id BLOB PRIMARY KEY,
+    super_type TEXT NOT NULL,
+    type TEXT,
+    case_id BLOB,
+    tlp INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entities_type ON entities (super_type, type);
+CREATE INDEX IF NOT EXISTS entities_case ON entities (case_id);
+CREATE INDEX IF NOT EXISTS entities_tlp ON entities (tlp);
+CREATE INDEX IF NOT EXISTS entities_name ON entities (name);
+CREATE TABLE IF NOT EXISTS relations (
+    id BLOB PRIMARY KEY,
+    name TEXT NOT NULL,
+    obj_from BLOB NOT NULL,
+    obj_to BLOB NOT NULL,
+    case_id BLOB,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS relations_from ON relations (obj_from, name);
+CREATE INDEX IF NOT EXISTS relations_to ON relations (obj_to, name);
+CREATE INDEX IF NOT EXISTS relations_case ON relations (case_id);
+CREATE TABLE IF NOT EXISTS cases (
+    id BLOB PRIMARY KEY,
+    tlp INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+_COLUMNS = {
+    "entities": ("id", "super_type", "type", "case_id", "tlp", "name", "data"),
+    "relations": ("id", "name", "obj_from", "obj_to", "case_id", "data"),
+    "cases": ("id", "tlp", "name", "data"),
+}
+
+# SQLite builds may be limited to 999 host parameters per statement
+_MAX_PARAMETERS = 900
+
+
+def _blob(value: Any) -> Optional[bytes]:
+    """Returns the 16 bytes of the UUID of an object or an ID, None if there is none."""
+    object_id = get_id(value)
+    return object_id.bytes if object_id is not None else None
+
+
+def _serialize(obj: Union[Case, EntityTypes, EntityRelation]) -> str:
+    """Serializes an object to JSON, with its references replaced by IDs."""
+    return json.dumps(unlinked_dump(obj), separators=(",", ":"))
+
+
+def _row(collection: str, obj: Union[Case, EntityTypes, EntityRelation]) -> Tuple:
+    """Returns the row of an object in the table of its collection."""
+    if collection == "entities":
+        entity_type = obj.type.short_name if obj.type is not None else None
+        return (
+            obj.id.bytes,
+            obj.super_type.short_name,
+            entity_type,
+            _blob(obj.case),
+            obj.tlp.value.ordering_value,
+            obj.name,
+            _serialize(obj),
+        )
+    if collection == "relations":
+        return (
+            obj.id.bytes,
+            obj.name,
+            _blob(obj.obj_from),
+            _blob(obj.obj_to),
+            _blob(obj.case),
+            _serialize(obj),
+        )
+    return obj.id.bytes, obj.tlp.value.ordering_value, obj.name, _serialize(obj)
+
+
+def _collection_of(obj: Any) -> str:
+    """Returns the collection an object belongs to."""
+    if isinstance(obj, Entity):
+        return "entities"
+    if isinstance(obj, EntityRelation):
+        return "relations"
+    if isinstance(obj, Case):
+        return "cases"
+    raise TypeError(f"Unsupported object {obj!r}")
+
+
+def _references(obj: Any) -> Iterator[UUID]:
+    """Yields the unresolved references of an object."""
+    for field, is_list in ReferenceFieldsSchema.of(obj.__class__).references:
+        value = getattr(obj, field)
+        for ref in (value or []) if is_list else (value,):
+            if type(ref) is UUID:
+                yield ref
+
+
+def _chunks(values: Sequence[Any], size: int = _MAX_PARAMETERS) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class FeedStore:
+    """Out-of-core storage of the entities, relations and cases of a feed in a SQLite database.
+
+    The store exposes the lookup surface of :py:class:`ColanderFeed` (``contains``, ``get``, ``add``,
+    ``get_by_super_type``, ``get_relations``, ``filter``) while keeping the objects on disk, so feeds
+    larger than the memory can be built, queried and streamed to converters and exporters. The objects
+    are indexed by ID, super type, type, case, TLP and name, and the relations by their ends.
+
+    Writes are buffered and committed in batches, each batch in a single transaction. Reads go through a
+    bounded cache of recently used objects; objects are rebuilt from the database otherwise, with their
+    references resolved one level deep. Changing an object read from the store does not change the
+    database, add it again with ``replace=True`` to save the change.
+
+    Example:
+        >>> from colander_data_converter.base.types.observable import ObservableTypes
+        >>> from colander_data_converter.base.models import Observable
+        >>> obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        >>> obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        >>> with FeedStore() as store:
+        ...     store.add(obs1)
+        ...     store.add(obs2)
+        ...     store.add(EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2))
+        ...     relation = next(iter(store.get_outgoing_relations(obs1).values()))
+        ...     print(relation.obj_to.name, store.count("entities"))
+        8.8.8.8 2
+    """
+
+    def __init__(self, path: Union[str, os.PathLike] = ":memory:", cache_size: int = 10_000, batch_size: int = 1_000):
+        """Opens the store, creating the database if needed.
+
+        Args:
+            path: The path of the database file, an in-memory database is used by default.
+            cache_size: The maximum number of entities, relations and cases each held in the object cache.
+            batch_size: The number of buffered writes committed at once, also the number of rows
+                fetched at once when iterating over the store.
+
+        Raises:
+            ValueError: If the cache size or the batch size is not positive.
+        """
+        if cache_size <= 0:
+            raise ValueError(f"Invalid cache size {cache_size}")
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch size {batch_size}")
+        self.batch_size = batch_size
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._cache = ColanderRepository(max_size=cache_size)
+        self._pending: Dict[Tuple[str, bool], List[Tuple]] = {}
+        self._pending_count = 0
+
+    def __enter__(self) -> "FeedStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Commits the buffered writes and closes the database."""
+        self.flush()
+        self._connection.close()
+
+    @property
+    def name(self) -> str:
+        """The name of the stored feed."""
+        return self._get_property("name")
+
+    @name.setter
+    def name(self, value: str):
+        self._set_property("name", value)
+
+    @property
+    def description(self) -> str:
+        """The description of the stored feed."""
+        return self._get_property("description")
+
+    @description.setter
+    def description(self, value: str):
+        self._set_property("description", value)
+
+    def _get_property(self, key: str) -> str:
+        row = self._connection.execute("SELECT value FROM properties WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else ""
+
+    def _set_property(self, key: str, value: str):
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO properties VALUES (?, ?)", (key, value))
+
+    def add(self, obj: Union[Case, EntityTypes, EntityRelation], replace: bool = False):
+        """Adds an object to the store.
+
+        The write is buffered until :py:meth:`flush` is called, explicitly, by a read or once the batch
+        is full.
+
+        Args:
+            obj: The entity, relation or case to add.
+            replace: If True, an object already stored with the same ID is overwritten. Otherwise, it is
+                kept, as done by :py:meth:`ColanderFeed.add`.
+        """
+        collection = _collection_of(obj)
+        self._pending.setdefault((collection, replace), []).append(_row(collection, obj))
+        self._pending_count += 1
+        if replace:
+            getattr(self._cache, collection).pop(obj.id, None)
+        if self._pending_count >= self.batch_size:
+            self.flush()
+
+    def add_feed(self, feed: ColanderFeed, replace: bool = False):
+        """Adds the entities, relations and cases of a feed to the store, along with its name and description.
+
+        Args:
+            feed: The feed to add.
+            replace: If True, the objects already stored with the same IDs are overwritten.
+        """
+        for collection in FEED_COLLECTIONS:
+            for obj in (getattr(feed, collection) or {}).values():
+                self.add(obj, replace=replace)
+        self.flush()
+        self.name = feed.name
+        self.description = feed.description
+
+    def flush(self):
+        """Commits the buffered writes in a single transaction."""
+        if not self._pending_count:
+            return
+        with self._connection:
+            # Ignored inserts go first so that the last replacing write of an ID wins
+            for (collection, replace), rows in sorted(self._pending.items(), key=lambda item: item[0][1]):
+                columns = _COLUMNS[collection]
+                verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+                self._connection.executemany(
+                    f"{verb} INTO {collection} VALUES ({', '.join('?' * len(columns))})",  # nosec
+                    rows,
+                )
+        self._pending.clear()
+        self._pending_count = 0
+
+    def count(self, collection: str = "entities") -> int:
+        """Counts the objects of a collection.
+
+        Args:
+            collection: The collection: "entities", "relations" or "cases".
+
+        Returns:
+            The number of stored objects.
+        """
+        if collection not in FEED_COLLECTIONS:
+            raise ValueError(f"Unknown collection {collection}")
+        self.flush()
+        return self._connection.execute(f"SELECT COUNT(*) FROM {collection}").fetchone()[0]  # nosec
+
+    def _build(self, collection: str, rows: Iterable[Tuple[bytes, str]]) -> List[Any]:
+        """Rebuilds the objects of rows (ID, data), reusing the cached ones. References are not resolved."""
+        storage = getattr(self._cache, collection)
+        context = {"repository": self._cache}
+        objects = []
+        for raw_id, data in rows:
+            object_id = UUID(bytes=raw_id)
+            if (obj := storage.get(object_id)) is None:
+                raw_object = json.loads(data)
+                if collection == "entities":
+                    model_class = Entity.resolve_type(get_entity_discriminator(raw_object))
+                else:
+                    model_class = EntityRelation if collection == "relations" else Case
+                obj = model_class.model_validate(raw_object, context=context)
+            objects.append(obj)
+        return objects
+
+    def _select(self, collection: str, where: str = "", params: Sequence[Any] = ()) -> Iterator[List[Any]]:
+        """Runs a query on a collection and yields the matching objects, in batches, with their references resolved.
+
+        Args:
+            collection: The collection to query.
+            where: The SQL condition on the rows of the collection, all rows match if empty.
+            params: The parameters of the condition.
+
+        Yields:
+            Lists of at most batch size objects.
+        """
+        self.flush()
+        query = f"SELECT id, data FROM {collection}" + (f" WHERE {where}" if where else "")  # nosec
+        cursor = self._connection.execute(query, params)
+        while rows := cursor.fetchmany(self.batch_size):
+            objects = self._build(collection, rows)
+            self._resolve(objects)
+            yield objects
+
+    def _resolve(self, objects: List[Any]):
+        """Resolves the references of objects, loading the referenced entities and cases from the database at once."""
+        repository = ColanderRepository()
+        missing = []
+        for obj in objects:
+            for ref in _references(obj):
+                if (found := self._cache >> ref) is not ref:
+                    repository << found
+                else:
+                    missing.append(ref.bytes)
+        missing = list(set(missing))
+        for collection in ("entities", "cases"):
+            for chunk in _chunks(missing):
+                query = f"SELECT id, data FROM {collection} WHERE id IN ({', '.join('?' * len(chunk))})"  # nosec
+                for found in self._build(collection, self._connection.execute(query, chunk)):
+                    repository << found
+        for obj in objects:
+            obj.resolve_references(repository=repository)
+
+    def _get_one(self, collection: str, object_id: UUID) -> Optional[Any]:
+        """Returns an object of a collection by ID, from the cache or the database."""
+        if (obj := getattr(self._cache, collection).get(object_id)) is not None:
+            return obj
+        for objects in self._select(collection, "id = ?", (object_id.bytes,)):
+            return objects[0]
+        return None
+
+    def contains(self, obj: Any) -> bool:
+        """Check if an object exists in the store by its identifier.
+
+        Args:
+            obj: The object to check for existence, or its ID.
+
+        Returns:
+            True if the object exists in entities, relations, or cases; False otherwise.
+        """
+        object_id = get_id(obj)
+        if object_id is None:
+            return False
+        self.flush()
+        for collection in FEED_COLLECTIONS:
+            query = f"SELECT 1 FROM {collection} WHERE id = ?"  # nosec
+            if self._connection.execute(query, (object_id.bytes,)).fetchone() is not None:
+                return True
+        return False
+
+    def get(self, obj: Any) -> Optional[Union[Case, EntityTypes, EntityRelation]]:
+        """Retrieve an object from the store by its identifier.
+
+        Args:
+            obj: The object to retrieve, or its ID.
+
+        Returns:
+            The found object if it exists in any of the collections (entities, relations, or cases), otherwise None.
+        """
+        object_id = get_id(obj)
+        if object_id is None:
+            return None
+        for collection in FEED_COLLECTIONS:
+            if (found := self._get_one(collection, object_id)) is not None:
+                return found
+        return None
+
+    def iter_entities(
+        self,
+        super_type: Optional[CommonEntitySuperType] = None,
+        entity_type: Optional[CommonEntityType] = None,
+        case: Optional[Any] = None,
+        name: Optional[str] = None,
+    ) -> Iterator[EntityTypes]:
+        """Iterates over the stored entities, optionally filtered on indexed fields.
+
+        Only a batch of entities is held in memory at once.
+
+        Args:
+            super_type: If set, only the entities of this super type are yielded.
+            entity_type: If set, only the entities of this type are yielded.
+            case: If set, only the entities of this case (or case ID) are yielded.
+            name: If set, only the entities with this name are yielded.
+
+        Yields:
+            The matching entities.
+        """
+        conditions = []
+        params: List[Any] = []
+        if super_type is not None:
+            conditions.append("super_type = ?")
+            params.append(super_type.short_name)
+        if entity_type is not None:
+            conditions.append("type = ?")
+            params.append(entity_type.short_name)
+        if case is not None:
+            conditions.append("case_id = ?")
+            params.append(_blob(case))
+        if name is not None:
+            conditions.append("name = ?")
+            params.append(name)
+        for entities in self._select("entities", " AND ".join(conditions), params):
+            yield from entities
+
+    def iter_relations(self) -> Iterator[EntityRelation]:
+        """Iterates over the stored relations, only a batch of them being held in memory at once.
+
+        Yields:
+            The relations.
+        """
+        for relations in self._select("relations"):
+            yield from relations
+
+    def iter_cases(self) -> Iterator[Case]:
+        """Iterates over the stored cases, only a batch of them being held in memory at once.
+
+        Yields:
+            The cases.
+        """
+        for cases in self._select("cases"):
+            yield from cases
+
+    def get_by_super_type(self, super_type: CommonEntitySuperType) -> Iterator[EntityTypes]:
+        """
+        Returns the entities matching the given super type.
+
+        Contrary to :py:meth:`ColanderFeed.get_by_super_type`, the entities are streamed from the
+        database instead of being returned as a list.
+
+        Args:
+            super_type: The CommonEntitySuperType to filter entities by.
+
+        Returns:
+            An iterator over the entities of the specified super type.
+        """
+        return self.iter_entities(super_type=super_type)
+
+    def _get_relations(self, column: str, entity: EntityTypes, name: Optional[str]) -> Dict[UUID, EntityRelation]:
+        """Returns the fully resolved relations having the entity as the given end."""
+        where = f"{column} = ?" + (" AND name = ?" if name is not None else "")
+        params = (entity.id.bytes, name) if name is not None else (entity.id.bytes,)
+        relations = ObjectIdDict()
+        for batch in self._select("relations", where, params):
+            for relation in batch:
+                if relation.is_fully_resolved(repository=self._cache):
+                    relations[relation.id] = relation
+        return relations
+
+    def get_incoming_relations(self, entity: EntityTypes, name: Optional[str] = None) -> Dict[UUID, EntityRelation]:
+        """Retrieve all relations where the specified entity is the target (obj_to).
+
+        Args:
+            entity: The entity to find incoming relations for. Must be an instance of Entity.
+            name: If set, only the relations with this name are returned.
+
+        Returns:
+            A dictionary mapping relation IDs to EntityRelation objects where the entity is the target (obj_to).
+        """
+        assert isinstance(entity, Entity)
+        return self._get_relations("obj_to", entity, name)
+
+    def get_outgoing_relations(
+        self, entity: EntityTypes, exclude_immutables=True, name: Optional[str] = None
+    ) -> Dict[UUID, EntityRelation | ImmutableRelation]:
+        """Retrieve all relations where the specified entity is the source (obj_from).
+
+        Args:
+            entity: The entity to find outgoing relations for. Must be an instance of Entity.
+            exclude_immutables: If True, exclude immutable relations. Otherwise, they are returned as
+                :py:class:`ImmutableRelation` views.
+            name: If set, only the relations with this name are returned.
+
+        Returns:
+            A dictionary mapping relation IDs to EntityRelation objects where the entity is the source (obj_from).
+        """
+        assert isinstance(entity, Entity)
+        relations: Dict[UUID, EntityRelation | ImmutableRelation] = ObjectIdDict()
+        if not exclude_immutables:
+            for relation in entity.iter_immutable_relations():
+                if name is None or relation.name == name:
+                    relations[relation.id] = relation
+        relations.update(self._get_relations("obj_from", entity, name))
+        return relations
+
+    def get_relations(
+        self, entity: EntityTypes, exclude_immutables=True
+    ) -> Dict[UUID, EntityRelation | ImmutableRelation]:
+        """Retrieve all relations (both incoming and outgoing) for the specified entity.
+
+        Args:
+            entity: The entity to find all relations for. Must be an instance of Entity.
+            exclude_immutables: If True, exclude immutable relations.
+
+        Returns:
+            A dictionary mapping relation IDs to EntityRelation objects where the entity
+            is either the source (obj_from) or target (obj_to).
+        """
+        relations = ObjectIdDict()
+        relations.update(self.get_incoming_relations(entity))
+        relations.update(self.get_outgoing_relations(entity, exclude_immutables=exclude_immutables))
+        return relations
+
+    def filter(
+        self,
+        maximum_tlp_level: TlpPapLevel,
+        include_relations=True,
+        include_cases=True,
+        exclude_entity_types: Optional[List[EntityTypes]] = None,
+    ) -> ColanderFeed:
+        """Filter the store based on TLP level, as done by :py:meth:`ColanderFeed.filter`.
+
+        The selection runs on the indexes of the database, only the selected objects are loaded, into
+        an in-memory feed.
+
+        Args:
+            maximum_tlp_level: The maximum TLP level threshold. Only entities
+                with TLP levels strictly below this value will be included.
+            include_relations: If True, includes relations where both
+                source and target entities are present in the filtered feed. Defaults to True.
+            include_cases: If True, includes cases associated with the filtered entities. Defaults to True.
+            exclude_entity_types: If provided, entities of these types are excluded.
+
+        Returns:
+            A new feed containing entities, relations, and cases that meet the specified criteria.
+        """
+        assert isinstance(maximum_tlp_level, TlpPapLevel)
+        tlp = maximum_tlp_level.value.ordering_value
+        excluded = [CommonEntitySuperTypes.by_model_class(t).short_name for t in exclude_entity_types or []]
+        where = "tlp < ?" + (f" AND super_type NOT IN ({', '.join('?' * len(excluded))})" if excluded else "")
+        params = [tlp, *excluded]
+
+        feed = ColanderFeed(name=self.name, description=self.description)
+        for entities in self._select("entities", where, params):
+            for entity in entities:
+                feed.entities[entity.id] = entity
+        if include_relations:
+            selected = f"IN (SELECT id FROM entities WHERE {where})"
+            for relations in self._select("relations", f"obj_from {selected} AND obj_to {selected}", params * 2):
+                for relation in relations:
+                    if relation.is_fully_resolved(repository=self._cache):
+                        feed.relations[relation.id] = relation
+        if include_cases:
+            selected = f"id IN (SELECT case_id FROM entities WHERE {where})"
+            for cases in self._select("cases", f"tlp < ? AND {selected}", [tlp, *params]):
+                for case in cases:
+                    feed.cases[case.id] = case
+        return feed
+
+    def iter_feeds(self, chunk_size: int = 10_000) -> Iterator[ColanderFeed]:
+        """Streams the store as a sequence of feeds, for converters and exporters working on feeds.
+
+        Each feed holds a chunk of the entities, the relations going out of them and the cases of both.
+        Every entity and every relation belongs to a single feed, the targets of the relations being
+        resolved even when they belong to another chunk.
+
+        Args:
+            chunk_size: The maximum number of entities per feed.
+
+        Yields:
+            The feeds.
+        """
+        name, description = self.name, self.description
+        self.flush()
+        cursor = self._connection.execute("SELECT id, data FROM entities")
+        while rows := cursor.fetchmany(chunk_size):
+            feed = ColanderFeed(name=name, description=description)
+            for entities in _chunks(rows, self.batch_size):
+                objects = self._build("entities", entities)
+                self._resolve(objects)
+                for entity in objects:
+                    feed.entities[entity.id] = entity
+            for chunk in _chunks([row[0] for row in rows]):
+                where = f"obj_from IN ({', '.join('?' * len(chunk))})"
+                for relations in self._select("relations", where, chunk):
+                    for relation in relations:
+                        if relation.is_fully_resolved(repository=self._cache):
+                            feed.relations[relation.id] = relation
+            for obj in (*feed.entities.values(), *feed.relations.values()):
+                if isinstance(obj.case, Case):
+                    feed.cases[obj.case.id] = obj.case
+            yield feed
+
+    def to_feed(self) -> ColanderFeed:
+        """Loads the whole store into an in-memory feed.
+
+        Returns:
+            The feed holding all the stored entities, relations and cases.
+        """
+        feed = ColanderFeed(name=self.name, description=self.description)
+        for collection in FEED_COLLECTIONS:
+            objects = getattr(feed, collection)
+            for batch in self._select(collection):
+                for obj in batch:
+                    objects[obj.id] = obj
+        # The references resolved while loading may point to other instances than the ones of the feed
+        feed.unlink_references()
+        feed.resolve_references()
+        return feed
@@ -0,0 +1,611 @@
+import bz2
+import codecs
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+from datetime import datetime, UTC
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Set, Tuple, Union
+
+from pydantic import BaseModel, UUID4
+
+from colander_data_converter.base.common import ReferenceFieldsSchema, TlpPapLevel
+from colander_data_converter.base.models import (
+    Case,
+    ColanderFeed,
+    ColanderRepository,
+    CommonEntitySuperTypes,
+    EntityRelation,
+    EntityTypes,
+    get_id,
+)
+
+FEED_COLLECTIONS = ("entities", "relations", "cases")
+"""The keys of a feed holding collections of objects keyed by their IDs."""
+
+NDJSON_HEADER = "feed"
+"""The collection of the header record of a JSON Lines feed, holding the fields of the feed itself."""
+
+COMPRESSIONS = {"gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open}
+"""The functions opening the files compressed with the supported algorithms."""
+
+_COMPRESSION_EXTENSIONS = {".gz": "gzip", ".gzip": "gzip", ".bz2": "bz2", ".xz": "lzma", ".lzma": "lzma"}
+_COMPRESSION_MAGICS = ((b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "lzma"))
+
+_WHITESPACES = re.compile(r"[ \t\n\r]*")
+
+# The number of characters a token cut at the end of the buffer may span, e.g. "\\u00e" or "fals"
+_TRUNCATION_MARGIN = 16
+
+
+class JsonStreamReader:
+    """Reads a JSON document incrementally from a file, one value at a time.
+
+    Only the values being decoded are held in memory, so the members of a huge JSON object can be
+    read one after the other. Text and binary (UTF-8) files are supported.
+
+    Example:
+        >>> import io
+        >>> reader = JsonStreamReader(io.StringIO('{"a": 1, "b": {"c": [2, 3]}}'), chunk_size=4)
+        >>> for key in reader.members():
+        ...     if key == "b":
+        ...         print(key, [(k, reader.value()) for k in reader.members()])
+        ...     else:
+        ...         print(key, reader.value())
+        a 1
+        b [('c', [2, 3])]
+    """
+
+    def __init__(self, fp: IO, chunk_size: int = 1 << 16, max_value_size: int = 1 << 26):
+        """Initializes the reader.
+
+        Args:
+            fp: The file to read, opened in text or binary mode.
+            chunk_size: The number of characters (or bytes) read from the file at once.
+            max_value_size: The maximum number of characters of a single value, larger values are rejected
+                instead of being read into memory.
+        """
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._decoder = json.JSONDecoder()
+        self._bytes_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Appends the next chunk of the file to the buffer, dropping the consumed characters.
+
+        Args:
+            size: The size of the chunk, defaults to the chunk size of the reader.
+
+        Returns:
+            False if the end of the file was reached, True otherwise.
+        """
+        if self._eof:
+            return False
+        chunk = self._fp.read(size or self._chunk_size)
+        # A chunk of bytes may end in the middle of a character, read until something is decoded
+        while isinstance(chunk, bytes):
+            data = chunk
+            chunk = self._bytes_decoder.decode(data, final=not data)
+            if not chunk and data:
+                chunk = self._fp.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespaces and returns the next character without consuming it.
+
+        Returns:
+            The next character, or an empty string at the end of the file.
+        """
+        while True:
+            self._pos = _WHITESPACES.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, char: str):
+        """Consumes the next character, which must be the given one.
+
+        Args:
+            char: The expected character.
+
+        Raises:
+            ValueError: If the next character is not the expected one.
+        """
+        if (found := self.peek()) != char:
+            raise ValueError(f"Expected '{char}' but found '{found}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next JSON value.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            json.JSONDecodeError: If the value is not valid JSON.
+            ValueError: If the value is larger than the maximum value size.
+        """
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if not self._is_truncated(e):
+                    raise
+                if len(self._buffer) - self._pos > self._max_value_size:
+                    raise ValueError(f"JSON value larger than {self._max_value_size} characters") from e
+                # The value is incomplete, read larger and larger chunks to keep the cost linear
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._fill(size):
+                continue
+            self._pos = end
+            return value
+
+    def _is_truncated(self, error: json.JSONDecodeError) -> bool:
+        """Tells whether a decoding error may be due to the end of the buffer rather than to invalid JSON.
+
+        Args:
+            error: The decoding error.
+
+        Returns:
+            True if reading more data may fix the error.
+        """
+        # A string is reported at its start, anything else (partial literal, number or escape) near the end
+        return error.msg.startswith("Unterminated string") or error.pos >= len(self._buffer) - _TRUNCATION_MARGIN
+
+    def members(self) -> Iterator[str]:
+        """Iterates over the keys of the JSON object starting at the current position.
+
+        The value of each key must be consumed, with :py:meth:`value` or :py:meth:`members`, before
+        moving to the next key.
+
+        Yields:
+            The keys of the object.
+
+        Raises:
+            ValueError: If the next value is not a JSON object.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' but found '{separator}'")
+
+
+class FeedLoadFilter(BaseModel):
+    """Predicates applied to the raw objects of a feed before they are validated.
+
+    Objects not matching all the predicates are skipped, so they never cost any validation nor memory.
+
+    Example:
+        >>> load_filter = FeedLoadFilter(super_types={"observable"}, maximum_tlp_level=TlpPapLevel.AMBER)
+        >>> load_filter.accepts("entities", {"super_type": {"short_name": "OBSERVABLE"}, "tlp": "GREEN"})
+        True
+        >>> load_filter.accepts("entities", {"super_type": {"short_name": "OBSERVABLE"}, "tlp": "AMBER"})
+        False
+    """
+
+    case_ids: Optional[Set[str]] = None
+    """If set, only the cases with these IDs, and the entities and relations belonging to them, are loaded."""
+
+    super_types: Optional[Set[str]] = None
+    """If set, only the entities of these super types (short names, case-insensitive) are loaded."""
+
+    maximum_tlp_level: Optional[TlpPapLevel] = None
+    """If set, only the objects with a TLP level strictly below this value are loaded."""
+
+    updated_after: Optional[datetime] = None
+    """If set, only the entities and relations updated after this time are loaded."""
+
+    def model_post_init(self, __context):
+        if self.super_types is not None:
+            self.super_types = {super_type.replace("_", "").lower() for super_type in self.super_types}
+        if self.updated_after is not None and self.updated_after.tzinfo is None:
+            self.updated_after = self.updated_after.replace(tzinfo=UTC)
+
+    def accepts(self, collection: str, raw_object: Dict[str, Any]) -> bool:
+        """Checks a raw object against the predicates.
+
+        Args:
+            collection: The collection of the object: "entities", "relations" or "cases".
+            raw_object: The raw object, as read from the feed.
+
+        Returns:
+            True if the object has to be loaded, False otherwise.
+        """
+        if collection == "cases":
+            return self.case_ids is None or str(raw_object.get("id")) in self.case_ids
+        if self.case_ids is not None:
+            case = raw_object.get("case")
+            if isinstance(case, dict):
+                case = case.get("id")
+            if str(case) not in self.case_ids:
+                return False
+        if self.super_types is not None and collection == "entities":
+            super_type = (raw_object.get("super_type") or {}).get("short_name", "")
+            if super_type.replace("_", "").lower() not in self.super_types:
+                return False
+        if self.maximum_tlp_level is not None and (tlp := raw_object.get("tlp")):
+            if TlpPapLevel.by_name(tlp).value >= self.maximum_tlp_level.value:
+                return False
+        if self.updated_after is not None and (updated_at := raw_object.get("updated_at")):
+            updated_at = datetime.fromisoformat(updated_at)
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=UTC)
+            if updated_at <= self.updated_after:
+                return False
+        return True
+
+
+def iter_raw_feed(fp: IO, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Optional[str], Any]]:
+    """Iterates over the content of a Colander feed file without loading the whole document.
+
+    Args:
+        fp: The feed file, opened in text or binary mode.
+        chunk_size: The number of characters (or bytes) read from the file at once.
+
+    Yields:
+        For each object of the entities, relations and cases collections, a tuple
+        (collection, object ID, raw object). For the other top-level fields of the feed, a tuple
+        (field name, None, value).
+    """
+    reader = JsonStreamReader(fp, chunk_size=chunk_size)
+    for key in reader.members():
+        if key in FEED_COLLECTIONS and reader.peek() == "{":
+            for object_id in reader.members():
+                yield key, object_id, reader.value()
+        else:
+            yield key, None, reader.value()
+
+
+def load_feed(
+    fp: IO,
+    load_filter: Optional[FeedLoadFilter] = None,
+    resolve_types: bool = True,
+    chunk_size: int = 1 << 16,
+) -> ColanderFeed:
+    """Loads a Colander feed file incrementally, validating one object at a time.
+
+    Contrary to :py:meth:`ColanderFeed.load`, the whole JSON document is never held in memory: each
+    entity, relation and case is read, checked against the filter, validated and released. Relations
+    of which an end was skipped by the filter are skipped too.
+
+    Args:
+        fp: The feed file, opened in text or binary mode.
+        load_filter: The predicates selecting the objects to load, everything is loaded if not set.
+        resolve_types: If True, resolves entity types based on the types enum. Mandatory to find similar entities.
+        chunk_size: The number of characters (or bytes) read from the file at once.
+
+    Returns:
+        The loaded feed.
+
+    Raises:
+        ValueError: If there are inconsistencies in object IDs or an unsupported entity super type.
+
+    Example:
+        >>> import io
+        >>> raw = '''{"entities": {"bcbb2c31-ff61-465a-a770-85c154733567": {
+        ...     "id": "bcbb2c31-ff61-465a-a770-85c154733567", "name": "1.1.1.1", "tlp": "GREEN",
+        ...     "super_type": {"short_name": "OBSERVABLE"}, "type": {"short_name": "IPV4", "name": "IPv4"}
+        ... }}}'''
+        >>> feed = load_feed(io.StringIO(raw))
+        >>> feed.entities["bcbb2c31-ff61-465a-a770-85c154733567"].type.name
+        'IPv4'
+        >>> len(load_feed(io.StringIO(raw), FeedLoadFilter(maximum_tlp_level=TlpPapLevel.GREEN)).entities)
+        0
+    """
+    return _load_records(iter_raw_feed(fp, chunk_size=chunk_size), load_filter, resolve_types)
+
+
+def _raw_relation_ends(raw_relation: Dict[str, Any]) -> Tuple[Optional[UUID4], Optional[UUID4]]:
+    """Returns the IDs of the source and target entities of a raw relation, without validating it.
+
+    Args:
+        raw_relation: The raw relation, whose ends are IDs or raw entities.
+
+    Returns:
+        The IDs of the source (obj_from) and target (obj_to) entities.
+    """
+    ends = []
+    for keys in (("obj_from", "obj_from_id"), ("obj_to", "obj_to_id")):
+        end = next((raw_relation[key] for key in keys if key in raw_relation), None)
+        ends.append(get_id(end.get("id") if isinstance(end, dict) else end))
+    return ends[0], ends[1]
+
+
+def _validate_records(
+    records: Iterable[Tuple[str, Optional[str], Any]],
+    load_filter: FeedLoadFilter,
+    resolve_types: bool,
+    repository: ColanderRepository,
+    fields: Dict[str, Any],
+    skipped_entities: Set[Optional[UUID4]],
+) -> Iterator[Tuple[str, Union[Case, EntityTypes, EntityRelation]]]:
+    """Validates the raw objects of a feed one at a time.
+
+    Args:
+        records: The (collection, object ID, raw object) tuples of the feed, as yielded by :py:func:`iter_raw_feed`.
+        load_filter: The predicates selecting the objects to validate.
+        resolve_types: If True, resolves entity types based on the types enum.
+        repository: The repository the objects are registered into.
+        fields: Receives the other top-level fields of the feed.
+        skipped_entities: Receives the IDs of the entities rejected by the filter.
+
+    Yields:
+        The (collection, object) tuples of the accepted objects. Relations of which an end was already skipped are
+        skipped too.
+    """
+    context = {"repository": repository}
+    for key, object_id, raw_object in records:
+        if object_id is None:
+            if key not in FEED_COLLECTIONS:
+                fields[key] = raw_object
+            continue
+        if object_id != raw_object.get("id"):
+            raise ValueError(f"{object_id} does not match with the ID of {raw_object}")
+        if not load_filter.accepts(key, raw_object):
+            if key == "entities":
+                skipped_entities.add(get_id(object_id))
+            continue
+        if key == "entities":
+            super_type_name = (raw_object.get("super_type") or {}).get("short_name", "")
+            if (super_type := CommonEntitySuperTypes.by_short_name(super_type_name)) is None:
+                raise ValueError(f"Unsupported super type {super_type_name} of {object_id}")
+            entity = super_type.model_class.model_validate(raw_object, context=context)
+            if resolve_types:
+                entity.type = super_type.types_class.by_short_name(entity.type.short_name)
+            yield key, entity
+        elif key == "relations":
+            if skipped_entities and not skipped_entities.isdisjoint(_raw_relation_ends(raw_object)):
+                continue
+            yield key, EntityRelation.model_validate(raw_object, context=context)
+        else:
+            yield key, Case.model_validate(raw_object, context=context)
+
+
+def _load_records(
+    records: Iterable[Tuple[str, Optional[str], Any]], load_filter: Optional[FeedLoadFilter], resolve_types: bool
+) -> ColanderFeed:
+    """Builds a feed from its raw objects, validated one at a time.
+
+    Args:
+        records: The (collection, object ID, raw object) tuples of the feed, as yielded by :py:func:`iter_raw_feed`.
+        load_filter: The predicates selecting the objects to load, everything is loaded if not set.
+        resolve_types: If True, resolves entity types based on the types enum.
+
+    Returns:
+        The loaded feed.
+    """
+    # Objects are registered into a repository owned by the feed, not into the current one
+    repository = ColanderRepository()
+    fields: Dict[str, Any] = {}
+    collections: Dict[str, Dict[str, Any]] = {collection: {} for collection in FEED_COLLECTIONS}
+    skipped_entities: Set[Optional[UUID4]] = set()
+
+    for key, obj in _validate_records(
+        records, load_filter or FeedLoadFilter(), resolve_types, repository, fields, skipped_entities
+    ):
+        collections[key][str(obj.id)] = obj
+
+    # Relations may be read before the entities they were skipped with
+    if skipped_entities:
+        for relation_id, relation in list(collections["relations"].items()):
+            if get_id(relation.obj_from) in skipped_entities or get_id(relation.obj_to) in skipped_entities:
+                del collections["relations"][relation_id]
+                repository.relations.pop(relation.id, None)
+
+    feed = ColanderFeed.model_validate({**fields, **collections}, context={"repository": repository})
+    feed.resolve_references()
+    return feed
+
+
+def open_feed_file(path: Union[str, os.PathLike], mode: str = "r", compression: Optional[str] = None) -> IO:
+    """Opens a feed file in text mode, transparently compressing or decompressing it.
+
+    When reading, the compression is detected from the first bytes of the file, then from its extension. When
+    writing, it is detected from the extension (.gz, .bz2, .xz or .lzma).
+
+    Args:
+        path: The path of the file.
+        mode: "r" to read the file, "w" to write it or "a" to append to it.
+        compression: The compression algorithm ("gzip", "bz2" or "lzma"), detected if not set.
+
+    Returns:
+        The file, opened in text mode and encoded in UTF-8.
+
+    Raises:
+        ValueError: If the mode or the compression algorithm is not supported.
+    """
+    if mode not in ("r", "w", "a"):
+        raise ValueError(f"Unsupported mode {mode}")
+    if compression is None and mode == "r":
+        with open(path, "rb") as f:
+            magic = f.read(6)
+        compression = next((name for prefix, name in _COMPRESSION_MAGICS if magic.startswith(prefix)), None)
+    if compression is None:
+        compression = _COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if compression is None:
+        return open(path, mode, encoding="utf-8")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression {compression}, expected one of {', '.join(COMPRESSIONS)}")
+    return COMPRESSIONS[compression](path, f"{mode}t", encoding="utf-8")
+
+
+def unlinked_dump(obj: Union[Case, EntityTypes, EntityRelation]) -> Dict[str, Any]:
+    """Dumps an object to JSON-compatible data, with its references replaced by IDs.
+
+    Contrary to ``model_dump``, the referenced objects are neither dumped nor modified.
+
+    Args:
+        obj: The entity, relation or case to dump.
+
+    Returns:
+        The JSON-compatible data of the object.
+    """
+    schema = ReferenceFieldsSchema.of(obj.__class__)
+    content = obj.model_dump(mode="json", include={*schema.plain_fields, *obj.__class__.model_computed_fields})
+    for field, is_list in schema.references:
+        ref = getattr(obj, field)
+        if is_list:
+            content[field] = [str(get_id(r)) for r in ref] if ref is not None else None
+        else:
+            content[field] = str(get_id(ref)) if ref is not None else None
+    return content
+
+
+def save_ndjson(feed: ColanderFeed, fp: IO):
+    """Writes a feed as JSON Lines, one record per line.
+
+    The first record is the header, holding the fields of the feed itself, followed by a record per case,
+    entity and relation, in this order. Each record is a JSON object with the ``collection`` of the object and
+    the ``object`` itself, its references being replaced by IDs. Objects are dumped one at a time, the feed is
+    never dumped as a whole.
+
+    Args:
+        feed: The feed to write.
+        fp: The file to write to, opened in text or binary mode. See :py:func:`open_feed_file` to compress it.
+
+    Example:
+        >>> import io
+        >>> from colander_data_converter.base.models import Observable
+        >>> from colander_data_converter.base.types.observable import ObservableTypes
+        >>> feed = ColanderFeed(name="Example")
+        >>> feed.add(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value))
+        >>> fp = io.StringIO()
+        >>> save_ndjson(feed, fp)
+        >>> [json.loads(line)["collection"] for line in fp.getvalue().splitlines()]
+        ['feed', 'entities']
+    """
+    binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase))
+
+    def write(collection: str, content: Dict[str, Any]):
+        line = json.dumps({"collection": collection, "object": content}, separators=(",", ":")) + "\n"
+        fp.write(line.encode() if binary else line)
+
+    write(NDJSON_HEADER, feed.model_dump(mode="json", exclude=set(FEED_COLLECTIONS)))
+    # Cases and entities go first so that the references of the next objects can be resolved when streaming
+    for collection in ("cases", "entities", "relations"):
+        for obj in (getattr(feed, collection) or {}).values():
+            write(collection, unlinked_dump(obj))
+
+
+def iter_raw_ndjson(fp: IO) -> Iterator[Tuple[str, Optional[str], Any]]:
+    """Iterates over the records of a JSON Lines feed file, as :py:func:`iter_raw_feed` does for JSON feeds.
+
+    Blank lines are ignored, so the file can be split on line boundaries and its parts read separately.
+
+    Args:
+        fp: The feed file, opened in text or binary mode.
+
+    Yields:
+        For each object of the entities, relations and cases collections, a tuple
+        (collection, object ID, raw object). For the fields of the header, a tuple
+        (field name, None, value).
+
+    Raises:
+        ValueError: If a record is not valid JSON or does not belong to a known collection.
+    """
+    for line_number, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+        collection = record.get("collection") if isinstance(record, dict) else None
+        raw_object = record.get("object") if isinstance(record, dict) else None
+        if not isinstance(raw_object, dict):
+            raise ValueError(f"Invalid record on line {line_number}")
+        if collection == NDJSON_HEADER:
+            for key, value in raw_object.items():
+                yield key, None, value
+        elif collection in FEED_COLLECTIONS:
+            if not raw_object.get("id"):
+                raise ValueError(f"Missing object ID on line {line_number}")
+            yield collection, raw_object["id"], raw_object
+        else:
+            raise ValueError(f"Unknown collection {collection} on line {line_number}")
+
+
+def iter_ndjson(
+    fp: IO,
+    load_filter: Optional[FeedLoadFilter] = None,
+    resolve_types: bool = True,
+    repository: Optional[ColanderRepository] = None,
+) -> Iterator[Union[Case, EntityTypes, EntityRelation]]:
+    """Reads a JSON Lines feed file and yields its objects as soon as they are validated.
+
+    The file is read one line at a time and the objects are not collected in a feed. References are
+    resolved against the objects read before, so they are resolved for files written by :py:func:`save_ndjson`.
+    Relations of which an end was skipped by the filter before are skipped too.
+
+    Args:
+        fp: The feed file, opened in text or binary mode. See :py:func:`open_feed_file` to decompress it.
+        load_filter: The predicates selecting the objects to yield, everything is yielded if not set.
+        resolve_types: If True, resolves entity types based on the types enum.
+        repository: The repository the objects are registered into, a new one if not set. The objects
+            already read are kept in it, use a bounded repository to stream huge files.
+
+    Yields:
+        The validated entities, relations and cases.
+
+    Example:
+        >>> import io
+        >>> from colander_data_converter.base.models import Observable
+        >>> from colander_data_converter.base.types.observable import ObservableTypes
+        >>> feed = ColanderFeed()
+        >>> feed.add(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value))
+        >>> fp = io.BytesIO()
+        >>> save_ndjson(feed, fp)
+        >>> _ = fp.seek(0)
+        >>> [obj.name for obj in iter_ndjson(fp)]
+        ['1.1.1.1']
+    """
+    repository = repository or ColanderRepository()
+    for _, obj in _validate_records(
+        iter_raw_ndjson(fp), load_filter or FeedLoadFilter(), resolve_types, repository, {}, set()
+    ):
+        obj.resolve_references(repository=repository)
+        yield obj
+
+
+def load_ndjson(fp: IO, load_filter: Optional[FeedLoadFilter] = None, resolve_types: bool = True) -> ColanderFeed:
+    """Loads a JSON Lines feed file incrementally, validating one object at a time.
+
+    Args:
+        fp: The feed file, opened in text or binary mode. See :py:func:`open_feed_file` to decompress it.
+        load_filter: The predicates selecting the objects to load, everything is loaded if not set.
+        resolve_types: If True, resolves entity types based on the types enum. Mandatory to find similar entities.
+
+    Returns:
+        The loaded feed.
+
+    Raises:
+        ValueError: If a record is invalid, if there are inconsistencies in object IDs or an unsupported
+            entity super type.
+    """
+    return _load_records(iter_raw_ndjson(fp), load_filter, resolve_types)
@@ -3,7 +3,7 @@ import enum
 
 from pydantic import field_validator
 
-from .base import CommonEntityType, load_entity_supported_types
+from .base import CommonEntityType, get_supported_type_names
 
 __all__ = ["ActorType", "ActorTypes"]
 
@@ -21,7 +21,7 @@ class ActorType(CommonEntityType):
     @field_validator("short_name", mode="before")
     @classmethod
     def is_supported_type(cls, short_name: str):
-        if short_name not in {t["short_name"] for t in load_entity_supported_types("actor")}:
+        if short_name not in get_supported_type_names("actor"):
             raise ValueError(f"{short_name} is not supported")
         return short_name
 
@@ -168,8 +168,8 @@ class ActorTypes(enum.Enum):
     @classmethod
     def by_short_name(cls, short_name: str):
         sn = short_name.replace(" ", "_").upper()
-        if sn in cls._member_names_:
-            return cls[sn].value
+        if sn in cls._member_map_:
+            return cls._member_map_[sn].value
         return cls.default.value
 
     @classmethod
@@ -1,7 +1,7 @@
 import abc
 import json
 from importlib import resources
-from typing import List, Dict, Optional, Any, TypeVar
+from typing import List, Dict, FrozenSet, Optional, Any, TypeVar
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -21,6 +21,30 @@ def load_entity_supported_types(name: str) -> List[Dict]:
         return json.load(f)
 
 
+_SUPPORTED_TYPE_NAMES: Dict[str, FrozenSet[str]] = {}
+
+
+def get_supported_type_names(name: str) -> FrozenSet[str]:
+    """Returns the short names of the supported types of an entity super type.
+
+    The types definition file is only read on the first call, the following calls are served from memory.
+
+    Args:
+        name: The name of the entity super type (observable, artifact...).
+
+    Returns:
+        The short names of the supported types.
+
+    Example:
+        >>> "IPV4" in get_supported_type_names("observable")
+        True
+    """
+    if (names := _SUPPORTED_TYPE_NAMES.get(name)) is None:
+        names = frozenset(t["short_name"] for t in load_entity_supported_types(name))
+        _SUPPORTED_TYPE_NAMES[name] = names
+    return names
+
+
 EntityType_T = TypeVar("EntityType_T", bound="CommonEntityType")
 
 
@@ -1,13 +1,13 @@
 # Automatically generated by generate_types.py. Do not edit manually.
 import enum
 import re
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 from pydantic import field_validator, Field
 
-from .base import CommonEntityType, load_entity_supported_types
+from .base import CommonEntityType, get_supported_type_names
 
-__all__ = ["ObservableType", "ObservableTypes"]
+__all__ = ["ObservableType", "ObservableTypes", "ObservableTypeClassifier"]
 
 
 class ObservableType(CommonEntityType):
@@ -35,7 +35,7 @@ class ObservableType(CommonEntityType):
     @field_validator("short_name", mode="before")
     @classmethod
     def is_supported_type(cls, short_name: str):
-        if short_name not in {t["short_name"] for t in load_entity_supported_types("observable")}:
+        if short_name not in get_supported_type_names("observable"):
             raise ValueError(f"{short_name} is not supported")
         return short_name
 
@@ -65,6 +65,154 @@ class ObservableType(CommonEntityType):
             return False
 
 
+class ValueFeatures(NamedTuple):
+    """Cheap features of a value, used to discard observable types before running their regex."""
+
+    starts_with_as: bool
+    starts_with_cve: bool
+    first_is_digit: bool
+    first_is_sign: bool
+    last_is_digit: bool
+    dots: int
+    colons: int
+    has_at: bool
+    has_slash: bool
+    has_scheme: bool
+    length: int
+
+    @classmethod
+    def of(cls, value: str) -> "ValueFeatures":
+        """Computes the features of a value.
+
+        Regexes ending with ``$`` also match before a trailing newline, so it is ignored.
+
+        Args:
+            value: The value to compute the features of.
+
+        Returns:
+            The features of the value. Counts are capped and lengths only kept when relevant, so
+            that values with the same candidate types share the same features.
+        """
+        # Positional arguments, this is called for every classified value
+        if value.endswith("\n"):
+            value = value[:-1]
+        length = len(value)
+        return cls(
+            value[:2].upper() == "AS",
+            value[:4].upper() == "CVE-",
+            value[:1].isdecimal(),
+            value[:1] in ("+", "("),
+            value[-1:].isdecimal(),
+            min(value.count("."), 4),
+            min(value.count(":"), 2),
+            "@" in value,
+            "/" in value,
+            "://" in value,
+            length if length in (17, 32, 40, 64) else (0 if length <= 253 else -1),
+        )
+
+
+class ObservableTypeClassifier:
+    """Suggests observable types from values, for large numbers of values.
+
+    The result is the same as testing the regex of every observable type in order, but each value is
+    first reduced to a few :py:class:`ValueFeatures` that tell which types can possibly match, so only
+    the regexes of these candidate types are run. Candidates are computed once per distinct features.
+
+    Example:
+        >>> classifier = ObservableTypeClassifier(ObservableTypes)
+        >>> classifier.suggest_many(["192.168.1.1", "example.com", "AS1234", "192.168.1.1"])
+        [IPV4, DOMAIN, ASN, IPV4]
+    """
+
+    PREFILTERS: Dict[str, Callable[[ValueFeatures], bool]] = {
+        "ASN": lambda f: f.starts_with_as,
+        "CIDR": lambda f: f.first_is_digit and f.dots == 3 and f.has_slash,
+        "CVE": lambda f: f.starts_with_cve,
+        "DOMAIN": lambda f: f.dots > 0 and f.length >= 0,
+        "EMAIL": lambda f: f.has_at and f.dots > 0,
+        "IPV4": lambda f: f.first_is_digit and f.dots == 3,
+        "IPV6": lambda f: f.colons == 2,
+        "MAC": lambda f: f.length == 17,
+        "MD5": lambda f: f.length == 32,
+        "PHONE": lambda f: (f.first_is_digit or f.first_is_sign) and f.last_is_digit,
+        "SHA1": lambda f: f.length == 40,
+        "SHA256": lambda f: f.length == 64,
+        "URI": lambda f: f.colons > 0,
+        "URL": lambda f: f.has_scheme,
+    }
+    """Necessary conditions for a value to match the regex of an observable type, by short name.
+
+    Types without a prefilter are always candidates.
+    """
+
+    def __init__(self, types: Iterable[enum.Enum]):
+        """Initializes the classifier.
+
+        Args:
+            types: The members of the observable types enum, in the order their regexes are tested.
+        """
+        self._types: List[ObservableType] = [t.value for t in types if t.value._compiled_regex]
+        self._default: ObservableType = ObservableTypes.default.value
+        self._candidates: Dict[ValueFeatures, Tuple[ObservableType, ...]] = {}
+
+    def candidates(self, value: str) -> Tuple[ObservableType, ...]:
+        """Returns the observable types whose regex can possibly match a value, in order.
+
+        Args:
+            value: The value to classify.
+
+        Returns:
+            The candidate observable types.
+        """
+        features = ValueFeatures.of(value)
+        if (candidates := self._candidates.get(features)) is None:
+            candidates = tuple(
+                t
+                for t in self._types
+                if (prefilter := self.PREFILTERS.get(t.short_name)) is None or prefilter(features)
+            )
+            self._candidates[features] = candidates
+        return candidates
+
+    def suggest(self, value: str) -> ObservableType:
+        """Suggests the observable type of a value.
+
+        Args:
+            value: The value to classify.
+
+        Returns:
+            The first observable type whose regex matches the value, or the default type.
+        """
+        for observable_type in self.candidates(value):
+            if observable_type._compiled_regex.match(value):  # type: ignore[union-attr]
+                return observable_type
+        return self._default
+
+    def suggest_many(self, values: Iterable[str], memoize: bool = True) -> List[ObservableType]:
+        """Suggests the observable types of many values.
+
+        Args:
+            values: The values to classify.
+            memoize: If True, the types of repeated values are only computed once.
+
+        Returns:
+            The suggested observable types, in the order of the values.
+        """
+        if not memoize:
+            return [self.suggest(value) for value in values]
+        suggested: Dict[str, ObservableType] = {}
+        result = []
+        for value in values:
+            if (observable_type := suggested.get(value)) is None:
+                observable_type = suggested[value] = self.suggest(value)
+            result.append(observable_type)
+        return result
+
+
+_classifier: Optional[ObservableTypeClassifier] = None
+
+
 class ObservableTypes(enum.Enum):
     """ObservableTypes provides access to all supported observable types.
 
@@ -452,7 +600,7 @@ class ObservableTypes(enum.Enum):
             "default_attributes": {"prefix": "", "country_code": "", "country_name": ""},
             "icon": "",
             "nf_icon": "nf-fa-phone",
-            "regex": "^(\\+\\d{1,3}[-.\\s]?)?(\\(?\\d{1,4}\\)?[-.\\s]?)*\\d{1,4}$",
+            "regex": "^(\\+\\d{1,3}[-.\\s]?)?\\(?\\d++(?:(?:\\)[-.\\s]?\\(?|[-.\\s]\\(?|\\()\\d++)*+(?<!\\(\\d)$",
             "value_example": "+1 202-555-0143",
         }
     )
@@ -584,8 +732,8 @@ class ObservableTypes(enum.Enum):
     @classmethod
     def by_short_name(cls, short_name: str) -> ObservableType:
         sn = short_name.replace(" ", "_").upper()
-        if sn in cls._member_names_:
-            return cls[sn].value
+        if sn in cls._member_map_:
+            return cls._member_map_[sn].value
         return cls.default.value
 
     @classmethod
@@ -611,7 +759,36 @@ class ObservableTypes(enum.Enum):
             >>> ObservableTypes.suggest("example.com")
             DOMAIN
         """
-        for _observable_type in cls:
-            if _observable_type.value.match_regex(observable_value):
-                return _observable_type.value
-        return cls.default.value
+        return cls.classifier().suggest(observable_value)
+
+    @classmethod
+    def suggest_many(cls, observable_values: Iterable[str], memoize: bool = True) -> List[ObservableType]:
+        """Suggest the observable types of many values at once.
+
+        The result is the same as calling :py:meth:`suggest` on each value, but the types of repeated
+        values are only computed once.
+
+        Args:
+            observable_values: The observable values to analyze.
+            memoize: If True, the types of repeated values are only computed once.
+
+        Returns:
+            List[ObservableType]: The suggested observable types, in the order of the values.
+
+        Example:
+            >>> ObservableTypes.suggest_many(["192.168.1.1", "example.com", "not an IOC!"])
+            [IPV4, DOMAIN, GENERIC]
+        """
+        return cls.classifier().suggest_many(observable_values, memoize=memoize)
+
+    @classmethod
+    def classifier(cls) -> ObservableTypeClassifier:
+        """Returns the classifier used to suggest observable types, creating it on first use.
+
+        Returns:
+            ObservableTypeClassifier: The shared classifier.
+        """
+        global _classifier
+        if _classifier is None:
+            _classifier = ObservableTypeClassifier(cls)
+        return _classifier
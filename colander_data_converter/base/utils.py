@@ -1,9 +1,9 @@
 import enum
-from typing import get_args, List, Any, Optional, Dict
+from typing import List, Any, Optional, Dict
 
 from pydantic import BaseModel, UUID4
 
-from colander_data_converter.base.common import ObjectReference
+from colander_data_converter.base.common import ObjectReference, ReferenceFieldsSchema
 from colander_data_converter.base.models import ColanderFeed, Entity, EntityRelation
 
 
@@ -119,10 +119,10 @@ class BaseModelMerger:
             field_processed = True
         elif field_name in destination.__class__.model_fields:
             field_info = destination.__class__.model_fields[field_name]
-            annotation_args = get_args(field_info.annotation) or []  # type: ignore[var-annotated]
+            schema = ReferenceFieldsSchema.of(destination.__class__)
+            annotation_args = schema.annotation_args[field_name]
             if (
-                ObjectReference not in annotation_args
-                and List[ObjectReference] not in annotation_args
+                not schema.is_reference(field_name)
                 and not field_info.frozen
                 and (not getattr(destination, field_name, None) or self.strategy == MergingStrategy.OVERWRITE)
                 and (source_field_value_type is field_info.annotation or source_field_value_type in annotation_args)
@@ -156,9 +156,10 @@ class BaseModelMerger:
             destination.attributes = {}
 
         # Merge model fields
-        for field_name, field_info in source.__class__.model_fields.items():
+        schema = ReferenceFieldsSchema.of(source.__class__)
+        for field_name in source.__class__.model_fields:
             source_field_value = getattr(source, field_name, None)
-            if ObjectReference in get_args(field_info.annotation):
+            if field_name in schema.single_references:
                 unprocessed_fields.append(field_name)
             elif not self.merge_field(destination, field_name, source_field_value, ignored_fields):
                 unprocessed_fields.append(field_name)
@@ -209,15 +210,16 @@ class FeedMerger:
         for _, source_entity in self.source_feed.entities.items():
             destination_candidates = self.destination_feed.get_entities_similar_to(source_entity)
             # Multiple or no candidates found or multiple immutable relations, add to the destination feed
-            if len(destination_candidates) != 1 or len(source_entity.get_immutable_relations()) > 0:
-                self.destination_feed.entities[str(source_entity.id)] = source_entity
+            has_immutable_relations = next(source_entity.iter_immutable_relations(), None) is not None
+            if len(destination_candidates) != 1 or has_immutable_relations:
+                self.destination_feed.entities[source_entity.id] = source_entity
                 self.id_rewrite[source_entity.id] = source_entity.id
                 self.added_entities.append(source_entity)
             else:
                 # Only one candidate found
                 _, destination_candidate = destination_candidates.popitem()
                 # Candidate has no immutable relations, merge
-                if len(source_entity.get_immutable_relations()) == 0:
+                if not has_immutable_relations:
                     model_merger.merge(source_entity, destination_candidate)
                     destination_candidate.touch()
                     self.id_rewrite[source_entity.id] = destination_candidate.id
@@ -226,48 +228,50 @@ class FeedMerger:
                     self.merging_candidates[source_entity] = destination_candidate
 
         for destination_entity in self.destination_feed.entities.values():
-            for _, immutable_relation in destination_entity.get_immutable_relations().items():
+            for immutable_relation in list(destination_entity.iter_immutable_relations()):
                 # The relation destination entity is missing: add it to the destination feed
                 if (
                     immutable_relation.obj_to not in self.merged_entities
                     and immutable_relation.obj_to not in self.added_entities
                 ):
-                    self.destination_feed.entities[str(immutable_relation.obj_to.id)] = immutable_relation.obj_to
+                    self.destination_feed.entities[immutable_relation.obj_to.id] = immutable_relation.obj_to
                     self.added_entities.append(immutable_relation.obj_to)
                 # The relation obj_to has been merged: update the reference
                 elif immutable_relation.obj_to in self.merged_entities:
                     original_obj_to = immutable_relation.obj_to
                     merged_obj_to = self.merged_entities[original_obj_to]
-                    object_reference = getattr(destination_entity, immutable_relation.name)
+                    object_reference = getattr(destination_entity, immutable_relation.field_name)
                     if not object_reference:
                         continue
                     if isinstance(object_reference, list):
                         object_reference.remove(original_obj_to)
                         object_reference.append(merged_obj_to)
                     else:
-                        setattr(destination_entity, immutable_relation.name, merged_obj_to)
+                        setattr(destination_entity, immutable_relation.field_name, merged_obj_to)
 
         for _, source_relation in self.source_feed.relations.items():
             obj_from: Entity = self.merged_entities.get(source_relation.obj_from, source_relation.obj_from)
             obj_to: Entity = self.merged_entities.get(source_relation.obj_to, source_relation.obj_to)
             relation_exists = False
-            for _, relation in self.destination_feed.get_outgoing_relations(obj_from, exclude_immutables=True).items():
+            for _, relation in self.destination_feed.get_outgoing_relations(
+                obj_from, exclude_immutables=True, name=source_relation.name
+            ).items():
                 if relation.obj_to == obj_to and relation.name == source_relation.name:
                     relation_exists = True
             if not relation_exists:
-                self.destination_feed.relations[str(source_relation.id)] = EntityRelation(
+                self.destination_feed.relations[source_relation.id] = EntityRelation(
                     id=source_relation.id,
                     name=source_relation.name,
                     obj_from=obj_from,
                     obj_to=obj_to,
                 )
 
-        unlinked_relations: List[str] = []
+        unlinked_relations: List[UUID4] = []
         for _, relation in self.destination_feed.relations.items():
             obj_from = relation.obj_from
             obj_to = relation.obj_to
             if not self.destination_feed.contains(obj_from) or not self.destination_feed.contains(obj_to):
-                unlinked_relations.append(str(relation.id))
+                unlinked_relations.append(relation.id)
 
         if delete_unlinked:
             for relation_id in unlinked_relations:
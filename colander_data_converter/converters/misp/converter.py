@@ -25,7 +25,6 @@ class MISPMapper:
 
     def __init__(self):
         self.mapping = Mapping()
-        ColanderRepository().clear()
 
     @staticmethod
     def tlp_level_to_tag(tlp_level: TlpPapLevel) -> MISPTag:
@@ -170,7 +169,7 @@ class ColanderToMISPMapper(MISPMapper):
         """
         super_type = colander_object.super_type
         # Create relationships based on immutable relations
-        for _, relation in colander_object.get_immutable_relations().items():
+        for relation in colander_object.iter_immutable_relations():
             reference_name = relation.name
             relation_mapping = self.mapping.get_relation_mapping_to_misp(super_type, reference_name)
 
@@ -288,28 +287,33 @@ class MISPToColanderMapper(MISPMapper):
         Returns:
             The resulting Case and Feed.
         """
+        # The conversion state is bound to the current context (thread or asyncio task) until it finishes
+        with ColanderRepository().activate():
+            return self._convert_misp_event(event)
+
+    def _convert_misp_event(self, event: MISPEvent) -> Tuple[Case, ColanderFeed]:
         case = Case(id=event.uuid, name=event.info, description=f"Loaded from MISP event [{event.uuid}]")
-        feed = ColanderFeed(cases={f"{case.id}": case})
+        feed = ColanderFeed(cases={case.id: case})
         for entity in self.convert_objects(event):
             entity.case = case
-            feed.entities[str(entity.id)] = entity
+            feed.entities[entity.id] = entity
         for entity in self.convert_attributes(event):
             entity.case = case
-            feed.entities[str(entity.id)] = entity
+            feed.entities[entity.id] = entity
         for relation in self.convert_relations(event):
             relation.case = case
-            feed.relations[str(relation.id)] = relation
+            feed.relations[relation.id] = relation
         return case, feed
 
     def convert_relations(self, event: MISPEvent) -> List[EntityRelation]:
         relations = []
         for misp_object in event.objects + event.attributes:
-            source_object = ColanderRepository() >> misp_object.uuid
+            source_object = ColanderRepository.current() >> misp_object.uuid
             if not isinstance(source_object, Entity):
                 continue
             for misp_relation in misp_object.relationships or []:
                 relation_name = misp_relation.relationship_type
-                target_object = ColanderRepository() >> misp_relation.related_object_uuid
+                target_object = ColanderRepository.current() >> misp_relation.related_object_uuid
                 if not isinstance(target_object, Entity):
                     continue
                 if relation_name:
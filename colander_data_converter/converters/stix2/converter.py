@@ -50,7 +50,6 @@ class Stix2Mapper:
         Initialize the mapper.
         """
         self.mapping_loader = Stix2MappingLoader()
-        ColanderRepository().clear()
 
 
 class Stix2ToColanderMapper(Stix2Mapper):
@@ -68,8 +67,11 @@ class Stix2ToColanderMapper(Stix2Mapper):
         Returns:
             ColanderFeed: The converted Colander data.
         """
-        repository = ColanderRepository()
+        # The conversion state is bound to the current context (thread or asyncio task) until it finishes
+        with ColanderRepository().activate() as repository:
+            return self._convert(stix2_data, repository)
 
+    def _convert(self, stix2_data: Dict[str, Any], repository: ColanderRepository) -> ColanderFeed:
         # Keep track of processed STIX2 object IDs to handle duplicates
         processed_ids: Dict[str, str] = {}
 
@@ -122,8 +124,8 @@ class Stix2ToColanderMapper(Stix2Mapper):
         relation_name = name.replace("_refs", "").replace("_ref", "").replace("_", " ")
         source_object_id = extract_uuid_from_stix2_id(source_id)
         target_object_id = extract_uuid_from_stix2_id(target_id)
-        source = ColanderRepository() >> source_object_id
-        target = ColanderRepository() >> target_object_id
+        source = ColanderRepository.current() >> source_object_id
+        target = ColanderRepository.current() >> target_object_id
         if not source or not target:
             return None
         relation = EntityRelation(
@@ -131,7 +133,7 @@ class Stix2ToColanderMapper(Stix2Mapper):
             obj_from=source,
             obj_to=target,
         )
-        ColanderRepository() << relation
+        ColanderRepository.current() << relation
         return relation
 
     def convert_stix2_object(
@@ -396,6 +398,11 @@ class ColanderToStix2Mapper(Stix2Mapper):
     """
 
     def convert(self, colander_feed: ColanderFeed) -> Stix2Bundle:
+        # The conversion state is bound to the current context (thread or asyncio task) until it finishes
+        with Stix2Repository().activate():
+            return self._convert(colander_feed)
+
+    def _convert(self, colander_feed: ColanderFeed) -> Stix2Bundle:
         stix2_data = {
             "type": "bundle",
             "id": f"bundle--{colander_feed.id or uuid4()}",
@@ -416,15 +423,16 @@ class ColanderToStix2Mapper(Stix2Mapper):
         bundle = Stix2Bundle(**stix2_data)
 
         # Extract and convert immutable relations
+        field_relationship_mapping = self.mapping_loader.get_field_relationship_mapping()
         for _, entity in colander_feed.entities.items():
             if not issubclass(entity.__class__, Entity):
                 continue
             if entity.super_type.short_name.lower() not in self.mapping_loader.get_supported_colander_types():
                 continue
-            for _, relation in entity.get_immutable_relations(
-                mapping=self.mapping_loader.get_field_relationship_mapping(), default_name="related-to"
-            ).items():
-                stix2_object = self.convert_colander_relation(relation)
+            for immutable_relation in entity.iter_immutable_relations(
+                mapping=field_relationship_mapping, default_name="related-to"
+            ):
+                stix2_object = self.convert_colander_relation(immutable_relation.to_relation())
                 if stix2_object:
                     bundle.objects.append(Relationship(**stix2_object))
 
@@ -603,7 +611,7 @@ class ColanderToStix2Mapper(Stix2Mapper):
         target_prefix = self.mapping_loader.get_stix2_type_for_entity(relation.obj_to) or "unknown"
         source_ref = f"{source_prefix}--{relation.obj_from.id}"
         target_ref = f"{target_prefix}--{relation.obj_to.id}"
-        repository = Stix2Repository()
+        repository = Stix2Repository.current()
         source = repository >> source_ref
         target = repository >> target_ref
 
@@ -4,19 +4,20 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field, ConfigDict
 
-from colander_data_converter.base.common import Singleton, LRUDict
+from colander_data_converter.base.common import ContextBound
 
 # Avoid circular imports
 if TYPE_CHECKING:
     pass
 
 
-class Stix2Repository(object, metaclass=Singleton):
+class Stix2Repository(ContextBound):
     """
-    Singleton repository for managing and storing STIX2 objects.
+    Repository for managing and storing STIX2 objects.
 
-    This class provides centralized storage and reference management for all STIX2 objects,
-    supporting conversion to and from Colander data.
+    This class provides storage and reference management for STIX2 objects, supporting conversion
+    to and from Colander data. The repository returned by ``Stix2Repository.current()`` is bound to
+    the current context, conversions activate their own with ``activate()`` while they run.
     """
 
     stix2_objects: Dict[str, "Stix2ObjectTypes"]
@@ -25,7 +26,7 @@ class Stix2Repository(object, metaclass=Singleton):
         """
         Initializes the repository with an empty dictionary for STIX2 objects.
         """
-        self.stix2_objects = LRUDict()
+        self.stix2_objects = {}
 
     def __lshift__(self, stix2_object: "Stix2ObjectTypes") -> None:
         """
@@ -89,7 +90,7 @@ class Stix2ObjectBase(BaseModel):
         Args:
             __context (Any): Additional context provided for post-initialization handling.
         """
-        _ = Stix2Repository()
+        _ = Stix2Repository.current()
         _ << self
 
     @classmethod
@@ -183,7 +184,11 @@ class Stix2Bundle(BaseModel):
 
     @staticmethod
     def load(raw_object: dict) -> "Stix2Bundle":
-        Stix2Repository().clear()
+        with Stix2Repository().activate():
+            return Stix2Bundle._load(raw_object)
+
+    @staticmethod
+    def _load(raw_object: dict) -> "Stix2Bundle":
         supported_types = Stix2ObjectBase.get_supported_types()
         objects_to_process = []
 
@@ -1,10 +1,10 @@
 from datetime import datetime, UTC
-from typing import Union, List, get_args, cast, Optional
+from typing import Union, List, cast, Optional
 from uuid import uuid4, UUID
 
 from pydantic import UUID4
 
-from colander_data_converter.base.common import ObjectReference
+from colander_data_converter.base.common import ReferenceFieldsSchema
 from colander_data_converter.base.models import (
     ColanderFeed,
     EntityTypes,
@@ -22,6 +22,7 @@ from colander_data_converter.base.utils import BaseModelMerger
 from colander_data_converter.converters.threatr.mapping import ThreatrMapper
 from colander_data_converter.converters.threatr.models import (
     ThreatrFeed,
+    ThreatrRepository,
     Entity as ThreatrEntity,
     Event as ThreatrEvent,
     EntityRelation as ThreatrEntityRelation,
@@ -94,6 +95,11 @@ class ColanderToThreatrMapper(ThreatrMapper):
             The root entity must exist in the provided Colander feed. If a string ID
             is provided, it must be a valid UUID format.
         """
+        # The conversion state is bound to the current context (thread or asyncio task) until it finishes
+        with ThreatrRepository().activate():
+            return self._convert(colander_feed, root_entity)
+
+    def _convert(self, colander_feed: ColanderFeed, root_entity: Union[str, UUID4, EntityTypes]) -> ThreatrFeed:
         # Get the root entity object if an ID was provided
         root_entity_obj = None
         if isinstance(root_entity, str):
@@ -102,7 +108,7 @@ class ColanderToThreatrMapper(ThreatrMapper):
             except Exception:
                 raise ValueError(f"Invalid UUID {root_entity}")
         if isinstance(root_entity, UUID):
-            root_entity_obj = colander_feed.entities.get(str(root_entity))
+            root_entity_obj = colander_feed.entities.get(root_entity)
             if not root_entity_obj:
                 raise ValueError(f"Root entity with ID {root_entity} not found in feed")
         else:
@@ -116,7 +122,7 @@ class ColanderToThreatrMapper(ThreatrMapper):
         threatr_entities = [threatr_root_entity]
         for entity_id, entity in colander_feed.entities.items():
             # Skip the root entity as it's already included
-            if str(entity.id) == str(root_entity_obj.id):
+            if entity.id == root_entity_obj.id:
                 continue
             threatr_entity = self.convert_entity(entity)
             if isinstance(threatr_entity, ThreatrEvent):
@@ -228,15 +234,14 @@ class ColanderToThreatrMapper(ThreatrMapper):
         for entity_id, entity in colander_feed.entities.items():
             entity_type_name = type(entity).__name__.lower()
 
-            for field_name, field_info in entity.__class__.model_fields.items():
-                field_annotation = get_args(field_info.annotation)
+            for field_name, is_list in ReferenceFieldsSchema.of(entity.__class__).references:
                 field_value = getattr(entity, field_name, None)
 
-                if not field_value or not field_annotation:
+                if not field_value:
                     continue
 
                 # Handle single ObjectReference
-                if ObjectReference in field_annotation:
+                if not is_list:
                     relation = self._create_relation_from_reference(
                         entity, field_name, field_value, entity_type_name, colander_feed, is_list=False
                     )
@@ -244,7 +249,7 @@ class ColanderToThreatrMapper(ThreatrMapper):
                         relations.append(relation)
 
                 # Handle List[ObjectReference]
-                elif List[ObjectReference] in field_annotation:
+                else:
                     for object_reference in field_value:
                         relation = self._create_relation_from_reference(
                             entity, field_name, object_reference, entity_type_name, colander_feed, is_list=True
@@ -272,7 +277,7 @@ class ColanderToThreatrMapper(ThreatrMapper):
             A new ThreatrEntityRelation or None if target not found
         """
         target_id = reference_value if isinstance(reference_value, UUID) else reference_value.id
-        target_entity = colander_feed.entities.get(str(target_id))
+        target_entity = colander_feed.entities.get(target_id)
 
         if not target_entity:
             return None
@@ -377,8 +382,8 @@ class ThreatrToColanderMapper(ThreatrMapper):
             threatr_relation.obj_to if isinstance(threatr_relation.obj_to, UUID) else threatr_relation.obj_to.id
         )
 
-        source_entity = ColanderRepository() >> source_entity_id
-        target_entity = ColanderRepository() >> target_entity_id
+        source_entity = ColanderRepository.current() >> source_entity_id
+        target_entity = ColanderRepository.current() >> target_entity_id
 
         # Ensure both source and target entities are valid Colander entities
         if not isinstance(source_entity, ColanderEntity) or not isinstance(target_entity, ColanderEntity):
@@ -415,12 +420,12 @@ class ThreatrToColanderMapper(ThreatrMapper):
         assert relation.obj_from is not None
         assert relation.obj_to is not None
 
-        colander_relation: ColanderEntityRelation = ColanderRepository() >> relation.id
+        colander_relation: ColanderEntityRelation = ColanderRepository.current() >> relation.id
         if isinstance(colander_relation, ColanderEntityRelation):
             return colander_relation
 
-        obj_from = ColanderRepository() >> relation.obj_from.id
-        obj_to = ColanderRepository() >> relation.obj_to.id
+        obj_from = ColanderRepository.current() >> relation.obj_from.id
+        obj_to = ColanderRepository.current() >> relation.obj_to.id
         if obj_from and obj_to:
             colander_relation = ColanderEntityRelation(
                 id=relation.id,
@@ -460,7 +465,7 @@ class ThreatrToColanderMapper(ThreatrMapper):
         assert isinstance(entity, ThreatrEntity)
 
         # The entity has already been processed
-        if (colander_entity := ColanderRepository() >> entity.id) is not None and isinstance(
+        if (colander_entity := ColanderRepository.current() >> entity.id) is not None and isinstance(
             colander_entity, ColanderEntity
         ):
             return colander_entity
@@ -506,7 +511,9 @@ class ThreatrToColanderMapper(ThreatrMapper):
         assert isinstance(event, ThreatrEvent)
 
         # The event has already been processed
-        if (colander_event := ColanderRepository() >> event.id) is not None and isinstance(colander_event, Event):
+        if (colander_event := ColanderRepository.current() >> event.id) is not None and isinstance(
+            colander_event, Event
+        ):
             return colander_event
 
         sub_type = EventTypes.by_short_name(event.type.short_name)
@@ -523,7 +530,7 @@ class ThreatrToColanderMapper(ThreatrMapper):
         )
 
         if (involved_entity := event.involved_entity) is not None:
-            involved_entity = ColanderRepository() >> involved_entity.id
+            involved_entity = ColanderRepository.current() >> involved_entity.id
             if isinstance(involved_entity, Observable):
                 colander_event.involved_observables.append(involved_entity)
 
@@ -549,31 +556,45 @@ class ThreatrToColanderMapper(ThreatrMapper):
             AssertionError: If threatr_feed is None or not a ThreatrFeed instance
 
         Important:
-            The method resolves all references in the input feed before processing
+            The method resolves all references in the input feed against its own objects before processing
             to ensure consistent object relationships.
         """
         assert threatr_feed is not None
         assert isinstance(threatr_feed, ThreatrFeed)
         self.threatr_feed = threatr_feed
-        self.threatr_feed.resolve_references()
+        # The conversion state is bound to the current context (thread or asyncio task) until it finishes
+        with ColanderRepository().activate(), ThreatrRepository().activate() as threatr_repository:
+            # The references of the Threatr feed are resolved against its own objects only
+            for threatr_object in [
+                threatr_feed.root_entity,
+                *(threatr_feed.entities or []),
+                *(threatr_feed.events or []),
+                *(threatr_feed.relations or []),
+            ]:
+                if threatr_object is not None:
+                    threatr_repository << threatr_object
+            threatr_feed.resolve_references()
+            return self._convert(threatr_feed)
+
+    def _convert(self, threatr_feed: ThreatrFeed) -> ColanderFeed:
         self.colander_feed.description = "Feed automatically generated from a Threatr feed."
 
         if (root_entity := threatr_feed.root_entity) is not None:
             if (colander_entity := self._convert_entity(root_entity)) is not None:
-                self.colander_feed.entities[str(root_entity.id)] = colander_entity
+                self.colander_feed.entities[root_entity.id] = colander_entity
 
         for entity in threatr_feed.entities or []:
             if (colander_entity := self._convert_entity(entity)) is not None:
-                self.colander_feed.entities[str(entity.id)] = colander_entity
+                self.colander_feed.entities[entity.id] = colander_entity
 
         for event in threatr_feed.events or []:
             if (colander_event := self._convert_event(event)) is not None:
-                self.colander_feed.entities[str(event.id)] = colander_event
+                self.colander_feed.entities[event.id] = colander_event
 
         for relation in threatr_feed.relations or []:
             if not self._create_immutable_relation(relation):
                 if (colander_relation := self._convert_relation(relation)) is not None:
-                    self.colander_feed.relations[str(relation.id)] = colander_relation
+                    self.colander_feed.relations[relation.id] = colander_relation
 
         return self.colander_feed
 
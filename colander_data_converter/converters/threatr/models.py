@@ -1,5 +1,5 @@
 from datetime import datetime, UTC
-from typing import Optional, Dict, Any, List, Union, get_args
+from typing import Optional, Dict, Any, List, Union
 from uuid import uuid4, UUID
 
 from pydantic import Field, BaseModel, model_validator, ConfigDict
@@ -8,22 +8,22 @@ from pydantic.types import UUID4, PositiveInt
 from colander_data_converter.base.common import (
     TlpPapLevel,
     ObjectReference,
-    Singleton,
-    LRUDict,
+    ContextBound,
+    ReferenceFieldsSchema,
 )
 from colander_data_converter.base.models import CommonEntitySuperType, CommonEntitySuperTypes
 from colander_data_converter.base.types.base import CommonEntityType
 
 
-class ThreatrRepository(object, metaclass=Singleton):
-    """Singleton repository for managing and storing Entity, Event, and EntityRelation objects.
+class ThreatrRepository(ContextBound):
+    """Repository for managing and storing Entity, Event, and EntityRelation objects.
 
-    This class provides centralized storage and reference management for all model instances,
-    supporting insertion, lookup, and reference resolution/unlinking. Uses the Singleton
-    pattern to ensure a single global repository instance.
+    This class provides storage and reference management for model instances, supporting insertion,
+    lookup, and reference resolution/unlinking. The repository returned by ``ThreatrRepository.current()``
+    is bound to the current context, conversions activate their own with ``activate()`` while they run.
 
     Warning:
-        As a singleton, this repository persists for the entire application lifecycle.
+        The current repository persists until another repository is bound to the context.
         Use the ``clear()`` method to reset state when needed.
     """
 
@@ -37,14 +37,10 @@ class ThreatrRepository(object, metaclass=Singleton):
     """Dictionary storing EntityRelation objects by their string ID."""
 
     def __init__(self):
-        """Initializes the repository with empty dictionaries for events, entities, and relations.
-
-        Note:
-            Due to the Singleton pattern, this method is only called once per application run.
-        """
-        self.events = LRUDict()
-        self.entities = LRUDict()
-        self.relations = LRUDict()
+        """Initializes the repository with empty dictionaries for events, entities, and relations."""
+        self.events = {}
+        self.entities = {}
+        self.relations = {}
 
     def clear(self):
         """Clears all stored entities, events, and relations from the repository.
@@ -162,7 +158,7 @@ class ThreatrType(BaseModel):
         Note:
             This method is called automatically by Pydantic after model initialization.
         """
-        _ = ThreatrRepository()
+        _ = ThreatrRepository.current()
         _ << self
 
     def _process_reference_fields(self, operation, strict=False):
@@ -177,19 +173,20 @@ class ThreatrType(BaseModel):
             ValueError: If strict is True and a UUID reference cannot be resolved.
             AttributeError: If the class instance does not have the expected field or attribute.
         """
-        for field, info in self.__class__.model_fields.items():
-            annotation_args = get_args(info.annotation)
-            if ObjectReference in annotation_args:
+        for field, is_list in ReferenceFieldsSchema.of(self.__class__).references:
+            if not is_list:
                 ref = getattr(self, field)
                 if operation == "unlink" and ref and type(ref) is not UUID:
                     setattr(self, field, ref.id)
                 elif operation == "resolve" and type(ref) is UUID:
-                    x = ThreatrRepository() >> ref
+                    x = ThreatrRepository.current() >> ref
                     if strict and isinstance(x, UUID):
                         raise ValueError(f"Unable to resolve UUID reference {x}")
                     setattr(self, field, x)
-            elif List[ObjectReference] in annotation_args:
+            else:
                 refs = getattr(self, field)
+                if not refs:
+                    continue
                 new_refs = []
                 _update = False
                 for ref in refs:
@@ -197,11 +194,13 @@ class ThreatrType(BaseModel):
                         new_refs.append(ref.id)
                         _update = True
                     elif operation == "resolve" and type(ref) is UUID:
-                        x = ThreatrRepository() >> ref
+                        x = ThreatrRepository.current() >> ref
                         if strict and isinstance(x, UUID):
                             raise ValueError(f"Unable to resolve UUID reference {x}")
                         new_refs.append(x)
                         _update = True
+                    else:
+                        new_refs.append(ref)
                 if _update:
                     setattr(self, field, new_refs)
 
@@ -411,9 +410,9 @@ class ThreatrFeed(ThreatrType):
         Important:
             Use ``strict=True`` to ensure all references in the feed are valid and resolvable.
         """
-        ThreatrRepository().clear()
-        feed = ThreatrFeed.model_validate(raw_object)
-        feed.resolve_references(strict=strict)
+        with ThreatrRepository().activate():
+            feed = ThreatrFeed.model_validate(raw_object)
+            feed.resolve_references(strict=strict)
         return feed
 
     def resolve_references(self, strict=False):
@@ -1,9 +1,9 @@
 import csv
-from typing import List, get_args, Dict, Set, TextIO
+from typing import List, Dict, Set, TextIO
 
 from pydantic import BaseModel
 
-from colander_data_converter.base.common import ObjectReference
+from colander_data_converter.base.common import ReferenceFieldsSchema
 from colander_data_converter.base.models import ColanderFeed
 from colander_data_converter.exporters.exporter import BaseExporter
 
@@ -80,12 +80,9 @@ class CsvExporter(BaseExporter):
         candidate_fields = set()
 
         # First pass: collect all potential fields
-        for field, info in self.entity_type.model_fields.items():
+        for field in ReferenceFieldsSchema.of(self.entity_type).plain_fields:
             if field in self.excluded_fields:
                 continue
-            annotation_args = get_args(info.annotation)
-            if ObjectReference in annotation_args or List[ObjectReference] in annotation_args:
-                continue
             candidate_fields.add(field)
 
         # Second pass: exclude fields that are None for all entities
@@ -0,0 +1,27 @@
+import json
+from importlib import resources
+
+import pytest
+
+from colander_data_converter.base.models import ColanderFeed
+
+
+@pytest.fixture
+def feed_file():
+    """Returns a function giving the file of a test feed from its name."""
+
+    def _feed_file(name: str):
+        return resources.files(__package__).joinpath("data").joinpath(name)
+
+    return _feed_file
+
+
+@pytest.fixture
+def load_feed(feed_file):
+    """Returns a function loading a test feed from the name of its file."""
+
+    def _load_feed(name: str) -> ColanderFeed:
+        with feed_file(name).open() as f:
+            return ColanderFeed.load(json.load(f))
+
+    return _load_feed
@@ -105,3 +105,29 @@ class TestArtifact:
         for mimetype in unsupported_mimetypes:
             computed = ArtifactTypes.by_mime_type(mimetype)
             assert computed is ArtifactTypes.GENERIC.value
+
+    def test_mime_type_index_keeps_first_match_order(self):
+        def first_match(mime_type):
+            for artifact_type in ArtifactTypes:
+                if artifact_type.value.match_mime_type(mime_type):
+                    return artifact_type.value
+            return ArtifactTypes.default.value
+
+        mime_types = [
+            " Application/PDF ",
+            "IMAGE/svg+xml",
+            "audio/*",
+            "video/",
+            "videos/mp4",
+            "text/plain; charset=utf-8",
+            "application/octet-stream",
+            "unspecified",
+            None,
+            "",
+        ]
+        for artifact_type in ArtifactTypes:
+            hints = artifact_type.value.type_hints or {}
+            mime_types.extend(hints.get("suggested_by_mime_types", {}).get("types", []))
+        for mime_type in mime_types:
+            assert ArtifactTypes.by_mime_type(mime_type) is first_match(mime_type), mime_type
+        assert ArtifactTypes.by_mime_types(mime_types) == [first_match(mime_type) for mime_type in mime_types]
@@ -1,4 +1,6 @@
 import json
+import pickle
+import threading
 import unittest
 from copy import deepcopy
 from datetime import datetime, UTC
@@ -10,7 +12,9 @@ import pytest
 
 from colander_data_converter.base.common import TlpPapLevel
 from colander_data_converter.base.models import (
+    AudiencePolicy,
     ColanderFeed,
+    ColanderRepository,
     Observable,
     EntityRelation,
     Case,
@@ -173,6 +177,106 @@ class TestFeed:
             feed.unlink_references()
             feed.resolve_references()
 
+    @pytest.mark.parametrize("name", ["colander_feed.json", "colander_feed_alt.json", "colander_feed_full.json"])
+    def test_load_json(self, name):
+        json_file = resources.files(__name__).joinpath("data").joinpath(name)
+        with json_file.open() as f:
+            expected = ColanderFeed.load(json.load(f))
+        feed = ColanderFeed.load_json(json_file.read_bytes())
+        # The feeds have their own generated IDs
+        assert feed.model_dump(exclude={"id"}) == expected.model_dump(exclude={"id"})
+        assert feed.is_fully_resolved() == expected.is_fully_resolved()
+        feed = ColanderFeed.load_json(str(json_file))
+        assert feed.model_dump(exclude={"id"}) == expected.model_dump(exclude={"id"})
+
+    @pytest.mark.parametrize("name", ["colander_feed.json", "colander_feed_full.json", "colander_feed_old.json"])
+    @pytest.mark.parametrize("resolve_types", [True, False])
+    def test_trusted_load(self, name, resolve_types):
+        json_file = resources.files(__name__).joinpath("data").joinpath(name)
+        with json_file.open() as f:
+            raw = json.load(f)
+        expected = ColanderFeed.load(deepcopy(raw), resolve_types=resolve_types)
+        feed = ColanderFeed.load(deepcopy(raw), resolve_types=resolve_types, trusted=True)
+        assert feed.model_dump(exclude={"id"}) == expected.model_dump(exclude={"id"})
+        assert feed.is_fully_resolved() == expected.is_fully_resolved()
+        for entity_id, entity in feed.entities.items():
+            assert type(entity) is type(expected.entities[entity_id])
+            assert (ColanderRepository.current() >> entity_id) == entity_id
+        assert feed.validate() == {}
+
+    def test_trusted_load_deferred_validation(self):
+        raw = {
+            "entities": {
+                "81afaa00-d67c-4805-b66e-53371a6ce7cc": {
+                    "id": "81afaa00-d67c-4805-b66e-53371a6ce7cc",
+                    "name": "event",
+                    "type": {"name": "Hit", "short_name": "HIT"},
+                    "super_type": {"short_name": "event"},
+                    "first_seen": "2025-01-02T00:00:00Z",
+                    "last_seen": "2025-01-01T00:00:00Z",
+                },
+                "81afaa00-d67c-4805-b66e-53371a6ce7cd": {
+                    "id": "81afaa00-d67c-4805-b66e-53371a6ce7cd",
+                    "name": "1.1.1.1",
+                    "type": {"name": "IPv4", "short_name": "IPV4"},
+                    "super_type": {"short_name": "observable"},
+                },
+            },
+        }
+        with pytest.raises(ValueError):
+            ColanderFeed.load(deepcopy(raw))
+        feed = ColanderFeed.load(deepcopy(raw), trusted=True)
+        event = feed.entities["81afaa00-d67c-4805-b66e-53371a6ce7cc"]
+        assert event.first_seen == datetime(2025, 1, 2, tzinfo=UTC)
+        assert event.tlp == TlpPapLevel.WHITE
+        assert list(feed.validate()) == ["81afaa00-d67c-4805-b66e-53371a6ce7cc"]
+        assert len(feed.validate(sample=1)) <= 1
+        event.last_seen = datetime(2025, 1, 3, tzinfo=UTC)
+        assert feed.validate() == {}
+
+    def test_load_json_mismatching_ids(self):
+        raw = {
+            "entities": {
+                "81afaa00-d67c-4805-b66e-53371a6ce7cd": {
+                    "id": "81afaa00-d67c-4805-b66e-53371a6ce7cc",
+                    "name": "obs",
+                    "type": {"name": "IP v4 address", "short_name": "IPV4"},
+                    "super_type": {"short_name": "observable"},
+                }
+            },
+        }
+        with pytest.raises(ValueError):
+            ColanderFeed.load_json(json.dumps(raw).encode())
+
+    @pytest.mark.parametrize("resolve_types", [True, False])
+    def test_load_json_resolves_types_while_validating(self, resolve_types):
+        raw = {
+            "entities": {
+                entity_id: {
+                    "id": entity_id,
+                    "name": "obs",
+                    "type": {"name": "IP v4 address", "short_name": "IPV4"},
+                    "super_type": {"short_name": "observable"},
+                }
+                for entity_id in ["81afaa00-d67c-4805-b66e-53371a6ce7cc", "3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22"]
+            },
+        }
+        feed = ColanderFeed.load_json(json.dumps(raw).encode(), resolve_types=resolve_types)
+        for entity in feed.entities.values():
+            if resolve_types:
+                assert entity.type is ObservableTypes.IPV4.value
+            else:
+                assert entity.type.name == "IP v4 address"
+
+    def test_legacy_relation_fields(self):
+        ot = ObservableTypes.IPV4.value
+        obs1 = Observable(name="1.1.1.1", type=ot)
+        obs2 = Observable(name="8.8.8.8", type=ot)
+        relation = EntityRelation.model_validate({"name": "rel", "obj_from_id": obs1.id, "obj_to_id": str(obs2.id)})
+        assert (relation.obj_from, relation.obj_to) == (obs1.id, obs2.id)
+        relation = EntityRelation.model_validate({"name": "rel", "obj_from": obs1, "obj_to_id": obs2.id})
+        assert (relation.obj_from, relation.obj_to) == (obs1, obs2.id)
+
     def test_load_alt(self):
         resource_package = __name__
         json_file = resources.files(resource_package).joinpath("data").joinpath("colander_feed_alt.json")
@@ -336,6 +440,80 @@ class TestFeed:
         assert str(obs_white.id) in filtered.entities
         assert str(obs_red.id) not in filtered.entities
 
+    def test_filter_cases_excluded_types_and_references(self):
+        ot = ObservableTypes.IPV4.value
+        case_green = Case(name="green", description="case", tlp=TlpPapLevel.GREEN)
+        case_red = Case(name="red", description="case", tlp=TlpPapLevel.RED)
+        obs1 = Observable(name="1.1.1.1", type=ot, case=case_green)
+        obs2 = Observable(name="2.2.2.2", type=ot, case=case_red)
+        threat = Threat(name="threat", type=ThreatTypes.GENERIC.value)
+        rel1 = EntityRelation(name="rel1", obj_from=obs1.id, obj_to=obs2.id)
+        rel2 = EntityRelation(name="rel2", obj_from=obs1.id, obj_to=threat.id)
+        feed = ColanderFeed(
+            entities={str(obs1.id): obs1, str(obs2.id): obs2, str(threat.id): threat},
+            relations={str(rel1.id): rel1, str(rel2.id): rel2},
+            cases={str(case_green.id): case_green, str(case_red.id): case_red},
+        )
+        filtered = feed.filter(maximum_tlp_level=TlpPapLevel.AMBER, exclude_entity_types=[Threat])
+        assert set(filtered.entities) == {obs1.id, obs2.id}
+        assert set(filtered.relations) == {rel1.id}
+        assert set(filtered.cases) == {case_green.id}
+        assert rel1.obj_from is obs1
+        filtered = feed.filter(maximum_tlp_level=TlpPapLevel.AMBER, include_relations=False, include_cases=False)
+        assert len(filtered.entities) == 3
+        assert filtered.relations == {}
+        assert filtered.cases == {}
+
+    def test_filter_many(self):
+        ot = ObservableTypes.IPV4.value
+        case = Case(name="case", description="case")
+        obs_white = Observable(name="1.1.1.1", type=ot, case=case)
+        obs_green = Observable(name="2.2.2.2", type=ot, tlp=TlpPapLevel.GREEN, pap=TlpPapLevel.RED)
+        obs_amber = Observable(name="3.3.3.3", type=ot, tlp=TlpPapLevel.AMBER)
+        threat = Threat(name="threat", type=ThreatTypes.GENERIC.value)
+        rel1 = EntityRelation(name="rel1", obj_from=obs_white, obj_to=obs_green)
+        rel2 = EntityRelation(name="rel2", obj_from=obs_green, obj_to=obs_amber)
+        rel3 = EntityRelation(name="rel3", obj_from=obs_white, obj_to=threat)
+        feed = ColanderFeed(
+            entities={str(e.id): e for e in [obs_white, obs_green, obs_amber, threat]},
+            relations={str(r.id): r for r in [rel1, rel2, rel3]},
+            cases={str(case.id): case},
+        )
+        policies = [
+            AudiencePolicy(name="white", maximum_tlp_level=TlpPapLevel.GREEN),
+            AudiencePolicy(name="green", maximum_tlp_level=TlpPapLevel.AMBER, include_cases=False),
+            AudiencePolicy(name="amber", maximum_tlp_level=TlpPapLevel.RED, exclude_entity_types=[Threat]),
+            AudiencePolicy(name="amber_pap", maximum_tlp_level=TlpPapLevel.RED, maximum_pap_level=TlpPapLevel.AMBER),
+        ]
+        feeds = feed.filter_many(policies)
+        assert list(feeds) == ["white", "green", "amber", "amber_pap"]
+        assert set(feeds["white"].entities) == {obs_white.id, threat.id}
+        assert set(feeds["white"].relations) == {rel3.id}
+        assert set(feeds["white"].cases) == {case.id}
+        assert set(feeds["green"].relations) == {rel1.id, rel3.id}
+        assert feeds["green"].cases == {}
+        assert set(feeds["amber"].relations) == {rel1.id, rel2.id}
+        assert str(obs_green.id) not in feeds["amber_pap"].entities
+        assert set(feeds["amber_pap"].relations) == {rel3.id}
+        # Objects are shared, not copied
+        assert feeds["amber"].entities[str(obs_white.id)] is obs_white
+        assert feeds["amber"].relations[str(rel1.id)] is rel1
+        # Same result as filtering once per audience
+        for policy in policies[:3]:
+            filtered = feed.filter(
+                maximum_tlp_level=policy.maximum_tlp_level,
+                include_cases=policy.include_cases,
+                exclude_entity_types=policy.exclude_entity_types,
+            )
+            assert filtered.entities.keys() == feeds[policy.name].entities.keys()
+            assert filtered.relations.keys() == feeds[policy.name].relations.keys()
+            assert filtered.cases.keys() == feeds[policy.name].cases.keys()
+
+    def test_filter_many_requires_distinct_names(self):
+        policy = AudiencePolicy(name="white", maximum_tlp_level=TlpPapLevel.GREEN)
+        with pytest.raises(AssertionError):
+            ColanderFeed().filter_many([policy, policy])
+
 
 class TestFeedMerger(unittest.TestCase):
     def setUp(self):
@@ -410,6 +588,73 @@ class TestFeedMerger(unittest.TestCase):
         similar_entities = self.feed.get_entities_similar_to(invalid_entity)
         self.assertEqual(len(similar_entities), 0)
 
+    def test_similarity_index_follows_changes(self):
+        # Changing a similarity field updates the index
+        self.artifact2.sha256 = "changed"
+        self.assertEqual(len(self.feed.get_entities_similar_to(self.artifact1)), 0)
+        self.artifact3.sha256 = self.artifact1.sha256
+        self.artifact3.name = self.artifact1.name
+        similar_entities = self.feed.get_entities_similar_to(self.artifact1)
+        self.assertEqual(list(similar_entities), [self.artifact3.id])
+        self.event3.last_seen = self.event1.last_seen
+        self.assertEqual(len(self.feed.get_entities_similar_to(self.event1)), 2)
+        # Removed entities are no longer found
+        self.feed.entities.pop(str(self.event2.id))
+        self.assertEqual(list(self.feed.get_entities_similar_to(self.event1)), [self.event3.id])
+
+    def test_similarity_index_of_reassigned_entities(self):
+        self.feed.entities = {str(self.event2.id): self.event2}
+        self.assertEqual(list(self.feed.get_entities_similar_to(self.event1)), [self.event2.id])
+        copied = deepcopy(self.feed)
+        self.assertEqual(len(copied.get_entities_similar_to(self.event1)), 1)
+
+    def test_similarity_index_of_several_feeds(self):
+        artifact = self.artifact2
+        other_feed = ColanderFeed(entities={str(artifact.id): artifact})
+        self.assertEqual(list(other_feed.get_entities_similar_to(self.artifact1)), [artifact.id])
+        self.assertEqual(list(self.feed.get_entities_similar_to(self.artifact1)), [artifact.id])
+        artifact.sha256 = "changed"
+        # Both feeds holding the entity follow the change
+        self.assertEqual(list(other_feed.get_entities_similar_to(artifact)), [artifact.id])
+        self.assertEqual(list(self.feed.get_entities_similar_to(artifact)), [artifact.id])
+        other_feed.entities.pop(str(artifact.id))
+        artifact.sha256 = "changed again"
+        self.assertEqual(len(other_feed.get_entities_similar_to(artifact)), 0)
+        self.assertEqual(list(self.feed.get_entities_similar_to(artifact)), [artifact.id])
+        # Copies do not belong to the feeds of the original entity
+        copied = pickle.loads(pickle.dumps(artifact))
+        copied.sha256 = "copied"
+        self.assertEqual(list(self.feed.get_entities_similar_to(artifact)), [artifact.id])
+        self.assertEqual(copied, artifact.model_copy(update={"sha256": "copied"}))
+
+    def test_similarity_index_with_concurrent_feeds(self):
+        obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        feed = ColanderFeed(entities={str(obs.id): obs})
+        feed.get_entities_similar_to(obs)
+        errors = []
+
+        def create_feeds():
+            try:
+                for _ in range(2000):
+                    ColanderFeed(entities={str(obs.id): obs}).get_entities_similar_to(obs)
+            except Exception as e:
+                errors.append(e)
+
+        def rename():
+            try:
+                for i in range(2000):
+                    obs.name = f"10.0.0.{i % 256}"
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=target) for target in (create_feeds, rename) * 3]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(list(feed.get_entities_similar_to(obs)), [obs.id])
+
     def test_merge_with_itself(self):
         source_feed = deepcopy(self.feed)
         destination_feed = deepcopy(self.feed)
@@ -677,3 +922,71 @@ class TestFeedMergerExtended(unittest.TestCase):
         # Feeds properly merged
         merger.merge(aggressive=True, delete_unlinked=True)
         self.assertEqual(len(destination_feed.entities), 7)
+
+
+class TestFeedDiff:
+    @staticmethod
+    def _load_feeds():
+        json_file = resources.files("tests.base").joinpath("data").joinpath("colander_feed_full.json")
+        with json_file.open() as f:
+            raw = json.load(f)
+        return ColanderFeed.load(deepcopy(raw)), ColanderFeed.load(deepcopy(raw))
+
+    def test_fingerprint_is_memoized_until_changed(self):
+        obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        fingerprint = obs.fingerprint()
+        assert obs.fingerprint() is fingerprint
+        assert obs.model_copy().fingerprint() == fingerprint
+        assert obs.model_copy(update={"name": "8.8.8.8"}).fingerprint() != fingerprint
+        obs.touch()
+        assert obs.fingerprint() != fingerprint
+        assert obs.fingerprint(ignore_updated_at=True) == obs.model_copy().fingerprint(ignore_updated_at=True)
+
+    def test_fingerprint_hashes_references_by_id(self):
+        obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        threat = Threat(name="Stalkerware", type=ThreatTypes.STALKERWARE.value)
+        obs.associated_threat = threat
+        fingerprint = obs.fingerprint()
+        threat.name = "Spyware"
+        obs.unlink_references()
+        assert obs.fingerprint() == fingerprint
+        assert obs == obs.model_copy()
+
+    def test_identical_feeds(self):
+        old, new = self._load_feeds()
+        assert old.diff(new).is_empty()
+
+    def test_diff_and_apply(self):
+        old, new = self._load_feeds()
+        removed_id, modified_id = list(new.entities)[:2]
+        removed_relations = set(new.get_relations(new.entities[removed_id]))
+        for relation_id in removed_relations:
+            del new.relations[relation_id]
+        del new.entities[removed_id]
+        new.entities[modified_id].name = "renamed"
+        obs = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        relation = EntityRelation(name="resolves", obj_from=obs, obj_to=new.entities[modified_id])
+        new.add(obs)
+        new.add(relation)
+
+        changeset = old.diff(new)
+        assert changeset.added == {obs.id, relation.id}
+        assert changeset.removed == {removed_id} | removed_relations
+        assert changeset.modified == {modified_id}
+
+        modified = old.entities[modified_id]
+        old.apply_changeset(changeset)
+        assert old.diff(new).is_empty()
+        assert old.model_dump(exclude={"id"}) == new.model_dump(exclude={"id"})
+        assert old.entities[modified_id] is modified
+        assert modified.name == "renamed"
+        assert old.relations[relation.id] is not relation
+        assert old.relations[relation.id].obj_to is modified
+        assert old.relations[relation.id].obj_from is old.entities[obs.id]
+
+    def test_ignore_updated_at(self):
+        old, new = self._load_feeds()
+        entity = next(iter(new.entities.values()))
+        entity.updated_at = datetime(2000, 1, 1, tzinfo=UTC)
+        assert old.diff(new).modified == {entity.id}
+        assert old.diff(new, ignore_updated_at=True).is_empty()
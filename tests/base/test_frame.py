@@ -0,0 +1,110 @@
+import json
+from copy import deepcopy
+from datetime import datetime, UTC
+from importlib import resources
+
+import pytest
+
+from colander_data_converter.base import frame as frame_module
+from colander_data_converter.base.common import TlpPapLevel
+from colander_data_converter.base.frame import ColanderFrame
+from colander_data_converter.base.models import (
+    Case,
+    ColanderFeed,
+    EntityRelation,
+    Observable,
+    Threat,
+)
+from colander_data_converter.base.types.observable import ObservableTypes
+from colander_data_converter.base.types.threat import ThreatTypes
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(frame_module, "np", None)
+    return request.param
+
+
+def _build_feed():
+    feed = ColanderFeed()
+    threat = Threat(name="Stalkerware", type=ThreatTypes.STALKERWARE.value, tlp=TlpPapLevel.AMBER)
+    feed.add(threat)
+    for i in range(10):
+        obs = Observable(
+            name=f"10.0.0.{i}",
+            type=ObservableTypes.IPV4.value,
+            tlp=TlpPapLevel.GREEN if i % 2 else TlpPapLevel.RED,
+            updated_at=datetime(2025, 1, i + 1, tzinfo=UTC),
+            associated_threat=threat if i < 3 else None,
+        )
+        feed.add(obs)
+        domain = Observable(name=f"host-{i}.example.com", type=ObservableTypes.DOMAIN.value, description="host")
+        feed.add(domain)
+        feed.add(EntityRelation(name="resolves", obj_from=domain, obj_to=obs))
+    return feed
+
+
+class TestColanderFrame:
+    @pytest.mark.parametrize("name", ["colander_feed.json", "colander_feed_full.json"])
+    def test_round_trip(self, backend, name):
+        json_file = resources.files("tests.base").joinpath("data").joinpath(name)
+        with json_file.open() as f:
+            raw = json.load(f)
+        feed = ColanderFeed.load(deepcopy(raw))
+        frame = ColanderFrame.from_feed(feed)
+        assert len(frame) == len(feed.entities)
+        assert frame.to_feed().model_dump() == feed.model_dump()
+
+    def test_where_and_count_by(self, backend):
+        feed = _build_feed()
+        frame = ColanderFrame.from_feed(feed)
+        assert frame.count_by("super_type") == {"OBSERVABLE": 20, "THREAT": 1}
+        assert frame.count_by("type") == {
+            ("THREAT", "STALKERWARE"): 1,
+            ("OBSERVABLE", "IPV4"): 10,
+            ("OBSERVABLE", "DOMAIN"): 10,
+        }
+        mask = frame.where(types=[ObservableTypes.IPV4.value], maximum_tlp_level=TlpPapLevel.AMBER)
+        assert frame.count_by("tlp", mask) == {TlpPapLevel.GREEN: 5}
+        mask = frame.where(updated_after=datetime(2025, 1, 8, tzinfo=UTC), types=[ObservableTypes.IPV4.value])
+        assert frame.count_by("name", mask) == {"10.0.0.8": 1, "10.0.0.9": 1}
+        assert sum(frame.where()) == 21
+        assert sum(frame.where(super_types=["THREAT"])) == 1
+
+    def test_where_case(self, backend):
+        feed = _build_feed()
+        case = Case(name="Investigation", description="Investigation")
+        feed.cases = {str(case.id): case}
+        next(iter(feed.entities.values())).case = case
+        frame = ColanderFrame.from_feed(feed)
+        assert frame.count_by("super_type", frame.where(case=case)) == {"THREAT": 1}
+        assert frame.to_feed().model_dump() == feed.model_dump()
+
+    def test_take_and_related(self, backend):
+        feed = _build_feed()
+        frame = ColanderFrame.from_feed(feed)
+        domains = frame.where(types=[ObservableTypes.DOMAIN.value])
+        ips = frame.related(domains, name="resolves")
+        assert frame.count_by("type", ips) == {("OBSERVABLE", "IPV4"): 10}
+        assert sum(frame.related(ips, outgoing=False)) == 10
+        assert sum(frame.related(domains, name="unknown")) == 0
+
+        subset = frame.take(frame.where(maximum_tlp_level=TlpPapLevel.RED))
+        sub_feed = subset.to_feed()
+        assert len(sub_feed.entities) == 16
+        assert len(sub_feed.relations) == 5
+        for relation in sub_feed.relations.values():
+            assert relation.obj_from is sub_feed.entities[str(relation.obj_from.id)]
+        threat = next(entity for entity in sub_feed.entities.values() if isinstance(entity, Threat))
+        associated = [e for e in sub_feed.entities.values() if getattr(e, "associated_threat", None) is threat]
+        assert [obs.name for obs in associated] == ["10.0.0.1"]
+
+    def test_row_of(self, backend):
+        feed = _build_feed()
+        frame = ColanderFrame.from_feed(feed)
+        for row, entity_id in enumerate(feed.entities):
+            assert frame.row_of(entity_id) == row
+        assert frame.row_of("00000000-0000-4000-8000-000000000000") == -1
@@ -0,0 +1,103 @@
+import io
+import json
+import tracemalloc
+from datetime import datetime, timedelta, timezone, UTC
+from types import MappingProxyType
+from uuid import uuid4
+
+import pytest
+
+from colander_data_converter.base.common import TlpPapLevel
+from colander_data_converter.base.lite import Interner, LiteEntity, LiteFeed, LiteRecord
+from colander_data_converter.base.models import ColanderFeed, EntityRelation, Observable
+from colander_data_converter.base.streaming import FeedLoadFilter, load_feed
+from colander_data_converter.base.types.observable import ObservableTypes
+
+
+def _raw_observables(size: int) -> str:
+    entities = {}
+    for i in range(size):
+        entity_id = str(uuid4())
+        entities[entity_id] = {
+            "id": entity_id,
+            "name": f"10.0.{i // 256}.{i % 256}",
+            "tlp": "AMBER",
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-02T00:00:00+00:00",
+            "super_type": {"short_name": "OBSERVABLE"},
+            "type": {"short_name": "IPV4", "name": "IPv4"},
+            "attributes": {"ASN": "13335", "address_block": "10.0.0.0/8"},
+        }
+    return json.dumps({"entities": entities})
+
+
+class TestLiteRecord:
+    def test_record_class_is_cached_per_model(self):
+        record_class = LiteRecord.of(Observable)
+        assert record_class is LiteRecord.of(Observable)
+        assert issubclass(record_class, LiteEntity)
+        assert not issubclass(LiteRecord.of(EntityRelation), LiteEntity)
+        assert record_class.colander_internal_type == "observable"
+        assert not hasattr(
+            LiteRecord.from_model(Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)), "__dict__"
+        )
+
+    def test_shares_values(self):
+        interner = Interner()
+        records = [
+            LiteRecord.from_model(
+                Observable(name=f"10.0.0.{i}", type=ObservableTypes.IPV4.value, attributes={"ASN": "13335"}),
+                interner,
+            )
+            for i in range(2)
+        ]
+        assert records[0].attributes is records[1].attributes
+        assert isinstance(records[0].attributes, MappingProxyType)
+        assert records[0].created_at is records[1].created_at
+        with pytest.raises(TypeError):
+            records[0].attributes["ASN"] = "15169"
+
+    def test_interner_keeps_time_zones(self):
+        interner = Interner()
+        utc = interner(datetime(2025, 1, 1, 12, tzinfo=UTC))
+        shifted = interner(datetime(2025, 1, 1, 14, tzinfo=timezone(timedelta(hours=2))))
+        assert utc == shifted
+        assert shifted.tzinfo is not UTC
+
+
+class TestLiteFeed:
+    @pytest.mark.parametrize("name", ["colander_feed.json", "colander_feed_full.json", "colander_feed_old.json"])
+    def test_round_trip(self, name, feed_file):
+        with feed_file(name).open() as f:
+            feed = ColanderFeed.load(json.load(f))
+        lite_feed = LiteFeed.from_feed(feed)
+        assert len(lite_feed) == len(feed.entities)
+        assert lite_feed.to_feed().model_dump() == feed.model_dump()
+        for relation in lite_feed.relations.values():
+            if isinstance(relation.obj_from, LiteRecord):
+                assert lite_feed.entities[relation.obj_from.id] is relation.obj_from
+
+    @pytest.mark.parametrize(
+        "load_filter", [None, FeedLoadFilter(super_types={"observable"}, maximum_tlp_level=TlpPapLevel.RED)]
+    )
+    def test_load_same_as_load_feed(self, load_filter, feed_file):
+        with feed_file("colander_feed_full.json").open() as f:
+            expected = load_feed(f, load_filter)
+        with feed_file("colander_feed_full.json").open("rb") as f:
+            lite_feed = LiteFeed.load(f, load_filter, chunk_size=256)
+        assert lite_feed.to_feed().model_dump(exclude={"id"}) == expected.model_dump(exclude={"id"})
+
+    def test_uses_less_memory(self):
+        raw = _raw_observables(2000)
+        tracemalloc.start()
+        try:
+            lite_feed = LiteFeed.load(io.StringIO(raw))
+            lite_size = tracemalloc.get_traced_memory()[0]
+            del lite_feed
+            baseline = tracemalloc.get_traced_memory()[0]
+            feed = ColanderFeed.load(json.loads(raw))
+            feed_size = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+        assert len(feed.entities) == 2000
+        assert lite_size * 3 < feed_size
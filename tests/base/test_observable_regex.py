@@ -1,9 +1,13 @@
 import json
 import os
+import random
 import re
+import time
 
 import pytest
 
+from colander_data_converter.base.types.observable import ObservableTypes
+
 # Load observable types
 JSON_PATH = os.path.join(os.path.dirname(__file__), "../../colander_data_converter/data/types/observable_types.json")
 with open(JSON_PATH) as f:
@@ -151,3 +155,100 @@ def test_regex_edge_cases(type_obj):
 
     for value in edge_cases.get(short_name, []):
         assert pattern.match(value), f"{short_name} edge case failed for {value}"
+
+
+def _first_regex_match(value):
+    for observable_type in ObservableTypes:
+        if observable_type.value.match_regex(value):
+            return observable_type.value
+    return ObservableTypes.default.value
+
+
+def test_classifier_matches_regex_order():
+    values = [
+        "AS1234",
+        "as1234",
+        "ſs1",
+        "CVE-2021-1234",
+        "cve-2021-1234",
+        "192.168.1.0/24",
+        "192.168.1.1",
+        "١٩٢.١٦٨.١.١",
+        "192.168.1.1\n",
+        "::ffff:192.0.2.128",
+        "fe80::1ff:fe23:4567:890a",
+        "00-1A-2B-3C-4D-5E",
+        "f" * 32,
+        "f" * 40,
+        "f" * 64,
+        "user@example.com",
+        "https://example.com:8080/path",
+        "mailto:user@example.com",
+        "+44 20 7946 0958",
+        "(800) 555-1234",
+        "C:\\Windows\\System32\\cmd.exe",
+        "a" * 250 + ".com",
+        "a" * 260 + ".com",
+        "",
+        "\n",
+        "not an IOC!",
+    ]
+    rng = random.Random(42)
+    alphabet = "0123456789abcdefAS.:/@-+() _\\\nſ١"
+    values += ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24))) for _ in range(20000)]
+
+    suggested = ObservableTypes.suggest_many(values)
+    assert suggested == ObservableTypes.suggest_many(values, memoize=False)
+    for value, observable_type in zip(values, suggested):
+        assert observable_type is _first_regex_match(value), value
+        assert ObservableTypes.suggest(value) is observable_type
+
+
+# Builders of inputs of size n that make backtracking regexes take a time growing faster than n
+PATHOLOGICAL_VALUES = [
+    lambda n: "1" * n + "a",
+    lambda n: "+1 " + "(1)" * (n // 3) + "a",
+    lambda n: "1-" * (n // 2) + "(",
+    lambda n: "+" + "1" * n + "(1",
+    lambda n: "a/" * (n // 2) + "!",
+    lambda n: "\\\\" + "a" * n + "!",
+    lambda n: "a@" + "a." * (n // 2) + "!",
+    lambda n: "a" * n + "@" + "a" * n,
+    lambda n: "a." * 126 + "a" * n,
+    lambda n: "1:" * (n // 2) + "!",
+    lambda n: "http://" + "a" * n + ":" + "1" * n + " ",
+    lambda n: "AS" + "1" * n + "a",
+    lambda n: "CVE-2021-" + "1" * n + "a",
+]
+
+
+def _best_time(function, value, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(value)
+        best = min(best, time.perf_counter() - start)
+    # Timings below the resolution of the timer are not significant
+    return max(best, 1e-5)
+
+
+@pytest.mark.parametrize("build_value", PATHOLOGICAL_VALUES, ids=range(len(PATHOLOGICAL_VALUES)))
+def test_regex_pathological_input(build_value):
+    # Multiplying the size of the input by 8 multiplies the matching time by about 8 if it is linear, by
+    # about 64 if it is quadratic. The bound leaves room for timer noise on the tiny timings of short inputs.
+    small, large = build_value(1000), build_value(8000)
+    for observable_type in ObservableTypes:
+        match_regex = observable_type.value.match_regex
+        ratio = _best_time(match_regex, large) / _best_time(match_regex, small)
+        assert ratio < 32, f"{observable_type.name} is not linear on {large[:20]}..."
+    assert _best_time(ObservableTypes.suggest, large) / _best_time(ObservableTypes.suggest, small) < 32
+
+
+def test_phone_regex_is_linear():
+    phone = re.compile(next(t["regex"] for t in TYPES if t["short_name"] == "PHONE"), re.IGNORECASE)
+    for value in ["1" * 30 + "a", "(1" * 30 + "a", "+1 " + "1 " * 30 + "(1"]:
+        assert not phone.match(value)
+    for value in ["(12", "(1)2", "1(23", "+12345", "+1 (800) 555-1234\n"]:
+        assert phone.match(value)
+    for value in ["(1", "1(2", "+1(2", "1)", "-1", "1--2"]:
+        assert not phone.match(value)
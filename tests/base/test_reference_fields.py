@@ -0,0 +1,54 @@
+from colander_data_converter.base.common import ReferenceFieldsSchema
+from colander_data_converter.base.models import (
+    DetectionRule,
+    EntityRelation,
+    Event,
+    Observable,
+    Threat,
+)
+from colander_data_converter.base.types.detection_rule import DetectionRuleTypes
+from colander_data_converter.base.types.observable import ObservableTypes
+from colander_data_converter.converters.threatr.models import Event as ThreatrEvent
+
+
+class TestReferenceFieldsSchema:
+    def test_schema_is_cached_per_class(self):
+        assert ReferenceFieldsSchema.of(Event) is ReferenceFieldsSchema.of(Event)
+        assert ReferenceFieldsSchema.of(Event) is not ReferenceFieldsSchema.of(Observable)
+
+    def test_event_schema(self):
+        schema = ReferenceFieldsSchema.of(Event)
+        assert schema.single_references == (
+            "case",
+            "extracted_from",
+            "observed_on",
+            "detected_by",
+            "attributed_to",
+            "target",
+        )
+        assert schema.list_references == ("involved_observables",)
+        assert "name" in schema.plain_fields
+        assert "case" not in schema.plain_fields
+        assert schema.is_reference("involved_observables")
+        assert not schema.is_reference("name")
+
+    def test_no_references(self):
+        schema = ReferenceFieldsSchema.of(Threat)
+        assert schema.single_references == ("case",)
+        assert schema.list_references == ()
+
+    def test_relation_schema(self):
+        schema = ReferenceFieldsSchema.of(EntityRelation)
+        assert schema.single_references == ("case", "obj_from", "obj_to")
+
+    def test_threatr_schema(self):
+        schema = ReferenceFieldsSchema.of(ThreatrEvent)
+        assert schema.single_references == ("involved_entity",)
+
+    def test_unlink_keeps_already_unlinked_references(self):
+        obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        rule = DetectionRule(name="rule", type=DetectionRuleTypes.YARA.value)
+        rule.targeted_observables = [obs1, obs2.id]
+        rule.unlink_references()
+        assert rule.targeted_observables == [obs1.id, obs2.id]
@@ -1,22 +1,30 @@
+import threading
+from copy import deepcopy
 from datetime import datetime, UTC, timedelta
 
 import pytest
 from pydantic import ValidationError
 
 from colander_data_converter.base.models import (
+    ColanderFeed,
+    ColanderRepository,
+    DuplicateRelationStrategy,
     EntityRelation,
+    RelationIndex,
     Observable,
     Case,
     Artifact,
     DetectionRule,
     Device,
     Event,
+    Threat,
 )
 from colander_data_converter.base.types.artifact import *
 from colander_data_converter.base.types.detection_rule import *
 from colander_data_converter.base.types.device import *
 from colander_data_converter.base.types.event import *
 from colander_data_converter.base.types.observable import *
+from colander_data_converter.base.types.threat import *
 
 
 class TestEntityRelation:
@@ -96,3 +104,217 @@ class TestEntityRelation:
         )
         immutable_relations = event.get_immutable_relations()
         assert len(immutable_relations) == 4
+
+    def test_immutable_relation_views(self):
+        obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        rule = DetectionRule(name="rule", type=DetectionRuleTypes.YARA.value, content="rule")
+        rule.targeted_observables = [obs1, obs2.id]
+        repository = ColanderRepository()
+        with repository.activate():
+            views = list(rule.iter_immutable_relations(mapping={}, default_name="targets"))
+        # Views are not registered and have deterministic IDs
+        assert len(repository.relations) == 0
+        assert [view.id for view in views] == [view.id for view in rule.iter_immutable_relations()]
+        assert len({view.id for view in views}) == 2
+        assert [(view.name, view.field_name, view.obj_to) for view in views] == [
+            ("targets", "targeted_observables", obs1),
+            ("targets", "targeted_observables", obs2.id),
+        ]
+        with repository.activate():
+            relation = views[0].to_relation()
+            relations = rule.get_immutable_relations()
+        assert isinstance(relation, EntityRelation)
+        assert (relation.id, relation.name, relation.obj_from, relation.obj_to) == (views[0].id, "targets", rule, obs1)
+        assert set(relations) == {view.id for view in views}
+        assert len(repository.relations) == 0
+
+    def test_break_and_rebuild_immutable_relations(self):
+        threat = Threat(name="threat", type=ThreatTypes.GENERIC.value)
+        obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, associated_threat=threat)
+        feed = ColanderFeed(entities={str(obs.id): obs, str(threat.id): threat})
+        view = next(obs.iter_immutable_relations())
+        feed.break_immutable_relations()
+        assert obs.associated_threat is None
+        assert list(feed.relations) == [view.id]
+        feed.rebuild_immutable_relations()
+        assert obs.associated_threat is threat
+        assert feed.relations == {}
+
+
+class TestRelationIndex:
+    @staticmethod
+    def _feed():
+        obs_type = ObservableTypes.IPV4.value
+        obs1 = Observable(name="1.1.1.1", type=obs_type)
+        obs2 = Observable(name="8.8.8.8", type=obs_type)
+        obs3 = Observable(name="9.9.9.9", type=obs_type)
+        feed = ColanderFeed(entities={str(o.id): o for o in (obs1, obs2, obs3)})
+        return feed, obs1, obs2, obs3
+
+    def test_feed_relations_are_indexed(self):
+        feed, obs1, obs2, obs3 = self._feed()
+        relation = EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2)
+        feed.relations[str(relation.id)] = relation
+        assert isinstance(feed.relations, RelationIndex)
+        assert list(feed.get_outgoing_relations(obs1).values()) == [relation]
+        assert list(feed.get_incoming_relations(obs2).values()) == [relation]
+        assert feed.get_outgoing_relations(obs2) == {}
+        assert feed.get_incoming_relations(obs1) == {}
+        feed.relations.pop(str(relation.id))
+        assert feed.get_outgoing_relations(obs1) == {}
+        assert feed.get_incoming_relations(obs2) == {}
+
+    def test_lookup_by_name(self):
+        feed, obs1, obs2, obs3 = self._feed()
+        relation_1 = EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2)
+        relation_2 = EntityRelation(name="resolves", obj_from=obs1, obj_to=obs3)
+        feed.add(relation_1)
+        feed.add(relation_2)
+        assert len(feed.get_outgoing_relations(obs1)) == 2
+        assert list(feed.get_outgoing_relations(obs1, name="resolves").values()) == [relation_2]
+        assert list(feed.get_incoming_relations(obs2, name="connected to").values()) == [relation_1]
+        assert feed.get_incoming_relations(obs2, name="resolves") == {}
+
+    def test_relation_changes_are_reindexed(self):
+        feed, obs1, obs2, obs3 = self._feed()
+        relation = EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2)
+        feed.add(relation)
+        relation.obj_to = obs3
+        relation.name = "resolves"
+        assert feed.get_incoming_relations(obs2) == {}
+        assert list(feed.get_incoming_relations(obs3, name="resolves").values()) == [relation]
+        relation.obj_from = obs2.id
+        assert feed.get_outgoing_relations(obs1) == {}
+        assert list(feed.get_outgoing_relations(obs2).values()) == [relation]
+
+    def test_reassigned_relations_are_indexed(self):
+        feed, obs1, obs2, obs3 = self._feed()
+        relation = EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2)
+        feed.relations = {str(relation.id): relation}
+        assert list(feed.get_outgoing_relations(obs1).values()) == [relation]
+        copied = deepcopy(feed)
+        copied_obs1 = copied.entities[str(obs1.id)]
+        assert isinstance(copied.relations, RelationIndex)
+        assert len(copied.get_outgoing_relations(copied_obs1)) == 1
+
+    def test_relations_of_several_feeds(self):
+        feed, obs1, obs2, obs3 = self._feed()
+        other_feed, *_ = self._feed()
+        relation = EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2)
+        feed.add(relation)
+        other_feed.add(relation)
+        assert len(feed.get_incoming_relations(obs2)) == len(other_feed.relations.incoming(obs2.id)) == 1
+        relation.obj_to = obs3
+        assert list(feed.get_incoming_relations(obs3).values()) == [relation]
+        assert list(other_feed.relations.incoming(obs3.id).values()) == [relation]
+        other_feed.relations.pop(relation.id)
+        relation.obj_to = obs2
+        assert list(feed.get_incoming_relations(obs2).values()) == [relation]
+        assert other_feed.relations.incoming(obs2.id) == {}
+        # A copy of the relation does not belong to the feed
+        copied = deepcopy(relation)
+        copied.name = "copied"
+        assert list(feed.get_incoming_relations(obs2, name="connected to").values()) == [relation]
+
+    def test_relation_changes_with_concurrent_feeds(self):
+        feed, obs1, obs2, obs3 = self._feed()
+        relation = EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2)
+        feed.add(relation)
+        feed.get_outgoing_relations(obs1)
+        errors = []
+
+        def create_feeds():
+            try:
+                for _ in range(2000):
+                    ColanderFeed(relations={str(relation.id): relation}).relations.outgoing(obs1.id)
+            except Exception as e:
+                errors.append(e)
+
+        def rename():
+            try:
+                for i in range(2000):
+                    relation.name = f"name {i % 10}"
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=target) for target in (create_feeds, rename) * 3]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert list(feed.get_outgoing_relations(obs1, name=relation.name).values()) == [relation]
+
+    def test_outgoing_immutable_relations_of_the_entity_only(self):
+        feed, obs1, obs2, obs3 = self._feed()
+        threat = Threat(name="Threat", type=ThreatTypes.GENERIC.value)
+        obs1.associated_threat = threat
+        obs2.associated_threat = threat
+        feed.add(threat)
+        relations = feed.get_outgoing_relations(obs1, exclude_immutables=False)
+        assert len(relations) == 1
+        assert all(relation.obj_from is obs1 for relation in relations.values())
+
+
+class TestRemoveRelationDuplicates:
+    def _feed_with_duplicates(self):
+        obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        now = datetime.now(UTC)
+        relations = [
+            EntityRelation(
+                name="connected to",
+                obj_from=obs1,
+                obj_to=obs2,
+                created_at=now + timedelta(minutes=i),
+                updated_at=now + timedelta(minutes=10 - i),
+                attributes={"rank": str(i), f"key_{i}": "value"},
+            )
+            for i in range(3)
+        ]
+        other = EntityRelation(name="resolves", obj_from=obs1, obj_to=obs2)
+        feed = ColanderFeed(entities={str(obs1.id): obs1, str(obs2.id): obs2})
+        # Insert the newest first to make sure the insertion order is not used
+        for relation in reversed(relations + [other]):
+            feed.add(relation)
+        return feed, relations, other
+
+    def test_keep_oldest(self):
+        feed, relations, other = self._feed_with_duplicates()
+        removed = feed.remove_relation_duplicates()
+        assert set(removed) == {relations[1].id, relations[2].id}
+        assert set(feed.relations) == {relations[0].id, other.id}
+        assert feed.get_outgoing_relations(relations[0].obj_from, name="connected to") == {
+            str(relations[0].id): relations[0]
+        }
+
+    def test_keep_newest(self):
+        feed, relations, other = self._feed_with_duplicates()
+        removed = feed.remove_relation_duplicates(strategy=DuplicateRelationStrategy.NEWEST)
+        assert set(removed) == {relations[0].id, relations[1].id}
+        assert set(feed.relations) == {relations[2].id, other.id}
+
+    def test_merge(self):
+        feed, relations, other = self._feed_with_duplicates()
+        removed = feed.remove_relation_duplicates(strategy="merge")
+        assert len(removed) == 2
+        kept = feed.relations[str(relations[0].id)]
+        # relations[0] is the most recently updated one
+        assert kept.attributes == {"rank": "0", "key_0": "value", "key_1": "value", "key_2": "value"}
+        assert kept.updated_at == relations[0].updated_at
+
+    def test_matches_references_and_objects(self):
+        obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        feed = ColanderFeed()
+        feed.add(EntityRelation(name="connected to", obj_from=obs1, obj_to=obs2))
+        feed.add(EntityRelation(name="connected to", obj_from=obs1.id, obj_to=obs2.id))
+        feed.add(EntityRelation(name="connected to", obj_from=obs2, obj_to=obs1))
+        assert len(feed.remove_relation_duplicates()) == 1
+        assert len(feed.relations) == 2
+
+    def test_no_duplicates(self):
+        feed, relations, other = self._feed_with_duplicates()
+        feed.remove_relation_duplicates()
+        assert feed.remove_relation_duplicates() == {}
@@ -0,0 +1,273 @@
+import asyncio
+import gc
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import resources
+from uuid import uuid4, UUID
+
+from colander_data_converter.base.models import (
+    ColanderFeed,
+    ColanderRepository,
+    EntityRelation,
+    Observable,
+)
+from colander_data_converter.base.types.observable import ObservableTypes
+from colander_data_converter.converters.stix2.converter import Stix2Converter, Stix2ToColanderMapper
+from colander_data_converter.converters.stix2.models import Stix2Bundle, Stix2Repository
+
+
+def _build_raw_feed(size: int) -> dict:
+    entities = {}
+    relations = {}
+    previous_id = None
+    for i in range(size):
+        entity_id = str(uuid4())
+        entities[entity_id] = {
+            "id": entity_id,
+            "name": f"host-{i}.example.com",
+            "type": {"short_name": "DOMAIN", "name": "Domain"},
+            "super_type": {"short_name": "observable"},
+        }
+        if previous_id:
+            relation_id = str(uuid4())
+            relations[relation_id] = {
+                "id": relation_id,
+                "name": "resolves",
+                "obj_from_id": previous_id,
+                "obj_to_id": entity_id,
+            }
+        previous_id = entity_id
+    return {"entities": entities, "relations": relations}
+
+
+class TestColanderRepository:
+    def test_repository_is_not_a_singleton(self):
+        assert ColanderRepository() is not ColanderRepository()
+        assert ColanderRepository.current() is ColanderRepository.current()
+
+    def test_registers_into_context_repository(self):
+        repository = ColanderRepository()
+        obs = Observable.model_validate(
+            {"name": "1.1.1.1", "type": ObservableTypes.IPV4.value},
+            context={"repository": repository},
+        )
+        assert repository >> obs.id is obs
+        assert isinstance(ColanderRepository.current() >> obs.id, UUID)
+
+    def test_unbounded_by_default(self):
+        repository = ColanderRepository()
+        observables = [
+            Observable.model_validate(
+                {"name": f"10.0.{i // 256}.{i % 256}", "type": ObservableTypes.IPV4.value},
+                context={"repository": repository},
+            )
+            for i in range(5000)
+        ]
+        assert len(repository.entities) == 5000
+        assert repository >> observables[0].id is observables[0]
+
+    def test_bounded_repository_evicts(self):
+        repository = ColanderRepository(max_size=10)
+        observables = [
+            Observable.model_validate(
+                {"name": f"10.0.0.{i}", "type": ObservableTypes.IPV4.value},
+                context={"repository": repository},
+            )
+            for i in range(20)
+        ]
+        assert len(repository.entities) == 10
+        assert isinstance(repository >> observables[0].id, UUID)
+        assert repository >> observables[-1].id is observables[-1]
+
+    def test_weak_repository_releases_objects(self):
+        repository = ColanderRepository(weak=True)
+        obs = Observable.model_validate(
+            {"name": "1.1.1.1", "type": ObservableTypes.IPV4.value},
+            context={"repository": repository},
+        )
+        obs_id = obs.id
+        assert repository >> obs_id is obs
+        del obs
+        gc.collect()
+        assert repository >> obs_id == obs_id
+
+    def test_current_repository_releases_objects(self):
+        def run():
+            repository = ColanderRepository.current()
+            obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+            assert repository >> obs.id is obs
+            for i in range(1000):
+                ColanderFeed(entities={str(obs.id): Observable(name=f"10.0.{i // 256}.{i % 256}", type=obs.type)})
+            gc.collect()
+            assert len(repository.entities) == 1
+            assert repository >> obs.id is obs
+
+        # In a thread, so that the current repository of the test session is left untouched
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(run).result()
+
+    def test_released_objects_are_not_resolved_by_current_repository(self):
+        def run():
+            relation = EntityRelation(
+                name="connection",
+                obj_from=Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value).id,
+                obj_to=Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value).id,
+            )
+            gc.collect()
+            relation.resolve_references()
+            assert isinstance(relation.obj_from, UUID) and isinstance(relation.obj_to, UUID)
+
+            with ColanderRepository().activate():
+                relation = EntityRelation(
+                    name="connection",
+                    obj_from=Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value).id,
+                    obj_to=Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value).id,
+                )
+                gc.collect()
+                relation.resolve_references()
+            assert isinstance(relation.obj_from, Observable) and isinstance(relation.obj_to, Observable)
+
+        # In a thread, so that the current repository of the test session is left untouched
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(run).result()
+
+
+class TestFeedRepository:
+    def test_load_resolves_more_than_4096_objects(self):
+        feed = ColanderFeed.load(_build_raw_feed(3000))
+        assert len(feed.entities) + len(feed.relations) > 4096
+        assert feed.is_fully_resolved()
+        for relation in feed.relations.values():
+            assert relation.obj_from is feed.entities[str(relation.obj_from.id)]
+            assert relation.obj_to is feed.entities[str(relation.obj_to.id)]
+
+    def test_load_does_not_use_current_repository(self):
+        feed = ColanderFeed.load(_build_raw_feed(2))
+        for entity_id in feed.entities:
+            assert (ColanderRepository.current() >> entity_id) == entity_id
+
+    def test_resolve_against_feed_collections(self):
+        obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        relation = EntityRelation(name="connection", obj_from=obs1.id, obj_to=obs2.id)
+        feed = ColanderFeed(
+            entities={str(obs1.id): obs1, str(obs2.id): obs2},
+            relations={str(relation.id): relation},
+        )
+        ColanderRepository.current().clear()
+        feed.resolve_references(strict=True)
+        assert relation.obj_from is obs1
+        assert relation.obj_to is obs2
+
+
+class TestObjectIdKeys:
+    def test_collections_are_keyed_by_uuids(self):
+        feed = ColanderFeed.load(_build_raw_feed(3))
+        entity_id, entity = next(iter(feed.entities.items()))
+        assert isinstance(entity_id, UUID)
+        assert feed.entities[str(entity_id)] is feed.entities[entity_id] is entity
+        assert str(entity_id) in feed.entities
+        assert "not-an-id" not in feed.entities
+        assert feed.get(str(entity_id)) is feed.get(entity_id) is entity
+        assert feed.repository >> str(entity_id) is entity
+        assert feed.repository >> "not-an-id" == "not-an-id"
+
+    def test_collections_are_serialized_with_string_keys(self):
+        raw = _build_raw_feed(3)
+        feed = ColanderFeed.load(json.loads(json.dumps(raw)))
+        dumped = feed.model_dump(mode="json")
+        assert set(dumped["entities"]) == set(raw["entities"])
+        assert set(feed.model_dump()["relations"]) == set(raw["relations"])
+        assert ColanderFeed.load_json(feed.model_dump_json().encode()).model_dump() == feed.model_dump()
+
+    def test_assigned_collections_are_wrapped(self):
+        obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        feed = ColanderFeed()
+        feed.entities = {str(obs.id): obs}
+        assert list(feed.entities) == [obs.id]
+        assert feed.get_entities_similar_to(obs) == {str(obs.id): obs}
+        feed.cases = None
+        assert feed.cases is None
+
+
+class TestContextIsolation:
+    def test_activate_restores_previous_repository(self):
+        previous = ColanderRepository.current()
+        with ColanderRepository().activate() as repository:
+            assert ColanderRepository.current() is repository
+            obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+            assert repository >> obs.id is obs
+        assert ColanderRepository.current() is previous
+        assert isinstance(previous >> obs.id, UUID)
+
+    def test_threads_do_not_share_repositories(self):
+        barrier = threading.Barrier(4)
+
+        def worker(i):
+            repository = ColanderRepository().bind()
+            observables = [Observable(name=f"10.{i}.0.{j}", type=ObservableTypes.IPV4.value) for j in range(50)]
+            barrier.wait()
+            assert ColanderRepository.current() is repository
+            return len(repository.entities), all(repository >> obs.id is obs for obs in observables)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(worker, range(4)))
+        assert results == [(50, True)] * 4
+
+    def test_asyncio_tasks_do_not_share_repositories(self):
+        async def worker(i):
+            repository = ColanderRepository().bind()
+            for j in range(50):
+                Observable(name=f"10.{i}.0.{j}", type=ObservableTypes.IPV4.value)
+                await asyncio.sleep(0)
+            return ColanderRepository.current() is repository, len(repository.entities)
+
+        async def main():
+            return await asyncio.gather(*[worker(i) for i in range(4)])
+
+        assert asyncio.run(main()) == [(True, 50)] * 4
+
+    def test_asyncio_tasks_inherit_the_default_repository(self):
+        async def worker():
+            inherited = ColanderRepository.current()
+            with ColanderRepository().activate() as repository:
+                return inherited, repository
+
+        async def main():
+            default = ColanderRepository.current()
+            results = await asyncio.gather(worker(), worker())
+            return default, results
+
+        default, results = asyncio.run(main())
+        assert all(inherited is default for inherited, _ in results)
+        assert results[0][1] is not results[1][1]
+
+    def test_concurrent_conversions(self):
+        json_file = resources.files("tests.converters.stix2").joinpath("data").joinpath("stix2_bundle.json")
+        with json_file.open() as f:
+            raw = json.load(f)
+        expected = Stix2Converter.stix2_to_colander(json.loads(json.dumps(raw)))
+
+        def convert(_):
+            feed = Stix2Converter.stix2_to_colander(json.loads(json.dumps(raw)))
+            return len(feed.entities), len(feed.relations)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(convert, range(16)))
+        assert results == [(len(expected.entities), len(expected.relations))] * 16
+
+    def test_conversions_restore_the_current_repository(self):
+        json_file = resources.files("tests.converters.stix2").joinpath("data").joinpath("stix2_bundle.json")
+        with json_file.open() as f:
+            raw = json.load(f)
+        with ColanderRepository().activate() as repository:
+            mapper = Stix2ToColanderMapper()
+            feed = mapper.convert(raw)
+            assert ColanderRepository.current() is repository
+            assert not repository.entities
+            assert feed.entities
+        with Stix2Repository().activate() as stix2_repository:
+            assert Stix2Bundle.load(raw).objects
+            assert Stix2Repository.current() is stix2_repository
+            assert not stix2_repository.stix2_objects
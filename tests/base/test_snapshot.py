@@ -0,0 +1,96 @@
+import io
+import struct
+from datetime import datetime, timedelta, timezone, UTC
+from uuid import UUID
+
+import pytest
+
+from colander_data_converter.base.models import ColanderFeed, Observable
+from colander_data_converter.base.snapshot import SNAPSHOT_VERSION, SnapshotReader, load_snapshot, save_snapshot
+from colander_data_converter.base.types.observable import ObservableType, ObservableTypes
+
+
+def _snapshot(feed: ColanderFeed, compression=None) -> io.BytesIO:
+    fp = io.BytesIO()
+    save_snapshot(feed, fp, compression=compression)
+    fp.seek(0)
+    return fp
+
+
+class TestSnapshot:
+    @pytest.mark.parametrize("compression", [None, "zlib", "bz2", "lzma"])
+    @pytest.mark.parametrize("name", ["colander_feed.json", "colander_feed_full.json"])
+    def test_round_trip(self, name, compression, load_feed):
+        feed = load_feed(name)
+        loaded = load_snapshot(_snapshot(feed, compression))
+        assert loaded.model_dump() == feed.model_dump()
+        for relation in loaded.relations.values():
+            assert relation.obj_from is loaded.entities[relation.obj_from.id]
+            assert loaded.repository >> relation.id is relation
+        for entity_id, entity in loaded.entities.items():
+            assert set(loaded.get_outgoing_relations(entity)) == set(
+                feed.get_outgoing_relations(feed.entities[entity_id])
+            )
+
+    def test_smaller_than_json(self, load_feed):
+        feed = load_feed("colander_feed_full.json")
+        assert len(_snapshot(feed).getvalue()) < len(feed.model_dump_json())
+        assert len(_snapshot(feed, "zlib").getvalue()) < len(_snapshot(feed).getvalue())
+
+    def test_dates_and_types(self):
+        custom_type = ObservableType(short_name="IPV4", name="Custom IPv4")
+        feed = ColanderFeed()
+        obs1 = Observable(
+            name="1.1.1.1",
+            type=ObservableTypes.IPV4.value,
+            created_at=datetime(2025, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+            updated_at=datetime(2025, 1, 2),
+            attributes={"ASN": "13335", "note": "é"},
+        )
+        obs2 = Observable(name="8.8.8.8", type=custom_type, updated_at=datetime(1960, 1, 1, tzinfo=UTC))
+        feed.add(obs1)
+        feed.add(obs2)
+        loaded = load_snapshot(_snapshot(feed))
+        assert loaded.model_dump() == feed.model_dump()
+        assert loaded.entities[obs1.id].type is ObservableTypes.IPV4.value
+        assert loaded.entities[obs2.id].type == custom_type
+        assert loaded.entities[obs1.id].created_at.utcoffset() == timedelta(hours=2)
+        assert loaded.entities[obs1.id].updated_at.tzinfo is None
+
+    def test_load_some_collections(self, load_feed):
+        feed = load_feed("colander_feed_full.json")
+        loaded = load_snapshot(_snapshot(feed), collections=["relations"])
+        assert loaded.entities == {}
+        assert set(loaded.relations) == set(feed.relations)
+        relation = next(iter(loaded.relations.values()))
+        assert relation.obj_from == feed.relations[relation.id].obj_from.id
+        with pytest.raises(ValueError):
+            load_snapshot(_snapshot(feed), collections=["unknown"])
+
+    def test_reader(self, load_feed):
+        feed = load_feed("colander_feed_full.json")
+        reader = SnapshotReader(_snapshot(feed, "zlib"))
+        assert reader.version == SNAPSHOT_VERSION
+        assert {"strings", "entities", "relations", "cases"} <= set(reader.sections)
+        cases = reader.load_collection("cases")
+        assert {case_id: case.model_dump() for case_id, case in cases.items()} == {
+            case_id: case.model_dump() for case_id, case in feed.cases.items()
+        }
+        with pytest.raises(ValueError):
+            reader.read_section("unknown")
+
+    def test_references_are_not_unlinked(self, load_feed):
+        feed = load_feed("colander_feed_full.json")
+        save_snapshot(feed, io.BytesIO())
+        relation = next(iter(feed.relations.values()))
+        assert not isinstance(relation.obj_from, UUID)
+
+    def test_invalid_snapshots(self):
+        with pytest.raises(ValueError):
+            load_snapshot(io.BytesIO(b'{"entities": {}}'))
+        data = bytearray(_snapshot(ColanderFeed()).getvalue())
+        struct.pack_into("<H", data, 8, SNAPSHOT_VERSION + 1)
+        with pytest.raises(ValueError):
+            load_snapshot(io.BytesIO(bytes(data)))
+        with pytest.raises(ValueError):
+            save_snapshot(ColanderFeed(), io.BytesIO(), compression="zip")
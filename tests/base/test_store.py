@@ -0,0 +1,140 @@
+import pytest
+
+from colander_data_converter.base.common import TlpPapLevel
+from colander_data_converter.base.models import (
+    ColanderFeed,
+    CommonEntitySuperTypes,
+    EntityRelation,
+    Observable,
+    Threat,
+)
+from colander_data_converter.base.store import FeedStore
+from colander_data_converter.base.types.observable import ObservableTypes
+from colander_data_converter.base.types.threat import ThreatTypes
+
+
+@pytest.fixture
+def feed(load_feed):
+    return load_feed("colander_feed_full.json")
+
+
+@pytest.fixture
+def store(feed):
+    with FeedStore(cache_size=4, batch_size=3) as store:
+        store.add_feed(feed)
+        yield store
+
+
+class TestFeedStore:
+    def test_round_trip(self, feed, store):
+        assert store.count("entities") == len(feed.entities)
+        assert store.count("relations") == len(feed.relations)
+        assert store.count("cases") == len(feed.cases)
+        loaded = store.to_feed()
+        assert loaded.model_dump(exclude={"id"}) == feed.model_dump(exclude={"id"})
+        for relation in loaded.relations.values():
+            assert relation.obj_from is loaded.entities[relation.obj_from.id]
+
+    def test_contains_and_get(self, feed, store):
+        for collection in ("entities", "relations", "cases"):
+            for object_id, obj in getattr(feed, collection).items():
+                assert store.contains(obj)
+                assert store.contains(str(object_id))
+                assert store.get(object_id).fingerprint() == obj.fingerprint()
+        assert not store.contains("nonexistent-id")
+        assert store.get("8fc7f8f5-f2b7-4b8e-a0a6-2a05c1a3b0aa") is None
+
+    def test_add(self, tmp_path):
+        obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        path = tmp_path / "feed.db"
+        with FeedStore(path, batch_size=10) as store:
+            store.add(obs)
+            # Reads commit the buffered writes first
+            assert store.contains(obs)
+            store.add(Observable(id=obs.id, name="8.8.8.8", type=ObservableTypes.IPV4.value))
+            assert store.get(obs.id).name == "1.1.1.1"
+            store.add(Observable(id=obs.id, name="8.8.8.8", type=ObservableTypes.IPV4.value), replace=True)
+            assert store.get(obs.id).name == "8.8.8.8"
+        with FeedStore(path) as store:
+            assert store.count() == 1
+            assert store.get(obs.id).type is ObservableTypes.IPV4.value
+        with pytest.raises(TypeError):
+            FeedStore().add(ColanderFeed())
+
+    def test_get_by_super_type_and_indexes(self, feed, store):
+        super_type = CommonEntitySuperTypes.OBSERVABLE.value
+        expected = {entity.id for entity in feed.get_by_super_type(super_type)}
+        assert expected
+        assert {entity.id for entity in store.get_by_super_type(super_type)} == expected
+        entity = next(iter(feed.entities.values()))
+        found = list(store.iter_entities(super_type=entity.super_type, entity_type=entity.type, name=entity.name))
+        assert entity.id in {e.id for e in found}
+        if entity.case is not None:
+            assert entity.id in {e.id for e in store.iter_entities(case=entity.case)}
+
+    def test_get_relations(self, feed, store):
+        for entity_id, entity in feed.entities.items():
+            stored = store.get(entity_id)
+            assert set(store.get_relations(stored)) == set(feed.get_relations(entity))
+            assert set(store.get_outgoing_relations(stored, exclude_immutables=False)) == set(
+                feed.get_outgoing_relations(entity, exclude_immutables=False)
+            )
+            for relation in store.get_incoming_relations(stored).values():
+                assert relation.obj_to.id == entity_id
+
+    def test_relation_names(self):
+        obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        with FeedStore() as store:
+            for obj in (obs1, obs2, EntityRelation(name="a", obj_from=obs1, obj_to=obs2)):
+                store.add(obj)
+            store.add(EntityRelation(name="b", obj_from=obs1, obj_to=obs2))
+            assert len(store.get_outgoing_relations(obs1)) == 2
+            assert [r.name for r in store.get_outgoing_relations(obs1, name="b").values()] == ["b"]
+            assert [r.name for r in store.get_incoming_relations(obs2, name="a").values()] == ["a"]
+
+    @pytest.mark.parametrize("level", [TlpPapLevel.WHITE, TlpPapLevel.GREEN, TlpPapLevel.AMBER, TlpPapLevel.RED])
+    def test_filter(self, feed, store, level):
+        expected = feed.filter(level, exclude_entity_types=[Threat])
+        filtered = store.filter(level, exclude_entity_types=[Threat])
+        assert set(filtered.entities) == set(expected.entities)
+        assert set(filtered.relations) == set(expected.relations)
+        assert set(filtered.cases) == set(expected.cases)
+
+    def test_iter_feeds(self, feed, store):
+        entities, relations = set(), set()
+        for chunk in store.iter_feeds(chunk_size=2):
+            assert len(chunk.entities) <= 2
+            assert not entities & set(chunk.entities)
+            entities |= set(chunk.entities)
+            relations |= set(chunk.relations)
+            for relation in chunk.relations.values():
+                assert relation.obj_from.id in chunk.entities
+                assert relation.obj_to.id in feed.entities
+        assert entities == set(feed.entities)
+        assert relations == set(feed.relations)
+
+    def test_streams(self, feed, store):
+        assert {e.id for e in store.iter_entities()} == set(feed.entities)
+        assert {r.id for r in store.iter_relations()} == set(feed.relations)
+        assert {c.id for c in store.iter_cases()} == set(feed.cases)
+
+    def test_properties(self, feed, store):
+        assert store.name == feed.name
+        store.name = "renamed"
+        assert store.to_feed().name == "renamed"
+        with pytest.raises(ValueError):
+            store.count("unknown")
+
+    @pytest.mark.parametrize("sizes", [{"cache_size": 0}, {"batch_size": 0}, {"batch_size": -1}])
+    def test_invalid_sizes(self, sizes):
+        with pytest.raises(ValueError):
+            FeedStore(**sizes)
+
+    def test_threat_reference(self):
+        threat = Threat(name="Threat", type=ThreatTypes.GENERIC.value)
+        obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, associated_threat=threat)
+        with FeedStore() as store:
+            store.add(obs)
+            store.add(threat)
+            assert store.get(obs.id).associated_threat.name == "Threat"
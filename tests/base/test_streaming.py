@@ -0,0 +1,228 @@
+import io
+import json
+from datetime import datetime, UTC
+from uuid import UUID
+
+import pytest
+
+from colander_data_converter.base.common import TlpPapLevel
+from colander_data_converter.base.models import ColanderFeed, ColanderRepository, Observable
+from colander_data_converter.base.streaming import (
+    FeedLoadFilter,
+    JsonStreamReader,
+    iter_ndjson,
+    iter_raw_feed,
+    load_feed,
+    load_ndjson,
+    open_feed_file,
+    save_ndjson,
+)
+
+
+class TestJsonStreamReader:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64])
+    def test_reads_nested_values(self, chunk_size):
+        document = {"a": 12345, "b": {"c": "d\\u00e9", "e": [1.5, True, None]}, "f": {}, "g": "é" * 10}
+        raw = json.dumps(document, ensure_ascii=False)
+        for fp in (io.StringIO(raw), io.BytesIO(raw.encode("utf-8"))):
+            reader = JsonStreamReader(fp, chunk_size=chunk_size)
+            assert {key: reader.value() for key in reader.members()} == document
+
+    def test_invalid_documents(self):
+        with pytest.raises(ValueError):
+            list(JsonStreamReader(io.StringIO("[]")).members())
+        reader = JsonStreamReader(io.StringIO('{"a": 1 "b": 2}'))
+        with pytest.raises(ValueError):
+            for _ in reader.members():
+                reader.value()
+        reader = JsonStreamReader(io.StringIO('{"a": {"b": '))
+        with pytest.raises(ValueError):
+            for _ in reader.members():
+                reader.value()
+
+    def test_errors_are_raised_without_reading_further(self):
+        fp = io.StringIO('{"a": 1 "b": "' + "x" * 1_000_000 + '"}')
+        reader = JsonStreamReader(fp, chunk_size=64)
+        with pytest.raises(ValueError):
+            for _ in reader.members():
+                reader.value()
+        assert fp.tell() == 64
+
+    def test_values_are_capped(self):
+        fp = io.StringIO('{"a": "' + "x" * 1_000_000 + '"}')
+        reader = JsonStreamReader(fp, chunk_size=64, max_value_size=1000)
+        with pytest.raises(ValueError, match="larger than 1000"):
+            for _ in reader.members():
+                reader.value()
+        assert fp.tell() < 4000
+
+
+class TestLoadFeed:
+    @pytest.mark.parametrize("name", ["colander_feed.json", "colander_feed_full.json", "colander_feed_old.json"])
+    def test_same_as_load(self, name, feed_file):
+        with feed_file(name).open() as f:
+            expected = ColanderFeed.load(json.load(f))
+        with feed_file(name).open("rb") as f:
+            feed = load_feed(f, chunk_size=256)
+        assert feed.entities.keys() == expected.entities.keys()
+        assert feed.relations.keys() == expected.relations.keys()
+        assert feed.cases.keys() == expected.cases.keys()
+        for entity_id, entity in feed.entities.items():
+            assert entity.model_dump() == expected.entities[entity_id].model_dump()
+        assert feed.is_fully_resolved() == expected.is_fully_resolved()
+
+    def test_does_not_use_current_repository(self, feed_file):
+        with feed_file("colander_feed_full.json").open() as f:
+            feed = load_feed(f)
+        for entity_id in feed.entities:
+            assert (ColanderRepository.current() >> entity_id) == entity_id
+
+    def test_iter_raw_feed(self, feed_file):
+        with feed_file("colander_feed_full.json").open() as f:
+            raw = json.load(f)
+        with feed_file("colander_feed_full.json").open() as f:
+            items = list(iter_raw_feed(f, chunk_size=128))
+        assert [(collection, object_id) for collection, object_id, _ in items] == [
+            (collection, object_id) for collection in raw for object_id in raw[collection]
+        ]
+        assert all(raw[collection][object_id] == raw_object for collection, object_id, raw_object in items)
+
+    def test_filters(self, feed_file):
+        with feed_file("colander_feed_full.json").open() as f:
+            raw = json.load(f)
+        with feed_file("colander_feed_full.json").open() as f:
+            feed = load_feed(f, FeedLoadFilter(super_types={"observable"}, maximum_tlp_level=TlpPapLevel.RED))
+        expected = {
+            UUID(entity_id)
+            for entity_id, entity in raw["entities"].items()
+            if entity["super_type"]["short_name"] == "OBSERVABLE" and entity["tlp"] != "RED"
+        }
+        assert set(feed.entities) == expected
+        assert all(isinstance(entity, Observable) for entity in feed.entities.values())
+        # Relations are only kept between loaded entities
+        for relation in feed.relations.values():
+            assert relation.obj_from.id in expected
+            assert relation.obj_to.id in expected
+
+    def test_filter_by_case_and_update_time(self):
+        raw = {
+            "name": "feed",
+            "cases": {},
+            "entities": {},
+        }
+        for i, case_id in enumerate(["a8f1a6c5-1c2b-4a84-93ac-2b1d26a7a0c1", "3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22"]):
+            raw["cases"][case_id] = {"id": case_id, "name": f"case {i}", "description": "case"}
+            for j in range(3):
+                entity_id = f"{case_id[:-2]}{i}{j}"
+                raw["entities"][entity_id] = {
+                    "id": entity_id,
+                    "name": f"10.0.{i}.{j}",
+                    "case": case_id,
+                    "updated_at": f"2025-01-0{j + 1}T00:00:00Z",
+                    "super_type": {"short_name": "OBSERVABLE"},
+                    "type": {"short_name": "IPV4", "name": "IPv4"},
+                }
+        load_filter = FeedLoadFilter(
+            case_ids={"3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22"},
+            updated_after=datetime(2025, 1, 1, 12, tzinfo=UTC),
+        )
+        feed = load_feed(io.StringIO(json.dumps(raw)), load_filter)
+        assert feed.name == "feed"
+        assert list(feed.cases) == [UUID("3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22")]
+        assert sorted(entity.name for entity in feed.entities.values()) == ["10.0.1.1", "10.0.1.2"]
+        assert all(
+            entity.case is feed.cases["3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22"] for entity in feed.entities.values()
+        )
+
+    def test_relations_of_skipped_entities_are_not_validated(self):
+        entities = {
+            entity_id: {
+                "id": entity_id,
+                "name": name,
+                "super_type": {"short_name": "OBSERVABLE"},
+                "type": {"short_name": "IPV4", "name": "IPv4"},
+                "tlp": tlp,
+            }
+            for entity_id, name, tlp in [
+                ("a8f1a6c5-1c2b-4a84-93ac-2b1d26a7a0c1", "10.0.0.1", "WHITE"),
+                ("3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22", "10.0.0.2", "RED"),
+            ]
+        }
+        # The relation is invalid, it would fail to load if it were validated
+        relation_id = "6f0e2a4b-8c1d-4e3f-9a2b-7c5d1e0f3a44"
+        relations = {
+            relation_id: {
+                "id": relation_id,
+                "name": None,
+                "obj_from": "a8f1a6c5-1c2b-4a84-93ac-2b1d26a7a0c1",
+                "obj_to": {"id": "3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22"},
+            }
+        }
+        raw = json.dumps({"entities": entities, "relations": relations})
+        feed = load_feed(io.StringIO(raw), FeedLoadFilter(maximum_tlp_level=TlpPapLevel.AMBER))
+        assert list(feed.entities) == [UUID("a8f1a6c5-1c2b-4a84-93ac-2b1d26a7a0c1")]
+        assert not feed.relations
+        with pytest.raises(ValueError):
+            load_feed(io.StringIO(raw))
+
+    def test_mismatching_ids(self):
+        raw = '{"entities": {"a8f1a6c5-1c2b-4a84-93ac-2b1d26a7a0c1": {"id": "3d1b8f7c-4b6f-4a7e-9b0e-6c2e0d5f1a22"}}}'
+        with pytest.raises(ValueError):
+            load_feed(io.StringIO(raw))
+
+
+class TestNdjson:
+    @pytest.mark.parametrize("name", ["colander_feed.json", "colander_feed_full.json", "colander_feed_old.json"])
+    def test_round_trip(self, name, feed_file):
+        with feed_file(name).open() as f:
+            feed = ColanderFeed.load(json.load(f))
+        fp = io.StringIO()
+        save_ndjson(feed, fp)
+        lines = fp.getvalue().splitlines()
+        assert len(lines) == 1 + len(feed.entities) + len(feed.relations) + len(feed.cases)
+        loaded = load_ndjson(io.StringIO(fp.getvalue()))
+        assert loaded.model_dump() == feed.model_dump()
+        assert loaded.is_fully_resolved() == feed.is_fully_resolved()
+        # The references of the feed are left untouched
+        assert all(not isinstance(relation.obj_from, UUID) for relation in feed.relations.values())
+
+    @pytest.mark.parametrize("extension", ["", ".gz", ".bz2", ".xz"])
+    def test_compression(self, tmp_path, extension, feed_file):
+        with feed_file("colander_feed_full.json").open() as f:
+            feed = ColanderFeed.load(json.load(f))
+        path = tmp_path / f"feed.ndjson{extension}"
+        with open_feed_file(path, "w") as f:
+            save_ndjson(feed, f)
+        with open_feed_file(path) as f:
+            assert load_ndjson(f).model_dump() == feed.model_dump()
+        # The compression is detected from the content when the extension is missing
+        renamed = path.rename(tmp_path / "feed")
+        with open_feed_file(renamed) as f:
+            assert load_ndjson(f).model_dump() == feed.model_dump()
+        with pytest.raises(ValueError):
+            open_feed_file(renamed, "w", compression="zip")
+        with pytest.raises(ValueError):
+            open_feed_file(renamed, "rb")
+
+    def test_iter_ndjson(self, feed_file):
+        with feed_file("colander_feed_full.json").open() as f:
+            feed = ColanderFeed.load(json.load(f))
+        fp = io.BytesIO()
+        save_ndjson(feed, fp)
+        fp.seek(0)
+        repository = ColanderRepository()
+        objects = list(iter_ndjson(fp, FeedLoadFilter(maximum_tlp_level=TlpPapLevel.RED), repository=repository))
+        expected = {entity_id for entity_id, entity in feed.entities.items() if entity.tlp != TlpPapLevel.RED}
+        assert {obj.id for obj in objects if obj.id in feed.entities} == expected
+        for obj in objects:
+            assert obj.is_fully_resolved(repository=repository)
+            if obj.id in feed.relations:
+                assert obj.obj_from.id in expected and obj.obj_to.id in expected
+        for entity_id in expected:
+            assert (ColanderRepository.current() >> entity_id) == entity_id
+
+    def test_invalid_records(self):
+        for raw in ('{"collection": "unknown", "object": {}}', "[1]", "{", '{"collection": "entities", "object": {}}'):
+            with pytest.raises(ValueError):
+                load_ndjson(io.StringIO(raw))
+        assert load_ndjson(io.StringIO('\n{"collection": "feed", "object": {"name": "feed"}}\n\n')).name == "feed"
@@ -1,6 +1,16 @@
+from unittest import mock
+
 import pytest
 from pydantic import ValidationError
 
+from colander_data_converter.base.models import (
+    Artifact,
+    CommonEntitySuperTypes,
+    DataFragment,
+    EntityRelation,
+    Observable,
+)
+from colander_data_converter.base.types import base as types_base
 from colander_data_converter.base.types.actor import *
 from colander_data_converter.base.types.artifact import *
 from colander_data_converter.base.types.data_fragment import *
@@ -181,3 +191,50 @@ def test_by_short_name_consistency():
 
         # Test case insensitivity
         assert type_class.by_short_name(valid_type.lower()) is not None
+
+
+class TestSupportedTypesRegistry:
+    def test_types_file_is_read_once(self):
+        with mock.patch.object(types_base, "load_entity_supported_types") as load:
+            for _ in range(10):
+                ObservableType(short_name="IPV4", name="IP Address")
+        load.assert_not_called()
+
+    def test_entities_share_enum_types(self):
+        observables = [
+            Observable.model_validate({"name": f"10.0.0.{i}", "type": {"short_name": "IPV4", "name": "IPv4"}})
+            for i in range(3)
+        ]
+        assert all(obs.type is ObservableTypes.IPV4.value for obs in observables)
+        artifact = Artifact.model_validate({"name": "report.pdf", "type": ArtifactTypes.REPORT.value.model_dump()})
+        assert artifact.type is ArtifactTypes.REPORT.value
+
+    def test_entities_keep_custom_types(self):
+        obs = Observable.model_validate({"name": "1.1.1.1", "type": {"short_name": "IPV4", "name": "IP address"}})
+        assert obs.type is not ObservableTypes.IPV4.value
+        assert obs.type.name == "IP address"
+        with pytest.raises(ValidationError):
+            Observable.model_validate({"name": "1.1.1.1", "type": {"short_name": "INVALID", "name": "Invalid"}})
+
+
+class TestSuperTypes:
+    def test_super_type_is_shared_per_class(self):
+        obs1 = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value)
+        obs2 = Observable(name="8.8.8.8", type=ObservableTypes.IPV4.value)
+        relation = EntityRelation(name="connection", obj_from=obs1, obj_to=obs2)
+        assert obs1.super_type is obs2.super_type
+        assert obs1.super_type is not relation.super_type
+        assert relation.super_type.short_name == "ENTITYRELATION"
+        fragment = DataFragment(name="fragment", type=DataFragmentTypes.CODE.value, content="code")
+        assert fragment.model_dump(mode="json")["super_type"] == {"short_name": "DATAFRAGMENT", "name": "DataFragment"}
+
+    def test_super_type_lookups(self):
+        for member in CommonEntitySuperTypes:
+            super_type = member.value
+            assert CommonEntitySuperTypes.by_short_name(super_type.short_name.lower()) is super_type
+            assert CommonEntitySuperTypes.by_model_class(super_type.model_class) is super_type
+            for entity_type in super_type.types_class:
+                assert super_type.type_by_short_name(entity_type.name.lower()) is entity_type.value
+            assert super_type.type_by_short_name("nonexistent") is super_type.default_type.value
+        assert CommonEntitySuperTypes.by_short_name("nonexistent") is None
+        assert CommonEntitySuperTypes.by_model_class(EntityRelation) is None
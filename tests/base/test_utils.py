@@ -228,3 +228,27 @@ def test_tlp_pap_level_comparisons():
     assert TlpPapLevel.WHITE.value < TlpPapLevel.RED.value
     assert TlpPapLevel.RED == TlpPapLevel.by_name("RED")
     assert str(TlpPapLevel.RED) == "RED"
+
+
+def test_tlp_pap_level_member_resolution():
+    import pytest
+    from pydantic import ValidationError
+
+    from colander_data_converter.base.common import Level, TlpPapLevel
+    from colander_data_converter.base.models import Observable
+    from colander_data_converter.base.types.observable import ObservableTypes
+
+    assert TlpPapLevel._get_member(TlpPapLevel.RED) is TlpPapLevel.RED
+    assert TlpPapLevel._get_member("AMBER") is TlpPapLevel.AMBER
+    assert TlpPapLevel._get_member(TlpPapLevel.GREEN.value) is TlpPapLevel.GREEN
+    assert TlpPapLevel._get_member(Level(code="WHITE", name="WHITE", ordering_value=10)) is TlpPapLevel.WHITE
+    assert TlpPapLevel._get_member({"code": "RED", "name": "RED", "ordering_value": 40}) is TlpPapLevel.RED
+    for invalid in ["PURPLE", {"code": "RED", "name": "RED", "ordering_value": 10}, {"name": "RED"}, 40, None]:
+        with pytest.raises(ValueError):
+            TlpPapLevel._get_member(invalid)
+
+    obs = Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, tlp="AMBER", pap=TlpPapLevel.RED.value)
+    assert obs.tlp is TlpPapLevel.AMBER
+    assert obs.pap is TlpPapLevel.RED
+    with pytest.raises(ValidationError):
+        Observable(name="1.1.1.1", type=ObservableTypes.IPV4.value, tlp="PURPLE")
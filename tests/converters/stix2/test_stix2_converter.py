@@ -62,7 +62,7 @@ class TestExtractStix2PatternValue(unittest.TestCase):
 
 class TestStix2ToColanderMapping:
     def test_actor_mapping(self):
-        ColanderRepository().clear()
+        ColanderRepository.current().clear()
         loader = Stix2MappingLoader()
         mapper = Stix2ToColanderMapper()
         _type, _candidates = loader.get_entity_type_for_stix2("threat-actor")
@@ -75,7 +75,7 @@ class TestStix2ToColanderMapping:
         assert _subtype == "generic"
 
     def test_observable_mapping(self):
-        ColanderRepository().clear()
+        ColanderRepository.current().clear()
         loader = Stix2MappingLoader()
         mapper = Stix2ToColanderMapper()
         _type, _candidates = loader.get_entity_type_for_stix2("indicator")
@@ -90,7 +90,7 @@ class TestStix2ToColanderMapping:
         assert _subtype == "generic"
 
     def test_stix2_converter(self):
-        ColanderRepository().clear()
+        ColanderRepository.current().clear()
         mapper = Stix2ToColanderMapper()
         f = mapper.convert(
             {
@@ -109,7 +109,7 @@ class TestStix2ToColanderMapping:
         assert f is not None
 
     def test_stix2_bundle(self):
-        ColanderRepository().clear()
+        ColanderRepository.current().clear()
         mapper = Stix2ToColanderMapper()
         resource_package = __name__
         json_file = resources.files(resource_package).joinpath("data").joinpath("stix2_bundle.json")
@@ -19,13 +19,13 @@ from colander_data_converter.base.types.device import *
 from colander_data_converter.base.types.event import *
 from colander_data_converter.base.types.observable import *
 from colander_data_converter.converters.threatr.converter import ColanderToThreatrMapper
-from colander_data_converter.converters.threatr.models import ThreatrFeed
+from colander_data_converter.converters.threatr.models import ThreatrFeed, ThreatrRepository
 
 
 class TestColanderToThreatrConverter(unittest.TestCase):
     def setUp(self):
         # Clear the repository before each test
-        ColanderRepository().clear()
+        ColanderRepository.current().clear()
 
     def test_convert_entity(self):
         # Create a Colander entity
@@ -102,6 +102,20 @@ class TestColanderToThreatrConverter(unittest.TestCase):
         self.assertEqual(threatr_feed.relations[0].obj_from, actor.id)
         self.assertEqual(threatr_feed.relations[0].obj_to, observable.id)
 
+    def test_convert_does_not_register_into_current_repository(self):
+        actor = Actor(name="Test Actor", type=ActorTypes.by_short_name("threat_actor"))
+        observable = Observable(name="Test Observable", type=ObservableTypes.by_short_name("domain"))
+        relation = EntityRelation(name="uses", obj_from=actor, obj_to=observable)
+        feed = ColanderFeed(entities={actor.id: actor, observable.id: observable}, relations={relation.id: relation})
+
+        with ThreatrRepository().activate() as repository:
+            threatr_feed = ColanderToThreatrMapper().convert(feed, actor.id)
+            self.assertIs(ThreatrRepository.current(), repository)
+            self.assertFalse(repository.entities)
+            self.assertFalse(repository.relations)
+        self.assertEqual(len(threatr_feed.entities), 2)
+        self.assertEqual(len(threatr_feed.relations), 1)
+
     def test_convert_to_threatr_with_references(self):
         # Create Colander entities with a reference field
         actor = Actor(name="Test Actor", type=ActorTypes.by_short_name("threat_actor"))
@@ -70,12 +70,15 @@ def sample_relation(sample_entities):
 
 
 class TestThreatrRepository:
-    def test_singleton_pattern(self):
-        """Test that ThreatrRepository follows singleton pattern"""
-        repo1 = ThreatrRepository()
-        repo2 = ThreatrRepository()
+    def test_current_repository(self):
+        """Test that ThreatrRepository.current() returns the repository bound to the context"""
+        repo1 = ThreatrRepository.current()
+        repo2 = ThreatrRepository.current()
         assert repo1 is repo2
         assert id(repo1) == id(repo2)
+        with ThreatrRepository().activate() as repo3:
+            assert ThreatrRepository.current() is repo3
+        assert ThreatrRepository.current() is repo1
 
     def test_repository_initialization(self, clean_repository):
         """Test repository is initialized with empty collections"""
@@ -29,8 +29,8 @@ from colander_data_converter.converters.threatr.models import (
 class TestThreatrToColanderConverter(unittest.TestCase):
     def setUp(self):
         # Clear the repository before each test
-        ColanderRepository().clear()
-        ThreatrRepository().clear()
+        ColanderRepository.current().clear()
+        ThreatrRepository.current().clear()
 
     def _compare_fields(self, obj1: BaseModel, obj2: BaseModel, ignore_fields: List[str] = None):
         obj1_field_names = set(obj1.__class__.model_fields.keys())
@@ -114,6 +114,29 @@ class TestThreatrToColanderConverter(unittest.TestCase):
         self.assertEqual(colander_observable.operated_by, colander_actor)
         self.assertIn(colander_observable, colander_event.involved_observables)
 
+    def test_references_are_resolved_against_the_feed(self):
+        actor = ThreatrEntity(
+            name="Alice & Bob",
+            type=ActorTypes.by_short_name("INDIVIDUAL"),
+            super_type=CommonEntitySuperTypes.ACTOR.value,
+        )
+        observable = ThreatrEntity(
+            name="1.1.1.1",
+            type=ObservableTypes.by_short_name("IPV4"),
+            super_type=CommonEntitySuperTypes.OBSERVABLE.value,
+        )
+        relation = ThreatrEntityRelation(name="operated by", obj_from=observable.id, obj_to=actor.id)
+        threatr_feed = ThreatrFeed(root_entity=observable, entities=[actor, observable], relations=[relation])
+        # The objects of the feed are not registered in the repository of the caller
+        with ThreatrRepository().activate() as repository:
+            colander_feed = ThreatrToColanderMapper().convert(threatr_feed)
+            self.assertIs(ThreatrRepository.current(), repository)
+            self.assertFalse(repository.entities)
+        self.assertIs(relation.obj_from, observable)
+        self.assertIs(relation.obj_to, actor)
+        colander_observable = cast(Observable, colander_feed.entities[observable.id])
+        self.assertIs(colander_observable.operated_by, colander_feed.entities[actor.id])
+
     def test_load(self):
         resource_package = __name__
         json_file = resources.files(resource_package).joinpath("data").joinpath("threatr_feed.json")